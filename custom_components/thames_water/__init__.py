@@ -1,23 +1,98 @@
 """Init for the Thames Water integration."""
 
+import asyncio
+import logging
+
+from homeassistant.components.recorder import get_instance
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import device_registry as dr
+
+from .backfill import BackfillManager
+from .cache import MeterUsageCache
+from .const import (
+    CACHE_MAX_ENTRIES,
+    DEFAULT_CACHE_SETTLE_DAYS,
+    DOMAIN,
+    LEGACY_CONSUMPTION_STATISTIC_ID,
+    LEGACY_COST_STATISTIC_ID,
+    LEGACY_DEVICE_ID,
+    SIGNAL_METRICS_UPDATED,
+)
+from .metrics import UpdateMetrics
+from .registry import async_get_registry, entry_meter_ids
+from .services import async_setup_services
+from .singleflight import SingleFlight
+from .statistics import consumption_statistic_id, cost_statistic_id
+from .storage import SessionStore
 
-from .const import DOMAIN
+_LOGGER = logging.getLogger(__name__)
 
 
 async def async_setup(hass: HomeAssistant, config: dict):
     """Set up the Thames Water component."""
+    async_setup_services(hass)
+    return True
+
+
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry):
+    """Migrate an entry to per-meter statistics, devices and entities."""
+    if entry.version > 2:
+        return False
+    if entry.version == 1 and (meter_ids := entry_meter_ids(entry)):
+        meter_id = meter_ids[0]
+        # Version 1 supported one meter, so its statistics and device are
+        # that meter's. The first entry migrated takes them over.
+        recorder = get_instance(hass)
+        recorder.async_update_statistics_metadata(
+            LEGACY_CONSUMPTION_STATISTIC_ID, new_statistic_id=consumption_statistic_id(meter_id)
+        )
+        recorder.async_update_statistics_metadata(
+            LEGACY_COST_STATISTIC_ID, new_statistic_id=cost_statistic_id(meter_id)
+        )
+        # The first update looks the statistics up by their new IDs.
+        await recorder.async_block_till_done()
+
+        device_registry = dr.async_get(hass)
+        if device := device_registry.async_get_device(identifiers={(DOMAIN, LEGACY_DEVICE_ID)}):
+            device_registry.async_update_device(device.id, new_identifiers={(DOMAIN, meter_id)})
+        _LOGGER.info("Migrated Thames Water statistics to meter %s", meter_id)
+    hass.config_entries.async_update_entry(entry, version=2)
     return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Set up Thames Water from a config entry."""
+    if not (meter_ids := entry_meter_ids(entry)):
+        raise ConfigEntryNotReady("Meter ID not configured. Please remove and re-add the integration.")
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = entry.data
+    settle_days = int(entry.data.get("cache_settle_days", DEFAULT_CACHE_SETTLE_DAYS))
+    # The authenticated client is acquired lazily by the sensor on its first
+    # update and kept here so later updates reuse the same session. Entries
+    # with the same username share one client through the registry, and the
+    # meters of an entry share the entry's.
+    hass.data[DOMAIN][entry.entry_id] = {
+        "client": None,
+        "metrics": UpdateMetrics(),
+        "backfills": {
+            meter_id: BackfillManager(hass, entry, meter_id) for meter_id in meter_ids
+        },
+        # Shared by a meter's updates and backfill, which fetch the same days.
+        "caches": {
+            meter_id: MeterUsageCache(hass, meter_id, settle_days, CACHE_MAX_ENTRIES)
+            for meter_id in meter_ids
+        },
+        # Held while statistics are written, so a cost rebuild never
+        # interleaves with an update or a backfill chunk.
+        "import_lock": asyncio.Lock(),
+        "updates": SingleFlight(hass, SIGNAL_METRICS_UPDATED.format(entry.entry_id)),
+    }
 
     # Forward the setup to the sensor platform using the new method
     await hass.config_entries.async_forward_entry_setups(entry, ["sensor", "number"])
+    for backfill in hass.data[DOMAIN][entry.entry_id]["backfills"].values():
+        await backfill.async_resume()
     return True
 
 
@@ -25,5 +100,20 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Unload a config entry."""
     await hass.config_entries.async_forward_entry_unload(entry, "sensor")
     await hass.config_entries.async_forward_entry_unload(entry, "number")
-    hass.data[DOMAIN].pop(entry.entry_id)
+    entry_data = hass.data[DOMAIN].pop(entry.entry_id)
+    entry_data["updates"].async_cancel()
+    if entry_data["client"] is not None:
+        await async_get_registry(hass).async_release(entry)
     return True
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry):
+    """Delete the saved session once no other entry logs in with the same username."""
+    username = entry.data["username"].strip().lower()
+    if any(
+        other.entry_id != entry.entry_id
+        and other.data.get("username", "").strip().lower() == username
+        for other in hass.config_entries.async_entries(DOMAIN)
+    ):
+        return
+    await SessionStore(hass, entry.data["username"]).async_remove()
@@ -0,0 +1,220 @@
+"""Deep-history backfill for the Thames Water integration."""
+
+from __future__ import annotations
+
+from datetime import date, time, timedelta
+import logging
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DEFAULT_LITER_COST,
+    DOMAIN,
+    SIGNAL_BACKFILL_UPDATED,
+)
+from .registry import async_get_entry_client
+from .statistics import (
+    HourlySeries,
+    async_first_statistic,
+    consumption_metadata,
+    consumption_statistic_id,
+    cost_metadata,
+    cost_statistic_id,
+    generate_statistics,
+)
+from .storage import BackfillCheckpoint, BackfillStore
+from .thameswaterclient import CircuitBreaker
+from .timebuckets import uk_midnight, uk_time
+
+_LOGGER = logging.getLogger(__name__)
+
+# Days fetched, and hours imported, per checkpoint.
+CHUNK_DAYS = 31
+
+
+class BackfillManager:
+    """Load history older than the imported statistics, newest chunk first.
+
+    The existing statistics keep their sums: each chunk is imported with
+    running sums that end where the already imported hours begin. A
+    checkpoint is saved after every chunk so a restart resumes the backfill
+    instead of starting over, and only one chunk is held in memory at a time.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, meter_id: str) -> None:
+        """Initialize the backfill of one of an entry's meters."""
+        self._hass = hass
+        self._entry = entry
+        self._meter_id = meter_id
+        self._store = BackfillStore(hass, self._meter_id)
+        self.checkpoint: BackfillCheckpoint | None = None
+        self.running = False
+        self.error: str | None = None
+
+    @property
+    def progress(self) -> float | None:
+        """Return the percentage of days loaded by the current or last backfill."""
+        if (cp := self.checkpoint) is None:
+            return None
+        total_days = (cp.end - cp.start).days + 1
+        return round(100 * (cp.end - cp.next_end).days / total_days, 1)
+
+    def _notify(self) -> None:
+        async_dispatcher_send(self._hass, SIGNAL_BACKFILL_UPDATED.format(self._entry.entry_id))
+
+    async def async_start(self, start: date, end: date) -> None:
+        """Start loading ``start`` to ``end`` in the background."""
+        if self.running:
+            raise HomeAssistantError("A backfill is already running for this meter")
+
+        first = await async_first_statistic(
+            self._hass,
+            consumption_statistic_id(self._meter_id),
+            uk_midnight(start),
+        )
+        if first is None:
+            raise HomeAssistantError(
+                f"No statistics imported after {start}; the backfill loads history "
+                "before the first imported hour, run it after the first update"
+            )
+        first_cost = await async_first_statistic(
+            self._hass,
+            cost_statistic_id(self._meter_id),
+            dt_util.utc_from_timestamp(first["start"]),
+        )
+        # The day of the first imported hour is fetched too, for its earlier hours.
+        first_hour = uk_time(first["start"])
+        last_day = first_hour.date()
+        if first_hour.time() == time():
+            last_day -= timedelta(days=1)
+        end = min(end, last_day)
+        if end < start:
+            raise HomeAssistantError(f"History from {start} is already imported")
+
+        liter_cost = self._entry.options.get(
+            "liter_cost", self._entry.data.get("liter_cost", DEFAULT_LITER_COST)
+        )
+        self.checkpoint = BackfillCheckpoint(
+            start=start,
+            end=end,
+            next_end=end,
+            before=first["start"],
+            consumption_sum=first["sum"] - first["state"],
+            cost_sum=(
+                first_cost["sum"] - first_cost["state"]
+                if first_cost is not None and first_cost["start"] == first["start"]
+                else 0.0
+            ),
+            liter_cost=float(liter_cost),
+        )
+        await self._store.async_save(self.checkpoint)
+        self._spawn()
+
+    async def async_resume(self) -> None:
+        """Continue a backfill interrupted by a restart."""
+        if self.running or (checkpoint := await self._store.async_load()) is None:
+            return
+        _LOGGER.info("Resuming backfill of meter %s from %s", self._meter_id, checkpoint.next_end)
+        self.checkpoint = checkpoint
+        self._spawn()
+
+    def _spawn(self) -> None:
+        self.running = True
+        self.error = None
+        self._notify()
+        self._entry.async_create_background_task(
+            self._hass, self._async_run(), f"{DOMAIN} backfill {self._meter_id}"
+        )
+
+    async def _async_run(self) -> None:
+        try:
+            await self._async_load_chunks()
+        except Exception as err:
+            _LOGGER.error("Backfill of meter %s failed, it resumes on restart: %s", self._meter_id, err)
+            self.error = str(err)
+        else:
+            _LOGGER.info("Backfill of meter %s finished", self._meter_id)
+            await self._store.async_remove()
+        finally:
+            self.running = False
+            self._notify()
+
+    async def _async_load_chunks(self) -> None:
+        client = await async_get_entry_client(self._hass, self._entry)
+        cache = self._hass.data[DOMAIN][self._entry.entry_id]["caches"][self._meter_id]
+        await cache.async_load()
+        cp = self.checkpoint
+        before = dt_util.utc_from_timestamp(cp.before)
+
+        while cp.next_end >= cp.start:
+            chunk_start = max(cp.start, cp.next_end - timedelta(days=CHUNK_DAYS - 1))
+            breaker = CircuitBreaker()
+            # Days already cached by updates or an earlier backfill are not
+            # fetched again; the rest are fetched newest first.
+            usage_by_day, missing = cache.get_range(chunk_start, cp.next_end)
+            for fetch_start, fetch_end in reversed(missing):
+                fetched = await client.get_meter_usage_range(
+                    self._meter_id, fetch_start, fetch_end, breaker
+                )
+                cache.put(fetched)
+                usage_by_day.update(fetched)
+            if breaker.open:
+                # Keep the newest days down to the first one lost, so the
+                # backfill resumes from there without leaving a hole.
+                day = cp.next_end
+                while day >= chunk_start and day in usage_by_day:
+                    day -= timedelta(days=1)
+                chunk_start = day + timedelta(days=1)
+                usage_by_day = {
+                    day: data for day, data in usage_by_day.items() if day >= chunk_start
+                }
+
+            readings = HourlySeries()
+            for day, data in sorted(usage_by_day.items()):
+                if data.IsDataAvailable is False or data.IsError:
+                    continue
+                readings.extend_day(day, data)
+            readings = readings.before(before).sorted()
+            readings.reconcile()
+            readings = readings.by_hour()
+
+            if readings:
+                total = sum(readings.usage)
+                cost_total = sum(usage * cp.liter_cost for usage in readings.usage)
+                consumption_sum = cp.consumption_sum - total
+                cost_sum = cp.cost_sum - cost_total
+                stats, cost_stats = generate_statistics(
+                    readings,
+                    cp.liter_cost,
+                    cumulative_start=consumption_sum,
+                    cost_cumulative_start=cost_sum,
+                )
+                async with self._hass.data[DOMAIN][self._entry.entry_id]["import_lock"]:
+                    async_add_external_statistics(self._hass, consumption_metadata(self._meter_id), stats)
+                    async_add_external_statistics(self._hass, cost_metadata(self._meter_id), cost_stats)
+                    # Let the recorder write the chunk before fetching the next
+                    # one, so a long backfill cannot pile up in its queue.
+                    await get_instance(self._hass).async_block_till_done()
+                cp.consumption_sum = consumption_sum
+                cp.cost_sum = cost_sum
+
+            _LOGGER.debug(
+                "Backfilled %d hours of meter %s from %s to %s",
+                len(readings),
+                self._meter_id,
+                chunk_start,
+                cp.next_end,
+            )
+            cp.next_end = chunk_start - timedelta(days=1)
+            await self._store.async_save(cp)
+            self._notify()
+            if breaker.open:
+                raise HomeAssistantError(
+                    f"Stopped after {breaker.threshold} consecutive {breaker.tripped} errors"
+                )
@@ -0,0 +1,129 @@
+"""Local cache of parsed meter usage for the Thames Water integration."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from datetime import date, timedelta
+import logging
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .thameswaterclient import LineSeries, MeterUsage
+from .timebuckets import hours_in_day
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 30
+
+
+class MeterUsageCache:
+    """Parsed MeterUsage per day and granularity for one meter.
+
+    A day is only served from the cache once it is at least ``settle_days``
+    old and its data was complete: available, without errors, with a line
+    for every hour of the day and without estimated lines. Younger, missing or estimated days are always fetched
+    again. The least recently used days are evicted above ``max_entries``.
+    Only the columns of a day's lines are kept, as complete days need
+    nothing else from the response.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        meter_id: str,
+        settle_days: int,
+        max_entries: int,
+    ) -> None:
+        """Initialize the cache for a meter."""
+        self._store: Store[dict] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.usage_cache.{meter_id}"
+        )
+        self._settle_days = settle_days
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        self._loaded = False
+
+    async def async_load(self) -> None:
+        """Load the cache from disk once."""
+        if self._loaded:
+            return
+        data = await self._store.async_load() or {}
+        if self._loaded:
+            # Loaded by the update or the backfill meanwhile.
+            return
+        self._entries = OrderedDict(data.get("days", {}))
+        self._loaded = True
+
+    def _data_to_save(self) -> dict:
+        return {"days": dict(self._entries)}
+
+    @staticmethod
+    def _key(day: date, granularity: str) -> str:
+        return f"{day.isoformat()}:{granularity}"
+
+    def _is_settled(self, day: date) -> bool:
+        return (dt_util.now().date() - day).days >= self._settle_days
+
+    @staticmethod
+    def _is_complete(day: date, usage: MeterUsage) -> bool:
+        hours = {minute // 60 for minute in usage.Lines.minute_of_day if minute >= 0}
+        return (
+            not usage.IsError
+            and usage.IsDataAvailable
+            and len(hours) == hours_in_day(day)
+            and not any(usage.Lines.estimated)
+        )
+
+    def get(self, day: date, granularity: str = "H") -> MeterUsage | None:
+        """Return the cached usage for a settled day, or None when it must be fetched."""
+        key = self._key(day, granularity)
+        if key not in self._entries or not self._is_settled(day):
+            return None
+        self._entries.move_to_end(key)
+        return MeterUsage(Lines=LineSeries.from_columns(self._entries[key]))
+
+    def get_range(
+        self, start: date, end: date, granularity: str = "H"
+    ) -> tuple[dict[date, MeterUsage], list[tuple[date, date]]]:
+        """Return cached days between ``start`` and ``end`` and the ranges still to fetch."""
+        cached: dict[date, MeterUsage] = {}
+        missing: list[tuple[date, date]] = []
+        day = start
+        while day <= end:
+            if (usage := self.get(day, granularity)) is not None:
+                cached[day] = usage
+            elif missing and missing[-1][1] == day - timedelta(days=1):
+                missing[-1] = (missing[-1][0], day)
+            else:
+                missing.append((day, day))
+            day += timedelta(days=1)
+        return cached, missing
+
+    def missing(self, start: date, end: date, granularity: str = "H") -> list[tuple[date, date]]:
+        """Return the ranges between ``start`` and ``end`` that are not served from the cache."""
+        missing: list[tuple[date, date]] = []
+        day = start
+        while day <= end:
+            if self._key(day, granularity) not in self._entries or not self._is_settled(day):
+                if missing and missing[-1][1] == day - timedelta(days=1):
+                    missing[-1] = (missing[-1][0], day)
+                else:
+                    missing.append((day, day))
+            day += timedelta(days=1)
+        return missing
+
+    def put(self, usage_by_day: dict[date, MeterUsage], granularity: str = "H") -> None:
+        """Cache complete days and schedule a save."""
+        for day, usage in usage_by_day.items():
+            if not self._is_complete(day, usage):
+                continue
+            key = self._key(day, granularity)
+            self._entries[key] = usage.Lines.to_columns()
+            self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
@@ -4,13 +4,19 @@ from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from typing import Any, Dict, List
 
-from .const import DOMAIN, DEFAULT_LITER_COST
+from .const import (
+    DOMAIN,
+    DEFAULT_CACHE_SETTLE_DAYS,
+    DEFAULT_LITER_COST,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_REQUESTS_PER_SECOND,
+)
 
 
 class ThamesWaterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Thames Water."""
 
-    VERSION = 1
+    VERSION = 2
 
     async def async_step_user(self, user_input=None) -> FlowResult:
         """Handle the initial step."""
@@ -61,6 +67,13 @@ class ThamesWaterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         except (TypeError, ValueError):
             errors["liter_cost"] = "Not a valid number"
 
+        # Several meters of the account are entered comma-separated.
+        meter_ids = [m.strip() for m in str(user_input.get("meter_id", "")).split(",")]
+        if not all(meter_ids):
+            errors["meter_id"] = "Enter one or more meter IDs separated by commas"
+        elif len(set(meter_ids)) != len(meter_ids):
+            errors["meter_id"] = "A meter ID is repeated"
+
         hours_str = user_input.get("fetch_hours", "")
         try:
             hours = [int(hour) for hour in hours_str.split(",")]
@@ -69,6 +82,24 @@ class ThamesWaterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         except ValueError:
             errors["fetch_hours"] = "Invalid format. Use comma-separated hours."
 
+        try:
+            if not 1 <= int(user_input.get("max_concurrency", DEFAULT_MAX_CONCURRENCY)) <= 16:
+                errors["max_concurrency"] = "Value must be between 1 and 16"
+        except (TypeError, ValueError):
+            errors["max_concurrency"] = "Not a valid number"
+
+        try:
+            if not 0.1 <= float(user_input.get("requests_per_second", DEFAULT_REQUESTS_PER_SECOND)) <= 20:
+                errors["requests_per_second"] = "Value must be between 0.1 and 20"
+        except (TypeError, ValueError):
+            errors["requests_per_second"] = "Not a valid number"
+
+        try:
+            if int(user_input.get("cache_settle_days", DEFAULT_CACHE_SETTLE_DAYS)) < 3:
+                errors["cache_settle_days"] = "Value must be at least 3"
+        except (TypeError, ValueError):
+            errors["cache_settle_days"] = "Not a valid number"
+
         return errors
 
     def _get_data_schema(self, defaults: Dict[str, Any] = None) -> vol.Schema:
@@ -92,5 +123,17 @@ class ThamesWaterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 vol.Optional(
                     "fetch_hours", default=defaults.get("fetch_hours", "15,23")
                 ): str,
+                vol.Optional(
+                    "max_concurrency",
+                    default=defaults.get("max_concurrency", DEFAULT_MAX_CONCURRENCY),
+                ): int,
+                vol.Optional(
+                    "requests_per_second",
+                    default=defaults.get("requests_per_second", DEFAULT_REQUESTS_PER_SECOND),
+                ): vol.Coerce(float),
+                vol.Optional(
+                    "cache_settle_days",
+                    default=defaults.get("cache_settle_days", DEFAULT_CACHE_SETTLE_DAYS),
+                ): int,
             }
         )
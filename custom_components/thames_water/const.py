@@ -1,2 +1,19 @@
 DOMAIN = "thames_water"
 DEFAULT_LITER_COST = 0.0030682
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_REQUESTS_PER_SECOND = 2.0
+DEFAULT_CACHE_SETTLE_DAYS = 7
+CACHE_MAX_ENTRIES = 1500
+SIGNAL_METRICS_UPDATED = f"{DOMAIN}_metrics_updated_{{}}"
+SIGNAL_BACKFILL_UPDATED = f"{DOMAIN}_backfill_updated_{{}}"
+SIGNAL_STATISTICS_REWRITTEN = f"{DOMAIN}_statistics_rewritten_{{}}"
+# Statistic IDs, formatted with the slug of a meter ID.
+CONSUMPTION_STATISTIC_ID = f"{DOMAIN}:consumption_{{}}"
+COST_STATISTIC_ID = f"{DOMAIN}:cost_{{}}"
+# Daily and monthly rollups, formatted with the rollup and the meter ID's slug.
+ROLLUP_CONSUMPTION_STATISTIC_ID = f"{DOMAIN}:{{}}_consumption_{{}}"
+ROLLUP_COST_STATISTIC_ID = f"{DOMAIN}:{{}}_cost_{{}}"
+# The statistic IDs of the single meter supported before config entry version 2.
+LEGACY_CONSUMPTION_STATISTIC_ID = f"{DOMAIN}:thameswater_consumption"
+LEGACY_COST_STATISTIC_ID = f"{DOMAIN}:thameswater_cost"
+LEGACY_DEVICE_ID = "thames_water"
@@ -0,0 +1,91 @@
+"""In-place corrections of imported statistics for the Thames Water integration."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import logging
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .statistics import (
+    async_hourly_statistics,
+    async_last_statistic_before,
+    consumption_metadata,
+    consumption_statistic_id,
+    cost_metadata,
+    cost_statistic_id,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Hours read from the recorder, and written back, per page.
+PAGE_DAYS = 31
+
+
+async def async_merge_hours(
+    hass: HomeAssistant,
+    meter_id: str,
+    hours: dict[datetime, float],
+    liter_cost: float,
+    end: datetime,
+) -> tuple[float, float]:
+    """Write the litres of ``hours`` into a meter's imported statistics and re-sum them up to ``end``.
+
+    ``hours`` maps UTC hour starts to litres; they are added where they
+    were missing and replace the imported value where they were not. Every
+    imported hour from the first of them up to and including ``end`` gets
+    its running sums recomputed in place, a page at a time. Returns the
+    consumption and cost sums at ``end``.
+    """
+    consumption_id = consumption_statistic_id(meter_id)
+    cost_id = cost_statistic_id(meter_id)
+    first = min(hours)
+    consumption_sum = cost_sum = 0.0
+    if previous := await async_last_statistic_before(hass, consumption_id, first):
+        consumption_sum = previous["sum"]
+    if previous_cost := await async_last_statistic_before(hass, cost_id, first):
+        cost_sum = previous_cost["sum"]
+
+    stop = end + timedelta(hours=1)
+    start = first
+    while start < stop:
+        page_end = min(start + timedelta(days=PAGE_DAYS), stop)
+        states = {
+            row["start"]: row["state"]
+            for row in await async_hourly_statistics(
+                hass, consumption_id, start, page_end, {"state"}
+            )
+        }
+        cost_states = {
+            row["start"]: row["state"]
+            for row in await async_hourly_statistics(
+                hass, cost_id, start, page_end, {"state"}
+            )
+        }
+        for hour, usage in hours.items():
+            if start <= hour < page_end:
+                states[hour.timestamp()] = usage
+                cost_states[hour.timestamp()] = usage * liter_cost
+
+        stats: list[StatisticData] = []
+        cost_stats: list[StatisticData] = []
+        for timestamp in sorted(states):
+            hour_start = dt_util.utc_from_timestamp(timestamp)
+            state = states[timestamp]
+            cost_state = cost_states.get(timestamp, state * liter_cost)
+            consumption_sum += state
+            cost_sum += cost_state
+            stats.append(StatisticData(start=hour_start, state=state, sum=consumption_sum))
+            cost_stats.append(StatisticData(start=hour_start, state=cost_state, sum=cost_sum))
+        if stats:
+            async_add_external_statistics(hass, consumption_metadata(meter_id), stats)
+            async_add_external_statistics(hass, cost_metadata(meter_id), cost_stats)
+            await get_instance(hass).async_block_till_done()
+        start = page_end
+
+    _LOGGER.info("Corrected %d hours and the running sums after them", len(hours))
+    return consumption_sum, cost_sum
@@ -0,0 +1,113 @@
+"""Cost statistics rebuild for the Thames Water integration."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import logging
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, SIGNAL_STATISTICS_REWRITTEN
+from .registry import entry_meter_ids
+from .rollups import ROLLUPS
+from .statistics import (
+    HISTORY_START,
+    async_first_statistic,
+    async_hourly_statistics,
+    async_last_statistic_before,
+    consumption_statistic_id,
+    cost_metadata,
+    cost_statistic_id,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Hours read from the recorder, and written back, per page.
+PAGE_DAYS = 31
+
+
+async def async_rebuild_cost(
+    hass: HomeAssistant,
+    meter_id: str,
+    liter_cost: float,
+    effective: datetime | None = None,
+    rollup: str | None = None,
+) -> int:
+    """Reprice a meter's cost statistics from the UTC time ``effective`` on, or all of them.
+
+    The hourly consumption already in the recorder is read back a page at a
+    time and each page of cost statistics is written before the next is
+    read, so nothing is fetched from Thames Water. Costs before
+    ``effective`` are kept and the running sum continues from them.
+    ``rollup`` selects the daily or monthly statistics instead of the
+    hourly ones. Returns the number of rows repriced.
+    """
+    consumption_id = consumption_statistic_id(meter_id, rollup)
+    first = await async_first_statistic(hass, consumption_id, effective or HISTORY_START)
+    if first is None:
+        return 0
+    start = dt_util.utc_from_timestamp(first["start"])
+    cost_sum = 0.0
+    if effective is not None and (
+        previous := await async_last_statistic_before(
+            hass, cost_statistic_id(meter_id, rollup), start
+        )
+    ):
+        cost_sum = previous["sum"]
+
+    end = dt_util.utcnow()
+    hours = 0
+    while start < end:
+        page_end = start + timedelta(days=PAGE_DAYS)
+        rows = await async_hourly_statistics(
+            hass, consumption_id, start, page_end, {"state"}
+        )
+        cost_stats: list[StatisticData] = []
+        for row in rows:
+            state = row["state"] * liter_cost
+            cost_sum += state
+            cost_stats.append(
+                StatisticData(
+                    start=dt_util.utc_from_timestamp(row["start"]),
+                    state=state,
+                    sum=cost_sum,
+                )
+            )
+        if cost_stats:
+            async_add_external_statistics(hass, cost_metadata(meter_id, rollup), cost_stats)
+            await get_instance(hass).async_block_till_done()
+            hours += len(cost_stats)
+        start = page_end
+
+    _LOGGER.info(
+        "Repriced %d %s cost statistics of meter %s at %s GBP/L",
+        hours,
+        rollup or "hourly",
+        meter_id,
+        liter_cost,
+    )
+    return hours
+
+
+async def async_rebuild_entry_cost(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    liter_cost: float,
+    effective: datetime | None = None,
+) -> int:
+    """Reprice the cost statistics of an entry's meters while no update imports new hours."""
+    hours = 0
+    async with hass.data[DOMAIN][entry.entry_id]["import_lock"]:
+        for meter_id in entry_meter_ids(entry):
+            hours += await async_rebuild_cost(hass, meter_id, liter_cost, effective)
+            for rollup in ROLLUPS:
+                await async_rebuild_cost(hass, meter_id, liter_cost, effective, rollup)
+    # The running cost sum after the last imported hour has changed.
+    async_dispatcher_send(hass, SIGNAL_STATISTICS_REWRITTEN.format(entry.entry_id))
+    return hours
@@ -6,14 +6,16 @@ from .const import DOMAIN
 
 
 class ThamesWaterEntity(Entity):
-    """Base class for TW Entity."""
+    """Base class for TW Entity, set up with the ID of the meter it belongs to."""
+
+    _meter_id: str
 
     @property
     def device_info(self):
         """Return device information for this entity."""
         return {
-            "identifiers": {(DOMAIN, "thames_water")},
+            "identifiers": {(DOMAIN, self._meter_id)},
             "manufacturer": "Thames Water",
             "model": "Thames Water",
-            "name": "Thames Water Meter",
+            "name": f"Thames Water Meter {self._meter_id}",
         }
@@ -0,0 +1,124 @@
+"""Update timing and request metrics for the Thames Water integration."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+import time
+
+import aiohttp
+
+HISTORY_SIZE = 20
+
+# The run being measured in the current task. Tasks started with
+# asyncio.gather inherit it, so a client shared by several entries still
+# attributes each request to the update that sent it.
+_current_run: ContextVar[UpdateRun | None] = ContextVar(
+    "thames_water_update_run", default=None
+)
+
+
+@dataclass
+class PhaseTiming:
+    """Total time spent in one phase of an update."""
+
+    calls: int = 0
+    seconds: float = 0.0
+    errors: int = 0
+
+
+@dataclass
+class UpdateRun:
+    """Measurements of one sensor update."""
+
+    started: float
+    duration: float = 0.0
+    success: bool = False
+    requests: int = 0
+    bytes_received: int = 0
+    retries: int = 0
+    errors: int = 0
+    phases: dict[str, PhaseTiming] = field(default_factory=dict)
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """Add the time spent in the block to ``phase`` of the current run."""
+    run = _current_run.get()
+    if run is None:
+        yield
+        return
+    timing = run.phases.setdefault(phase, PhaseTiming())
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        timing.errors += 1
+        raise
+    finally:
+        timing.calls += 1
+        timing.seconds += time.perf_counter() - started
+
+
+def record_retry() -> None:
+    """Count a retried request in the current run."""
+    if (run := _current_run.get()) is not None:
+        run.retries += 1
+
+
+def record_error() -> None:
+    """Count a failed request in the current run."""
+    if (run := _current_run.get()) is not None:
+        run.errors += 1
+
+
+async def _on_request_end(session, context, params) -> None:
+    if (run := _current_run.get()) is not None:
+        run.requests += 1
+
+
+async def _on_response_chunk_received(session, context, params) -> None:
+    if (run := _current_run.get()) is not None:
+        run.bytes_received += len(params.chunk)
+
+
+def trace_config() -> aiohttp.TraceConfig:
+    """Return a trace config counting requests and response bytes of the current run."""
+    config = aiohttp.TraceConfig()
+    config.on_request_end.append(_on_request_end)
+    config.on_response_chunk_received.append(_on_response_chunk_received)
+    return config
+
+
+class UpdateMetrics:
+    """Rolling history of the most recent updates of one config entry."""
+
+    def __init__(self, history_size: int = HISTORY_SIZE) -> None:
+        """Initialize an empty history."""
+        self.history: deque[UpdateRun] = deque(maxlen=history_size)
+
+    @property
+    def last(self) -> UpdateRun | None:
+        """Return the most recent finished run."""
+        return self.history[-1] if self.history else None
+
+    @contextmanager
+    def run(self) -> Iterator[UpdateRun]:
+        """Measure one update; the run is added to the history when the block exits."""
+        run = UpdateRun(started=time.time())
+        token = _current_run.set(run)
+        started = time.perf_counter()
+        try:
+            yield run
+            run.success = True
+        finally:
+            run.duration = time.perf_counter() - started
+            _current_run.reset(token)
+            self.history.append(run)
+
+    def as_dict(self) -> dict:
+        """Return the history as a JSON-serialisable dict, most recent run last."""
+        return {"runs": [asdict(run) for run in self.history]}
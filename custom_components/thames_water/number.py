@@ -7,7 +7,9 @@ from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .entity import ThamesWaterEntity
-from .const import DEFAULT_LITER_COST
+from .const import DEFAULT_LITER_COST, DOMAIN
+from .cost import async_rebuild_entry_cost
+from .registry import entry_meter_ids
 
 
 async def async_setup_entry(
@@ -44,6 +46,7 @@ class ThamesWaterLiterCost(ThamesWaterEntity, NumberEntity):
     ) -> None:
         """Initialize the Thames Water Liter Cost number entity."""
         self._config_entry = config_entry
+        self._meter_id = entry_meter_ids(config_entry)[0]
         # Handle None value, use default if not provided
         if initial_value is None:
             self._value = DEFAULT_LITER_COST
@@ -65,3 +68,20 @@ class ThamesWaterLiterCost(ThamesWaterEntity, NumberEntity):
             self._config_entry, options=new_options
         )
         self.async_write_ha_state()
+        # Reprice the imported history in the background.
+        self._config_entry.async_create_background_task(
+            self.hass,
+            async_rebuild_entry_cost(self.hass, self._config_entry, value),
+            f"{DOMAIN} cost rebuild",
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Follow cost changes made by the rebuild_cost action."""
+        self.async_on_remove(
+            self._config_entry.add_update_listener(self._async_entry_updated)
+        )
+
+    async def _async_entry_updated(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        if (value := entry.options.get("liter_cost")) is not None and value != self._value:
+            self._value = float(value)
+            self.async_write_ha_state()
@@ -0,0 +1,188 @@
+"""Adaptive update scheduling for the Thames Water integration."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import date, datetime, time, timedelta
+import logging
+import random
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.helpers.start import async_at_started
+from homeassistant.util import dt as dt_util
+
+from .storage import AvailabilityStore
+from .timebuckets import uk_midnight
+
+if TYPE_CHECKING:
+    from .sensor import ThamesWaterSensor
+
+_LOGGER = logging.getLogger(__name__)
+
+# Delays kept to learn when a meter's days become available.
+MAX_OBSERVATIONS = 14
+# Delays needed before they replace the configured fetch hours.
+MIN_OBSERVATIONS = 3
+# Updates are scheduled this long before the next day is expected.
+PROBE_LEAD = timedelta(hours=1)
+# Wait before retrying an update that brought no new day or failed; it
+# doubles per retry.
+RETRY_BASE = timedelta(minutes=30)
+RETRY_MAX = timedelta(hours=8)
+# Wait after Home Assistant has started before the first update.
+STARTUP_DELAY = timedelta(seconds=60)
+
+
+def _end_of(day: date) -> datetime:
+    return uk_midnight(day + timedelta(days=1))
+
+
+def _backoff(attempts: int) -> timedelta:
+    return min(RETRY_BASE * 2 ** (attempts - 1), RETRY_MAX)
+
+
+class UpdatePoller:
+    """Run a meter's updates when its next complete day is expected.
+
+    Every update that brings exactly one new day records how long after
+    the end of that day it appeared: halfway between the last update that
+    did not find it and the one that did, or when it was found if the
+    first look found it. The median of the recent delays predicts when the
+    following day appears, and updates run an hour before that, so a day
+    published earlier than usual pulls the estimate back instead of the
+    update times confirming themselves. Until enough delays are known the
+    configured fetch hours are used. An update that finds no new day once
+    one is due, and one that failed or whose fetch stopped on repeated
+    failures, are retried with exponential backoff, each counted on its
+    own so failures do not stretch the wait for a late day. The first
+    update runs right away, or shortly after Home Assistant has started,
+    so days missed while it was down are caught up without holding up its
+    startup; updates run as background tasks.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, sensor: ThamesWaterSensor, meter_id: str, fetch_hours: list[int]
+    ) -> None:
+        """Initialize the poller of a meter's sensor."""
+        self._hass = hass
+        self._sensor = sensor
+        self._store = AvailabilityStore(hass, meter_id)
+        self._fetch_hours = sorted(fetch_hours)
+        self._minute = random.randint(0, 10)
+        self._delays: list[float] = []
+        self._misses = 0
+        self._missed_at: datetime | None = None
+        self._failures = 0
+        self._unsub: CALLBACK_TYPE | None = None
+        self._task: asyncio.Task | None = None
+        self._stopped = False
+        self.next_run: datetime | None = None
+
+    async def async_start(self) -> None:
+        """Load what was learned and schedule the first update."""
+        self._delays = await self._store.async_load()
+        if self._hass.is_running:
+            self._schedule(dt_util.now())
+        else:
+            self._unsub = async_at_started(self._hass, self._async_started)
+
+    @callback
+    def _async_started(self, hass: HomeAssistant) -> None:
+        self._schedule(dt_util.now() + STARTUP_DELAY)
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel the next update and stop waiting for a running one."""
+        self._stopped = True
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        if self._task is not None:
+            self._task.cancel()
+
+    def _schedule(self, when: datetime) -> None:
+        if self._stopped:
+            return
+        self.next_run = when
+        self._unsub = async_track_point_in_time(self._hass, self._async_fire, when)
+
+    @callback
+    def _async_fire(self, now: datetime) -> None:
+        self._unsub = None
+        self._task = self._hass.async_create_background_task(
+            self._async_run(now), "thames_water scheduled update"
+        )
+
+    def _next_fetch_hour(self, now: datetime) -> datetime:
+        for days in (0, 1):
+            day = now.date() + timedelta(days=days)
+            for hour in self._fetch_hours:
+                when = datetime.combine(
+                    day, time(hour, self._minute), dt_util.get_default_time_zone()
+                )
+                if when > now:
+                    return when
+        return now + timedelta(days=1)
+
+    def _expected(self, complete_day: date | None) -> datetime | None:
+        """Return when to look for the day after ``complete_day``, once learned."""
+        if complete_day is None or len(self._delays) < MIN_OBSERVATIONS:
+            return None
+        delay = sorted(self._delays)[len(self._delays) // 2]
+        return _end_of(complete_day + timedelta(days=1)) + timedelta(hours=delay) - PROBE_LEAD
+
+    async def _async_learn(self, day: date, now: datetime) -> None:
+        found = now
+        if self._missed_at is not None and self._missed_at > _end_of(day):
+            # The day appeared between the last look that missed it and this one.
+            found = self._missed_at + (now - self._missed_at) / 2
+        delay = (found - _end_of(day)).total_seconds() / 3600
+        self._delays = [*self._delays, round(delay, 1)][-MAX_OBSERVATIONS:]
+        await self._store.async_save(self._delays)
+
+    async def _async_run(self, now: datetime) -> None:
+        before = self._sensor.last_complete_day
+        failed = False
+        try:
+            await self._sensor.async_update_callback(now)
+        except Exception:
+            _LOGGER.exception("Unexpected error updating Thames Water")
+            failed = True
+        after = self._sensor.last_complete_day
+        now = dt_util.now()
+
+        progressed = after is not None and (before is None or after > before)
+        if progressed:
+            # Days caught up in bulk say nothing about when they appeared.
+            if before is not None and after == before + timedelta(days=1):
+                await self._async_learn(after, now)
+            self._misses = 0
+            self._missed_at = None
+
+        breaker = self._sensor.fetch_breaker
+        expected = self._expected(after)
+        failed = failed or self._sensor.update_failed
+        if failed or (breaker is not None and breaker.open):
+            # Thames Water is failing: back off, at least as long as it asked.
+            self._failures += 1
+            next_run = now + _backoff(self._failures)
+            if breaker is not None and breaker.retry_after:
+                next_run = max(next_run, now + timedelta(seconds=breaker.retry_after))
+        else:
+            self._failures = 0
+            if expected is not None and expected > now:
+                # Nothing is due before then.
+                next_run = expected
+            elif progressed and expected is None:
+                next_run = self._next_fetch_hour(now)
+            else:
+                # The next day is due but not published yet.
+                self._misses += 1
+                self._missed_at = now
+                next_run = now + _backoff(self._misses)
+                if expected is None:
+                    next_run = min(next_run, self._next_fetch_hour(now))
+        _LOGGER.debug("Next Thames Water update at %s", next_run)
+        self._schedule(next_run)
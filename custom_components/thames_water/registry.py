@@ -0,0 +1,147 @@
+"""Shared Thames Water clients for the Thames Water integration."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+import logging
+
+import aiohttp
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+
+from .const import DEFAULT_MAX_CONCURRENCY, DEFAULT_REQUESTS_PER_SECOND, DOMAIN
+from .metrics import trace_config
+from .scheduler import FetchScheduler
+from .storage import SessionStore
+from .thameswaterclient import AsyncThamesWater
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_REGISTRY = f"{DOMAIN}_registry"
+
+
+@dataclass
+class _SharedClient:
+    client: AsyncThamesWater
+    session_store: SessionStore
+    entry_ids: set[str] = field(default_factory=set)
+
+
+class ClientRegistry:
+    """One logged-in client per username, shared by every entry using it.
+
+    Entries for several meters or accounts under the same login share the
+    session, its connection pool and the fetch scheduler, so the login and
+    the rate limit are per account rather than per meter.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the registry."""
+        self._hass = hass
+        self._clients: dict[str, _SharedClient] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    @staticmethod
+    def _key(entry: ConfigEntry) -> str:
+        return entry.data["username"].strip().lower()
+
+    async def async_acquire(self, entry: ConfigEntry) -> AsyncThamesWater:
+        """Return the account's client for ``entry``, logging in if no entry has yet."""
+        key = self._key(entry)
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            if (shared := self._clients.get(key)) is None:
+                shared = await self._async_create(entry)
+                self._clients[key] = shared
+            shared.entry_ids.add(entry.entry_id)
+            return shared.client
+
+    async def _async_create(self, entry: ConfigEntry) -> _SharedClient:
+        _LOGGER.debug("Creating Thames Water Client")
+        session_store = SessionStore(self._hass, entry.data["username"])
+        session_state = await session_store.async_load()
+        # A dedicated session shares Home Assistant's connection pool but
+        # keeps the login cookies out of the shared cookie jar.
+        base_url = entry.data.get("base_url")
+        if base_url is None:
+            session = async_create_clientsession(
+                self._hass, trace_configs=[trace_config()]
+            )
+        else:
+            # A local stand-in server is addressed by IP, which the default
+            # cookie jar refuses to store cookies for.
+            session = async_create_clientsession(
+                self._hass,
+                cookie_jar=aiohttp.CookieJar(unsafe=True),
+                trace_configs=[trace_config()],
+            )
+        scheduler = FetchScheduler(
+            int(entry.data.get("max_concurrency", DEFAULT_MAX_CONCURRENCY)),
+            float(entry.data.get("requests_per_second", DEFAULT_REQUESTS_PER_SECOND)),
+        )
+        try:
+            client = await AsyncThamesWater.create(
+                session,
+                entry.data["username"],
+                entry.data["password"],
+                entry.data["account_number"],
+                session_state=session_state,
+                scheduler=scheduler,
+                base_url=base_url,
+            )
+        except Exception:
+            await session.close()
+            raise
+        shared = _SharedClient(client, session_store)
+        await self._async_save(shared)
+        return shared
+
+    async def _async_save(self, shared: _SharedClient) -> None:
+        try:
+            await shared.session_store.async_save(shared.client.export_session())
+        except Exception as err:
+            _LOGGER.warning("Could not save Thames Water session: %s", err)
+
+    async def async_save_session(self, entry: ConfigEntry) -> None:
+        """Persist the tokens and cookies of the entry's client so a restart can skip the login."""
+        if (shared := self._clients.get(self._key(entry))) is not None:
+            await self._async_save(shared)
+
+    async def async_release(self, entry: ConfigEntry) -> None:
+        """Stop sharing the client with ``entry`` and close it once no entry uses it."""
+        key = self._key(entry)
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            if (shared := self._clients.get(key)) is None:
+                return
+            shared.entry_ids.discard(entry.entry_id)
+            if not shared.entry_ids:
+                del self._clients[key]
+                await shared.client.close()
+
+
+def async_get_registry(hass: HomeAssistant) -> ClientRegistry:
+    """Return the integration's client registry."""
+    if DATA_REGISTRY not in hass.data:
+        hass.data[DATA_REGISTRY] = ClientRegistry(hass)
+    return hass.data[DATA_REGISTRY]
+
+
+async def async_get_entry_client(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> AsyncThamesWater:
+    """Return the entry's authenticated client, logging in on first use."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    if entry_data["client"] is None:
+        entry_data["client"] = await async_get_registry(hass).async_acquire(entry)
+    return entry_data["client"]
+
+
+def entry_meter_ids(entry: ConfigEntry) -> list[str]:
+    """Return the meters of an entry, which lists them comma-separated in ``meter_id``."""
+    return [
+        meter_id
+        for meter_id in (part.strip() for part in str(entry.data.get("meter_id", "")).split(","))
+        if meter_id
+    ]
@@ -0,0 +1,122 @@
+"""Daily and monthly rollup statistics for the Thames Water integration."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+import logging
+
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .registry import async_get_entry_client
+from .statistics import (
+    HourlySeries,
+    async_last_statistic,
+    consumption_metadata,
+    consumption_statistic_id,
+    cost_metadata,
+    cost_statistic_id,
+    generate_statistics,
+)
+from .storage import RollupCursor
+from .timebuckets import uk_time
+
+_LOGGER = logging.getLogger(__name__)
+
+# Rollup statistics and the granularity they are fetched at.
+ROLLUPS = {"daily": "D", "monthly": "M"}
+# The first update loads rollups from the start of this many years ago.
+ROLLUP_HISTORY_YEARS = 2
+# Days requested at once at daily granularity.
+DAILY_WINDOW_DAYS = 366
+
+
+def _next_period(period: date, granularity: str) -> date:
+    if granularity == "D":
+        return period + timedelta(days=1)
+    return (period.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+async def async_update_rollups(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    meter_id: str,
+    liter_cost: float,
+    end: date,
+    cursors: dict[str, RollupCursor],
+) -> int:
+    """Import the days, and the whole months, of a meter up to ``end`` not yet rolled up.
+
+    Each rollup has one row per local day or month, fetched at the API's
+    D or M granularity, so years of history take a few requests and do not
+    depend on the hourly statistics. ``cursors`` are moved past the rows
+    imported; a rollup without one is looked up in the recorder. Returns
+    the number of rows imported.
+    """
+    imported = 0
+    for rollup, granularity in ROLLUPS.items():
+        if granularity == "D":
+            last_day = end
+        else:
+            # The month of ``end`` is rolled up once it is complete.
+            last_day = (end + timedelta(days=1)).replace(day=1) - timedelta(days=1)
+
+        if (cursor := cursors.get(rollup)) is None:
+            cursor = cursors[rollup] = await _async_recorded_cursor(
+                hass, meter_id, rollup, granularity, end
+            )
+        start = cursor.start
+        if start > last_day:
+            continue
+
+        client = await async_get_entry_client(hass, entry)
+        series = HourlySeries()
+        last_period = start
+        window_start = start
+        while window_start <= last_day:
+            window_end = last_day
+            if granularity == "D":
+                window_end = min(window_start + timedelta(days=DAILY_WINDOW_DAYS - 1), last_day)
+            lines = await client.get_period_usage(meter_id, window_start, window_end, granularity)
+            for period, line in sorted(lines.items()):
+                last_period = period
+                series.append(
+                    datetime.combine(period, time()), line.Usage, line.IsEstimated, line.Read
+                )
+            window_start = window_end + timedelta(days=1)
+        if not series:
+            continue
+
+        series.reconcile()
+        stats, cost_stats = generate_statistics(
+            series,
+            liter_cost,
+            cumulative_start=cursor.consumption_sum,
+            cost_cumulative_start=cursor.cost_sum,
+        )
+        async_add_external_statistics(hass, consumption_metadata(meter_id, rollup), stats)
+        async_add_external_statistics(hass, cost_metadata(meter_id, rollup), cost_stats)
+        _LOGGER.debug(
+            "Imported %d %s rollups of meter %s from %s", len(stats), rollup, meter_id, start
+        )
+        cursors[rollup] = RollupCursor(
+            _next_period(last_period, granularity), stats[-1]["sum"], cost_stats[-1]["sum"]
+        )
+        imported += len(stats)
+    return imported
+
+
+async def _async_recorded_cursor(
+    hass: HomeAssistant, meter_id: str, rollup: str, granularity: str, end: date
+) -> RollupCursor:
+    """Return the cursor after the last row of a rollup in the recorder."""
+    last = await async_last_statistic(hass, consumption_statistic_id(meter_id, rollup))
+    if last is None:
+        return RollupCursor(date(end.year - ROLLUP_HISTORY_YEARS, 1, 1), 0.0, 0.0)
+    last_cost = await async_last_statistic(hass, cost_statistic_id(meter_id, rollup))
+    return RollupCursor(
+        _next_period(uk_time(last["start"]).date(), granularity),
+        last["sum"],
+        last_cost["sum"] if last_cost is not None else 0.0,
+    )
@@ -0,0 +1,92 @@
+"""Request scheduling for the Thames Water integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+import time
+from typing import TypeVar
+
+from .metrics import record_retry
+from .thameswaterclient import ThrottledError
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+DEFAULT_RETRY_AFTER = 5.0
+MAX_RETRY_AFTER = 300.0
+
+
+class FetchScheduler:
+    """Run meter requests with a concurrency limit and a token-bucket rate limit.
+
+    A 429 or 503 answer pauses every request, not only the one that was
+    throttled, for the server's Retry-After (or an exponential backoff when
+    it sends none) before the request is retried.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        requests_per_second: float,
+        burst: int | None = None,
+        max_retries: int = 3,
+    ) -> None:
+        """Initialize the scheduler."""
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._rate = requests_per_second
+        self._capacity = float(burst if burst is not None else max_concurrency)
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+        self._max_retries = max_retries
+
+    async def _acquire(self) -> None:
+        """Wait for a rate-limit token and for any throttling pause to end."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._tokens = min(
+                    self._capacity, self._tokens + (now - self._updated) * self._rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                else:
+                    await asyncio.sleep((1 - self._tokens) / self._rate)
+
+    def _pause(self, delay: float) -> None:
+        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        # Nothing may be sent during the pause, and the bucket starts empty
+        # afterwards so the retries do not arrive as one burst.
+        self._tokens = 0.0
+        self._updated = self._paused_until
+
+    async def submit(self, request: Callable[[], Awaitable[_T]]) -> _T:
+        """Run one request, retrying it while the server throttles."""
+        attempt = 0
+        while True:
+            async with self._semaphore:
+                await self._acquire()
+                try:
+                    return await request()
+                except ThrottledError as err:
+                    if attempt >= self._max_retries:
+                        raise
+                    delay = min(
+                        err.retry_after
+                        if err.retry_after is not None
+                        else DEFAULT_RETRY_AFTER * 2**attempt,
+                        MAX_RETRY_AFTER,
+                    )
+                    _LOGGER.warning("Thames Water throttled a request, waiting %.0fs", delay)
+                    self._pause(delay)
+            record_retry()
+            attempt += 1
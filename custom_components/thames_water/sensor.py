@@ -2,97 +2,145 @@
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
 import logging
 import asyncio
-from operator import itemgetter
-import random
 
 from homeassistant.components.recorder import get_instance
-from homeassistant.components.recorder.models import StatisticData, StatisticMetaData, StatisticMeanType
 from homeassistant.components.recorder.statistics import (
     async_add_external_statistics,
     get_last_statistics,
 )
 from homeassistant.components.sensor import (
+    RestoreSensor,
     SensorDeviceClass,
     SensorEntity,
+    SensorEntityDescription,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfVolume
+from homeassistant.const import (
+    PERCENTAGE,
+    UnitOfInformation,
+    UnitOfTime,
+    UnitOfVolume,
+)
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.util import dt as dt_util
 from homeassistant.exceptions import ConfigEntryNotReady
 
-from .const import DOMAIN, DEFAULT_LITER_COST
+from .backfill import BackfillManager
+from .cache import MeterUsageCache
+from .corrections import async_merge_hours
+from .const import (
+    DOMAIN,
+    DEFAULT_LITER_COST,
+    SIGNAL_BACKFILL_UPDATED,
+    SIGNAL_METRICS_UPDATED,
+    SIGNAL_STATISTICS_REWRITTEN,
+)
 from .entity import ThamesWaterEntity
-from .thameswaterclient import ThamesWater
+from .metrics import UpdateRun, timed
+from .poller import UpdatePoller
+from .registry import async_get_entry_client, async_get_registry, entry_meter_ids
+from .rollups import async_update_rollups
+from .statistics import (
+    HourlySeries,
+    consumption_metadata,
+    consumption_statistic_id,
+    cost_metadata,
+    cost_statistic_id,
+    day_ranges,
+    generate_statistics,
+)
+from .storage import CoverageIndex, CursorStore, IngestionCursor, RollupCursor
+from .thameswaterclient import AsyncThamesWater, CircuitBreaker, MeterUsage
+from .timebuckets import uk_time
 
 _LOGGER = logging.getLogger(__name__)
 UPDATE_HOURS = [15, 23]
+INITIAL_BACKFILL_DAYS = 45
+# Days that failed to import are fetched again for this long.
+GAP_LOOKBACK_DAYS = 30
+# Estimated hours are checked for actual readings for this long.
+ESTIMATE_LOOKBACK_DAYS = 60
+# Days imported, and committed, at a time by an update.
+IMPORT_BATCH_DAYS = 14
+
+
+@dataclass(frozen=True, kw_only=True)
+class ThamesWaterMetricDescription(SensorEntityDescription):
+    """Describes a diagnostic sensor reporting on the last update."""
+
+    value_fn: Callable[[UpdateRun], float | int]
+
+
+METRIC_SENSORS: tuple[ThamesWaterMetricDescription, ...] = (
+    ThamesWaterMetricDescription(
+        key="last_update_duration",
+        name="Last Update Duration",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_display_precision=2,
+        value_fn=lambda run: run.duration,
+    ),
+    ThamesWaterMetricDescription(
+        key="last_update_requests",
+        name="Last Update Requests",
+        value_fn=lambda run: run.requests,
+    ),
+    ThamesWaterMetricDescription(
+        key="last_update_bytes",
+        name="Last Update Data Received",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        value_fn=lambda run: run.bytes_received,
+    ),
+    ThamesWaterMetricDescription(
+        key="last_update_retries",
+        name="Last Update Retries",
+        value_fn=lambda run: run.retries,
+    ),
+    ThamesWaterMetricDescription(
+        key="last_update_errors",
+        name="Last Update Errors",
+        value_fn=lambda run: run.errors,
+    ),
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities
 ) -> bool:
     """Set up the Thames Water sensor platform."""
-    sensor = ThamesWaterSensor(
-        hass,
-        entry,
+    meter_ids = entry_meter_ids(entry)
+    sensors = [ThamesWaterSensor(hass, entry, meter_id) for meter_id in meter_ids]
+
+    # Entities are added with their restored state; each sensor's poller
+    # runs the first update in the background once Home Assistant has started.
+    async_add_entities(sensors)
+    async_add_entities(
+        ThamesWaterMetricSensor(entry, description) for description in METRIC_SENSORS
     )
+    async_add_entities(ThamesWaterBackfillSensor(entry, meter_id) for meter_id in meter_ids)
+    return True
 
-    async_add_entities([sensor], update_before_add=True)
 
+def _fetch_hours(entry: ConfigEntry) -> list[int]:
+    """Return the configured update hours, used until a meter's data availability is learned."""
     if "fetch_hours" in entry.data and entry.data["fetch_hours"]:
         try:
-            update_hours = [int(h.strip()) for h in entry.data["fetch_hours"].split(",")]
+            return [int(h.strip()) for h in entry.data["fetch_hours"].split(",")]
         except (ValueError, AttributeError):
             _LOGGER.warning("Invalid fetch_hours configuration, using defaults")
-            update_hours = UPDATE_HOURS
-    else:
-        update_hours = UPDATE_HOURS
-
-    # Schedule the sensor to update every day at UPDATE_HOURS.
-    rand_minute = random.randint(0, 10)
-    async_track_time_change(
-        hass,
-        sensor.async_update_callback,
-        hour=update_hours,
-        minute=rand_minute,
-        second=0,
-    )
-    return True
+    return UPDATE_HOURS
 
 
-def _generate_statistics_from_readings(
-    readings: list[dict],
-    cumulative_start: float = 0.0,
-    liter_cost: float | None = None,
-) -> list[StatisticData]:
-    """Convert a list of (datetime, reading) entries into StatisticData entries."""
-    sorted_readings = sorted(readings, key=lambda x: x["dt"])
-    cumulative = cumulative_start
-    stats: list[StatisticData] = []
-    for elem in sorted_readings:
-        # Normalize the start timestamp to the hour
-        hour_ts = elem["dt"].replace(minute=0, second=0, microsecond=0)
-        if liter_cost is None:
-            value = elem["state"]
-        else:
-            value = elem["state"] * liter_cost
-        cumulative += value
-        stats.append(
-            StatisticData(
-                start=dt_util.as_utc(hour_ts),
-                state=value,
-                sum=cumulative,
-            )
-        )
-    return stats
-
-
-class ThamesWaterSensor(ThamesWaterEntity, SensorEntity):
+class ThamesWaterSensor(ThamesWaterEntity, RestoreSensor):
     """Thames Water Sensor class."""
 
     _attr_state_class = SensorStateClass.TOTAL
@@ -104,8 +152,9 @@ class ThamesWaterSensor(ThamesWaterEntity, SensorEntity):
         self,
         hass: HomeAssistant,
         config_entry: ConfigEntry,
+        meter_id: str,
     ) -> None:
-        """Initialize the sensor."""
+        """Initialize the sensor of one of the entry's meters."""
         self._hass = hass
         self._config_entry = config_entry
         self._state: float | None = None
@@ -113,7 +162,7 @@ class ThamesWaterSensor(ThamesWaterEntity, SensorEntity):
         self._username = config_entry.data.get("username")
         self._password = config_entry.data.get("password")
         self._account_number = config_entry.data.get("account_number")
-        self._meter_id = config_entry.data.get("meter_id")
+        self._meter_id = meter_id
 
         # Validate required fields and log errors
         if not self._username:
@@ -144,14 +193,87 @@ class ThamesWaterSensor(ThamesWaterEntity, SensorEntity):
             )
             raise ConfigEntryNotReady("Meter ID not configured. Please remove and re-add the integration.")
 
+        self._cursor_store = CursorStore(hass, self._meter_id)
+        self._coverage = CoverageIndex(hass, self._meter_id, ESTIMATE_LOOKBACK_DAYS)
+        self._cursor: IngestionCursor | None = None
+        self._cursor_checked = False
+        self._rollup_cursors: dict[str, RollupCursor] | None = None
+        self._poller: UpdatePoller | None = None
+        self.fetch_breaker: CircuitBreaker | None = None
+        # Whether the last update stopped before fetching, e.g. on a failed login.
+        self.update_failed = False
+
         self._attr_unique_id = f"water_usage_{self._meter_id}"
         self._attr_should_poll = False
 
     @property
-    def state(self) -> float | None:
+    def _cache(self) -> MeterUsageCache:
+        return self._hass.data[DOMAIN][self._config_entry.entry_id]["caches"][self._meter_id]
+
+    @property
+    def native_value(self) -> float | None:
         """Return the sensor state (latest hourly consumption in Liters)."""
         return self._state
 
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return how far the imported statistics have got and when they are next updated."""
+        updates = self.hass.data[DOMAIN][self._config_entry.entry_id]["updates"]
+        last_complete_day = self.last_complete_day
+        next_run = self._poller.next_run if self._poller is not None else None
+        return {
+            "updating": updates.is_running(self._meter_id),
+            "last_complete_day": last_complete_day.isoformat() if last_complete_day else None,
+            "next_update": next_run.isoformat() if next_run else None,
+        }
+
+    @property
+    def last_complete_day(self) -> date | None:
+        """Return the last UK day whose final hour has been imported."""
+        if self._cursor is None:
+            return None
+        last_hour = uk_time(self._cursor.start)
+        if (last_hour + timedelta(hours=1)).date() > last_hour.date():
+            return last_hour.date()
+        return last_hour.date() - timedelta(days=1)
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the last state and start polling in the background.
+
+        The cursor is rechecked when a rebuild rewrites the imported
+        statistics, and the state is written when an update starts or stops.
+        """
+        await super().async_added_to_hass()
+        if (last := await self.async_get_last_sensor_data()) is not None:
+            if last.native_value is not None:
+                self._state = float(last.native_value)
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_STATISTICS_REWRITTEN.format(self._config_entry.entry_id),
+                self._async_statistics_rewritten,
+            )
+        )
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_METRICS_UPDATED.format(self._config_entry.entry_id),
+                self.async_write_ha_state,
+            )
+        )
+        self._poller = UpdatePoller(
+            self.hass, self, self._meter_id, _fetch_hours(self._config_entry)
+        )
+        self.async_on_remove(self._poller.async_stop)
+        await self._poller.async_start()
+
+    @callback
+    def _async_statistics_rewritten(self) -> None:
+        self._cursor_checked = False
+        # The rollups are looked up in the recorder again.
+        self._rollup_cursors = {}
+        self.hass.async_create_task(self._cursor_store.async_save_rollups({}))
+
     @callback
     async def async_update_callback(self, ts) -> None:
         """Update the sensor state."""
@@ -159,14 +281,29 @@ class ThamesWaterSensor(ThamesWaterEntity, SensorEntity):
         self.async_write_ha_state()
 
     async def async_update(self):
-        """Fetch data, build hourly statistics, and inject external statistics."""
-        consumption_stat_id = f"{DOMAIN}:thameswater_consumption"
-        cost_stat_id = f"{DOMAIN}:thameswater_cost"
-
-        last_stats = None
-        last_cost_stats = None
-
-        try:
+        """Fetch data, build hourly statistics, and inject external statistics.
+
+        Calls made while an update of this meter runs are merged into one
+        follow-up update instead of importing the same hours again.
+        """
+        entry_data = self._hass.data[DOMAIN][self._config_entry.entry_id]
+        await entry_data["updates"].async_run(self._meter_id, self._async_run_update)
+
+    async def _async_run_update(self) -> None:
+        entry_data = self._hass.data[DOMAIN][self._config_entry.entry_id]
+        with entry_data["metrics"].run():
+            async with entry_data["import_lock"]:
+                await self._async_update()
+                if self.fetch_breaker is None or not self.fetch_breaker.open:
+                    # Rollups would only send more requests to a failing site.
+                    await self._async_update_rollups()
+
+    async def _async_last_statistics(self) -> IngestionCursor | None:
+        """Return the position of the last statistics in the recorder."""
+        consumption_stat_id = consumption_statistic_id(self._meter_id)
+        cost_stat_id = cost_statistic_id(self._meter_id)
+
+        with timed("last_statistics"):
             async with asyncio.timeout(30):
                 last_stats = await get_instance(self.hass).async_add_executor_job(
                     get_last_statistics, self.hass, 1, consumption_stat_id, True, {"sum"}
@@ -176,168 +313,486 @@ class ThamesWaterSensor(ThamesWaterEntity, SensorEntity):
                     get_last_statistics, self.hass, 1, cost_stat_id, True, {"sum"}
                 )
 
-            # If a previous value exists, use its "sum" as the starting cumulative.
-            if len(last_stats.get(consumption_stat_id, [])) > 0:
-                last_stats = last_stats[consumption_stat_id]
-                last_stats = sorted(last_stats, key=itemgetter("start"), reverse=False)[0]
-            # If a previous value exists, use its "sum" as the starting cumulative.
-            if len(last_cost_stats.get(cost_stat_id, [])) > 0:
-                last_cost_stats = last_cost_stats[cost_stat_id]
-                last_cost_stats = sorted(last_cost_stats, key=itemgetter("start"), reverse=False)[0]
+        if not last_stats.get(consumption_stat_id):
+            return None
+        last = last_stats[consumption_stat_id][0]
+        if last.get("sum") is None:
+            return None
+        cost_sum = 0.0
+        if last_cost_stats.get(cost_stat_id):
+            cost_sum = last_cost_stats[cost_stat_id][0].get("sum") or 0.0
+        return IngestionCursor(
+            start=last["start"], consumption_sum=last["sum"], cost_sum=cost_sum
+        )
+
+    async def _async_get_cursor(self) -> IngestionCursor | None:
+        """Return the ingestion cursor, checking it against the recorder once."""
+        if self._cursor_checked:
+            return self._cursor
 
+        stored = await self._cursor_store.async_load()
+        try:
+            recorded = await self._async_last_statistics()
         except TimeoutError:
             _LOGGER.warning("Timeout while fetching last statistics for Thames Water integration")
-            last_stats = None
-            last_cost_stats = None
-        except (AttributeError, Exception) as err:
+            recorded = stored
+            self._cursor_checked = stored is not None
+        except Exception as err:
             _LOGGER.error("Error fetching last statistics: %s", err)
-            last_stats = None
-            last_cost_stats = None
+            recorded = stored
+            self._cursor_checked = stored is not None
+        else:
+            self._cursor_checked = True
+            if recorded != stored:
+                # The recorder is authoritative: statistics may have been
+                # purged, restored from a backup or imported by an older version.
+                _LOGGER.info("Stored ingestion cursor is out of date, using the recorder's")
+                if recorded is None:
+                    await self._cursor_store.async_remove()
+                else:
+                    await self._cursor_store.async_save(recorded)
+        self._cursor = recorded
+        return recorded
+
+    async def _async_update(self):
+        self.fetch_breaker = None
+        self.update_failed = False
+        cursor = await self._async_get_cursor()
+        if cursor is None and not self._cursor_checked:
+            # Without a stored cursor the recorder is the only way to know
+            # where the sums stand; backfilling blindly would restart them.
+            _LOGGER.warning("Could not check the last imported statistics, skipping update")
+            self.update_failed = True
+            return
 
         # Data is available from at least 3 days ago.
         end_dt = datetime.now() - timedelta(days=3)
-        if last_stats is not None and last_stats.get("sum") is not None:
-            start_dt = dt_util.as_utc(datetime.fromtimestamp(last_stats.get("start")))
+        if cursor is not None:
+            start_dt = uk_time(cursor.start)
         else:
-            start_dt = end_dt - timedelta(days=45)
+            start_dt = end_dt - timedelta(days=INITIAL_BACKFILL_DAYS)
 
         current_date = start_dt.date()
         end_date = end_dt.date()
 
-        try:
-            _LOGGER.debug("Creating Thames Water Client")
-            tw_client = await self._hass.async_add_executor_job(
-                ThamesWater,
-                self._username,
-                self._password,
-                self._account_number,
+        await self._cache.async_load()
+        missing = self._cache.missing(current_date, end_date)
+        await self._coverage.async_load()
+        due_days: list[date] = []
+        history: list[date] = []
+        if cursor is not None:
+            # Days that failed in earlier updates, and days with estimated
+            # hours due for another look, are fetched again on their own.
+            due_days = [
+                day
+                for day in self._coverage.estimated_days_due(dt_util.now().date())
+                if day < current_date
+            ]
+            gap_days = self._coverage.missing_days(
+                end_date - timedelta(days=GAP_LOOKBACK_DAYS),
+                current_date - timedelta(days=1),
             )
-        except Exception as err:
-            _LOGGER.error("Error creating Thames Water client: %s", err)
-            return
-
-        # readings holds all hourly data for the entire period.
-        readings: list[dict] = []
-        latest_usage = 0
-
-        while current_date <= end_date:
-            year = current_date.year
-            month = current_date.month
-            day = current_date.day
-            current_date = current_date + timedelta(days=1)
-
-            d = datetime(year, month, day)
-            #_LOGGER.debug("Fetching data for %s/%s/%s", day, month, year)
-
+            days = {*gap_days, *due_days}
+            # The litres of a missing or estimated hour may have gone into
+            # the first hour of the next day, which is rewritten with it.
+            next_days = {day + timedelta(days=1) for day in days}
+            history = sorted(days | {day for day in next_days if day < current_date})
+        _LOGGER.debug("Fetching %d earlier days and %d new ranges", len(history), len(missing))
+
+        tw_client = None
+        if history or missing:
             try:
-                data = await self._hass.async_add_executor_job(
-                    tw_client.get_meter_usage,
-                    self._meter_id,
-                    d,
-                    d,
-                )
+                tw_client = await async_get_entry_client(self._hass, self._config_entry)
             except Exception as err:
-                data = None
-                _LOGGER.warning("Could not get data for %s/%s/%s: %s", day, month, year, err)
-
-            if (
-                data is None
-                or data.Lines is None
-                or data.IsDataAvailable is False
-                or data.IsError
-            ):
-                continue
+                _LOGGER.error("Error creating Thames Water client: %s", err)
+                self.update_failed = True
+                return
+            # One breaker for the whole update; the poller backs off when it opens.
+            self.fetch_breaker = CircuitBreaker()
+
+        liter_cost = float(
+            self._config_entry.options.get(
+                "liter_cost", self._config_entry.data.get("liter_cost", DEFAULT_LITER_COST)
+            )
+        )
+        try:
+            if history:
+                usage_by_day = await self._async_fetch(tw_client, day_ranges(history))
+                readings = HourlySeries()
+                for day, data in sorted(usage_by_day.items()):
+                    if data.IsDataAvailable is False or data.IsError:
+                        continue
+                    readings.extend_day(day, data)
+                cursor = await self._async_correct_history(readings, cursor, liter_cost)
+                for day in due_days:
+                    if day in usage_by_day:
+                        self._coverage.checked(day, dt_util.now().date())
+                await self._coverage.async_save()
+            imported = await self._async_import_days(
+                tw_client, cursor, current_date, end_date, liter_cost
+            )
+        finally:
+            if tw_client is not None:
+                # A re-login during the fetch rotates the refresh token and cookies.
+                await async_get_registry(self._hass).async_save_session(self._config_entry)
+        if not imported:
+            _LOGGER.warning("No new readings available")
 
-            # Process the returned data; expect a "Lines" list.
-            lines = data.Lines
-            latest_usage = 0
-            for line in lines:
-                time_str = line.Label
-                usage = line.Usage
-                latest_usage += usage
-                try:
-                    hour, minute = map(int, time_str.split(":"))
-                except (ValueError, AttributeError) as err:
-                    _LOGGER.error("Error parsing time %s: %s", time_str, err)
-                    continue
-
-                naive_datetime = datetime(year, month, day, hour, minute)
-                readings.append(
-                    {
-                        "dt": naive_datetime,
-                        "state": usage,  # Usage in Liters per hour
-                    }
+    async def _async_fetch(
+        self, client: AsyncThamesWater | None, ranges: list[tuple[date, date]]
+    ) -> dict[date, MeterUsage]:
+        """Fetch and cache the days of ``ranges``."""
+        usage_by_day: dict[date, MeterUsage] = {}
+        if client is None or not ranges:
+            return usage_by_day
+        with timed("fetch"):
+            fetched_ranges = await asyncio.gather(
+                *(
+                    client.get_meter_usage_range(self._meter_id, start, end, self.fetch_breaker)
+                    for start, end in ranges
                 )
+            )
+        for fetched in fetched_ranges:
+            self._cache.put(fetched)
+            usage_by_day.update(fetched)
+        return usage_by_day
+
+    async def _async_fetch_batch(
+        self, client: AsyncThamesWater | None, start: date, end: date
+    ) -> dict[date, MeterUsage]:
+        """Return the usage from ``start`` to ``end``, from the cache where it can."""
+        usage_by_day, missing = self._cache.get_range(start, end)
+        usage_by_day.update(await self._async_fetch(client, missing))
+        if self.fetch_breaker is not None and self.fetch_breaker.open:
+            # Import the days up to the first one lost; the cursor must
+            # not pass it, or it would only come back as a gap.
+            day = start
+            while day <= end and day in usage_by_day:
+                day += timedelta(days=1)
+            usage_by_day = {key: data for key, data in usage_by_day.items() if key < day}
+        return usage_by_day
+
+    async def _async_import_days(
+        self,
+        client: AsyncThamesWater | None,
+        cursor: IngestionCursor | None,
+        start: date,
+        end: date,
+        liter_cost: float,
+    ) -> int:
+        """Import the days from ``start`` to ``end`` a batch at a time and return the hours imported.
+
+        The next batch is fetched while the current one is imported, and
+        no further ahead, so memory does not grow with the range. Each batch
+        is committed by the recorder before the cursor moves past it, so an
+        interrupted update resumes after the last committed batch.
+        """
+        batches = []
+        batch_start = start
+        while batch_start <= end:
+            batch_end = min(batch_start + timedelta(days=IMPORT_BATCH_DAYS - 1), end)
+            batches.append((batch_start, batch_end))
+            batch_start = batch_end + timedelta(days=1)
+        if not batches:
+            return 0
+
+        imported = 0
+        previous_read = 0.0
+        fetch = asyncio.ensure_future(self._async_fetch_batch(client, *batches[0]))
+        try:
+            for index in range(len(batches)):
+                usage_by_day = await fetch
+                stopped = self.fetch_breaker is not None and self.fetch_breaker.open
+                if index + 1 < len(batches) and not stopped:
+                    fetch = asyncio.ensure_future(
+                        self._async_fetch_batch(client, *batches[index + 1])
+                    )
+                cursor, previous_read, hours = await self._async_import_batch(
+                    usage_by_day, cursor, previous_read, liter_cost
+                )
+                imported += hours
+                if stopped:
+                    break
+        finally:
+            if not fetch.done():
+                fetch.cancel()
+        return imported
+
+    async def _async_import_batch(
+        self,
+        usage_by_day: dict[date, MeterUsage],
+        cursor: IngestionCursor | None,
+        previous_read: float,
+        liter_cost: float,
+    ) -> tuple[IngestionCursor | None, float, int]:
+        """Import the hours of a batch after the cursor.
+
+        Returns the new cursor, the register after the batch and the number
+        of hours imported.
+        """
+        readings = HourlySeries()
+        latest_usage = 0
+        for day, data in sorted(usage_by_day.items()):
+            if data.IsDataAvailable is False or data.IsError:
+                continue
+            # Usage in Liters per hour
+            latest_usage = readings.extend_day(day, data)
 
-        _LOGGER.info("Fetched %d historical entries", len(readings))
-
-        liter_cost = self._config_entry.options.get(
-            "liter_cost", self._config_entry.data.get("liter_cost", DEFAULT_LITER_COST)
-        )
-
-        #_LOGGER.debug("Using Liter Cost: %s", liter_cost)
+        if cursor is not None:
+            cursor = await self._async_correct_history(readings, cursor, liter_cost)
+            initial_cumulative = cursor.consumption_sum
+            initial_cost_cumulative = cursor.cost_sum
+            # Discard all readings before the cursor.
+            start_ts = uk_time(cursor.start)
 
-        if last_stats is not None and last_stats.get("sum") is not None:
-            initial_cumulative = last_stats["sum"]
-            # Discard all readings before last_stats["start"].
-            start_ts = dt_util.as_utc(datetime.fromtimestamp(last_stats.get("start")))
-            
             try:
                 # Attempt to restore state if None.
                 if self._state is None and len(readings) > 0:
                     last_recorded_date = start_ts.date() - timedelta(days=1) if start_ts.hour == 0 else start_ts.date()
-                    daily_total = sum(r["state"] for r in readings if r["dt"].date() == last_recorded_date)
+                    daily_total = readings.total_on(last_recorded_date)
                     if daily_total > 0:
                         self._state = daily_total
                         _LOGGER.debug("Restored state from last recorded day %s: %s L", last_recorded_date, self._state)
             except Exception as err:
                 _LOGGER.error("Failed to restore state from last recorded day: %s", err)
-            
-            readings = [r for r in readings if dt_util.as_utc(r["dt"]) > start_ts]
-        else:
-            initial_cumulative = 0.0
 
-        if last_cost_stats is not None and last_cost_stats.get("sum") is not None:
-            initial_cost_cumulative = last_cost_stats["sum"]
+            previous_read = readings.read_at(start_ts) or previous_read
+            readings = readings.after(start_ts)
         else:
+            initial_cumulative = 0.0
             initial_cost_cumulative = 0.0
 
         if len(readings) == 0:
-            _LOGGER.warning("No new readings available")
-            return
+            return cursor, previous_read, 0
+
+        # The sums follow the meter register where the summed usage drifts from it.
+        readings = readings.sorted()
+        repaired, drift = readings.reconcile(previous_read)
+        if repaired:
+            _LOGGER.warning(
+                "Usage of %d hours differed from the meter register by %.1f L, using the register",
+                repaired,
+                drift,
+            )
+        readings = readings.by_hour()
 
         # Generate new StatisticData entries using the previous cumulative sum.
-        stats = _generate_statistics_from_readings(
-            readings, cumulative_start=initial_cumulative
-        )
-        cost_stats = _generate_statistics_from_readings(
-            readings,
-            cumulative_start=initial_cost_cumulative,
-            liter_cost=float(liter_cost),
-        )
+        with timed("statistics_generation"):
+            stats, cost_stats = generate_statistics(
+                readings,
+                liter_cost,
+                cumulative_start=initial_cumulative,
+                cost_cumulative_start=initial_cost_cumulative,
+            )
         if latest_usage > 0:
             self._state = latest_usage
 
-        # Build per-hour statistics from each reading.
-        metadata_consumption = StatisticMetaData(
-            has_mean=False,
-            has_sum=True,
-            name="Thames Water Consumption",
-            source=DOMAIN,
-            statistic_id=consumption_stat_id,
-            unit_of_measurement=UnitOfVolume.LITERS,
-            mean_type=StatisticMeanType.NONE,
-            unit_class="volume",
+        with timed("recorder_import"):
+            async_add_external_statistics(
+                self._hass, consumption_metadata(self._meter_id), stats
+            )
+            async_add_external_statistics(
+                self._hass, cost_metadata(self._meter_id), cost_stats
+            )
+            # The recorder writes in its own thread; waiting for it keeps a
+            # long catch-up from piling up in its queue and makes sure the
+            # batch is committed before the cursor moves past it.
+            await get_instance(self._hass).async_block_till_done()
+
+        self._cursor = IngestionCursor(
+            start=stats[-1]["start"].timestamp(),
+            consumption_sum=stats[-1]["sum"],
+            cost_sum=cost_stats[-1]["sum"],
+        )
+        await self._cursor_store.async_save(self._cursor)
+        for start, estimated in zip(readings.starts, readings.estimated):
+            self._coverage.mark(start, estimated)
+        await self._coverage.async_save()
+        last_read = next((read for read in reversed(readings.read) if read), previous_read)
+        return self._cursor, last_read, len(stats)
+
+    async def _async_update_rollups(self) -> None:
+        """Import the daily and monthly statistics of the days that became available.
+
+        Days are rolled up once their last hour has been imported, and not
+        while any of them still has estimated hours.
+        """
+        if (end := self.last_complete_day) is None:
+            return
+        await self._coverage.async_load()
+        if (estimated := self._coverage.first_estimated_day()) is not None:
+            end = min(end, estimated - timedelta(days=1))
+        liter_cost = self._config_entry.options.get(
+            "liter_cost", self._config_entry.data.get("liter_cost", DEFAULT_LITER_COST)
+        )
+        if self._rollup_cursors is None:
+            self._rollup_cursors = await self._cursor_store.async_load_rollups()
+        cursors = dict(self._rollup_cursors)
+        with timed("rollups"):
+            try:
+                await async_update_rollups(
+                    self._hass,
+                    self._config_entry,
+                    self._meter_id,
+                    float(liter_cost),
+                    end,
+                    self._rollup_cursors,
+                )
+            except Exception as err:
+                _LOGGER.error("Error updating daily and monthly statistics: %s", err)
+        if self._rollup_cursors != cursors:
+            await self._cursor_store.async_save_rollups(self._rollup_cursors)
+
+    async def _async_correct_history(
+        self, readings: HourlySeries, cursor: IngestionCursor, liter_cost: float
+    ) -> IngestionCursor:
+        """Rewrite refetched days with missing or estimated hours and correct the sums after them.
+
+        The litres of a missing hour were imported in the hour after it,
+        which took its usage from the register, so the missing hours are not
+        added on their own: every hour of those days, and of the day after
+        each, is reconciled with the register and replaces the imported one.
+        """
+        if self._coverage.since is None:
+            return cursor
+        cursor_start = dt_util.utc_from_timestamp(cursor.start)
+        readings = readings.sorted()
+        readings.reconcile()
+        days = {
+            start.date()
+            for start, estimated in zip(readings.starts, readings.estimated)
+            if start.date() >= self._coverage.since
+            and (
+                not self._coverage.is_imported(start)
+                # An actual reading replacing an imported estimate.
+                or (self._coverage.is_estimated(start) and not estimated)
+            )
+        }
+        days |= {day + timedelta(days=1) for day in days}
+        # A duplicated line was reconciled to no usage, so add them up.
+        readings = readings.by_hour()
+        corrected: list[tuple[datetime, bool]] = []
+        hours: dict[datetime, float] = {}
+        for start, utc, usage, estimated in zip(
+            readings.starts, readings.utc, readings.usage, readings.estimated
+        ):
+            hour = dt_util.utc_from_timestamp(utc)
+            if start.date() in days and hour <= cursor_start:
+                corrected.append((start, estimated))
+                hours[hour] = usage
+        if not hours:
+            return cursor
+
+        _LOGGER.info("Rewriting %d hours with missing or estimated ones from %s", len(hours), min(hours))
+        with timed("history_correction"):
+            consumption_sum, cost_sum = await async_merge_hours(
+                self._hass, self._meter_id, hours, liter_cost, cursor_start
+            )
+        self._cursor = IngestionCursor(
+            start=cursor.start, consumption_sum=consumption_sum, cost_sum=cost_sum
         )
-        metadata_cost = StatisticMetaData(
-            has_mean=False,
-            has_sum=True,
-            name="Thames Water Cost",
-            source=DOMAIN,
-            statistic_id=cost_stat_id,
-            unit_of_measurement="GBP",
-            mean_type=StatisticMeanType.NONE,
-            unit_class=None,
+        await self._cursor_store.async_save(self._cursor)
+        for start, estimated in corrected:
+            self._coverage.mark(start, estimated)
+        await self._coverage.async_save()
+        return self._cursor
+
+
+class ThamesWaterMetricSensor(ThamesWaterEntity, SensorEntity):
+    """Diagnostic sensor reporting on the most recent update of the entry."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_should_poll = False
+    entity_description: ThamesWaterMetricDescription
+
+    def __init__(
+        self,
+        config_entry: ConfigEntry,
+        description: ThamesWaterMetricDescription,
+    ) -> None:
+        """Initialize the diagnostic sensor."""
+        self.entity_description = description
+        self._config_entry = config_entry
+        self._meter_id = entry_meter_ids(config_entry)[0]
+        self._attr_unique_id = f"{config_entry.entry_id}_{description.key}"
+
+    @property
+    def _last_run(self) -> UpdateRun | None:
+        return self.hass.data[DOMAIN][self._config_entry.entry_id]["metrics"].last
+
+    @property
+    def native_value(self) -> float | int | None:
+        """Return the value for the last update."""
+        if (run := self._last_run) is None:
+            return None
+        return self.entity_description.value_fn(run)
+
+    @property
+    def extra_state_attributes(self) -> dict | None:
+        """Return whether an update is running and the per-phase timings of the last one."""
+        if self.entity_description.key != "last_update_duration":
+            return None
+        entry_data = self.hass.data[DOMAIN][self._config_entry.entry_id]
+        attributes = {"in_progress": entry_data["updates"].in_progress}
+        if (run := self._last_run) is not None:
+            attributes["success"] = run.success
+            attributes["phases"] = {name: asdict(timing) for name, timing in run.phases.items()}
+        return attributes
+
+    async def async_added_to_hass(self) -> None:
+        """Refresh when an update starts or finishes."""
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_METRICS_UPDATED.format(self._config_entry.entry_id),
+                self.async_write_ha_state,
+            )
+        )
+
+class ThamesWaterBackfillSensor(ThamesWaterEntity, SensorEntity):
+    """Diagnostic sensor reporting the progress of the history backfill."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_should_poll = False
+    _attr_name = "Backfill Progress"
+    _attr_native_unit_of_measurement = PERCENTAGE
+    _attr_icon = "mdi:history"
+
+    def __init__(self, config_entry: ConfigEntry, meter_id: str) -> None:
+        """Initialize the progress sensor of one of the entry's meters."""
+        self._config_entry = config_entry
+        self._meter_id = meter_id
+        self._attr_unique_id = f"{config_entry.entry_id}_{meter_id}_backfill_progress"
+
+    @property
+    def _backfill(self) -> BackfillManager:
+        return self.hass.data[DOMAIN][self._config_entry.entry_id]["backfills"][self._meter_id]
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the percentage of days loaded."""
+        return self._backfill.progress
+
+    @property
+    def extra_state_attributes(self) -> dict | None:
+        """Return the range and state of the backfill."""
+        backfill = self._backfill
+        if (checkpoint := backfill.checkpoint) is None:
+            return None
+        return {
+            "running": backfill.running,
+            "start_date": checkpoint.start.isoformat(),
+            "end_date": checkpoint.end.isoformat(),
+            "next_end_date": checkpoint.next_end.isoformat(),
+            "error": backfill.error,
+        }
+
+    async def async_added_to_hass(self) -> None:
+        """Refresh when the backfill makes progress."""
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_BACKFILL_UPDATED.format(self._config_entry.entry_id),
+                self.async_write_ha_state,
+            )
         )
-        async_add_external_statistics(self._hass, metadata_consumption, stats)
-        async_add_external_statistics(self._hass, metadata_cost, cost_stats)
\ No newline at end of file
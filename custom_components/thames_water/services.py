@@ -0,0 +1,108 @@
+"""Services for the Thames Water integration."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import DEFAULT_LITER_COST, DOMAIN
+from .cost import async_rebuild_entry_cost
+from .registry import entry_meter_ids
+from .timebuckets import uk_midnight
+from .verify import async_verify_history
+
+SERVICE_BACKFILL = "backfill"
+SERVICE_REBUILD_COST = "rebuild_cost"
+SERVICE_VERIFY_HISTORY = "verify_history"
+
+BACKFILL_SCHEMA = vol.Schema(
+    {
+        vol.Optional("config_entry_id"): cv.string,
+        vol.Required("start_date"): cv.date,
+        vol.Optional("end_date"): cv.date,
+    }
+)
+
+REBUILD_COST_SCHEMA = vol.Schema(
+    {
+        vol.Optional("config_entry_id"): cv.string,
+        vol.Optional("effective_date"): cv.date,
+        vol.Optional("liter_cost"): vol.All(
+            vol.Coerce(float), vol.Range(min=0.00005, max=1.0)
+        ),
+    }
+)
+
+VERIFY_HISTORY_SCHEMA = BACKFILL_SCHEMA
+
+
+def _entry_ids(hass: HomeAssistant, call: ServiceCall) -> list[str]:
+    """Return the loaded entries a service call targets."""
+    entries = hass.data.get(DOMAIN, {})
+    if (entry_id := call.data.get("config_entry_id")) is None:
+        return list(entries)
+    if entry_id not in entries:
+        raise ServiceValidationError(f"Thames Water entry {entry_id} is not loaded")
+    return [entry_id]
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration's services."""
+
+    async def async_backfill(call: ServiceCall) -> None:
+        """Load history between two dates in the background."""
+        start = call.data["start_date"]
+        # Data is available from at least 3 days ago.
+        end = call.data.get("end_date", dt_util.now().date() - timedelta(days=3))
+        if end < start:
+            raise ServiceValidationError("end_date must not be before start_date")
+        for entry_id in _entry_ids(hass, call):
+            for backfill in hass.data[DOMAIN][entry_id]["backfills"].values():
+                await backfill.async_start(start, end)
+
+    async def async_rebuild_cost(call: ServiceCall) -> None:
+        """Reprice imported cost statistics from the stored consumption."""
+        effective = None
+        if (effective_date := call.data.get("effective_date")) is not None:
+            effective = uk_midnight(effective_date)
+        for entry_id in _entry_ids(hass, call):
+            entry = hass.config_entries.async_get_entry(entry_id)
+            if (liter_cost := call.data.get("liter_cost")) is not None:
+                # New readings are priced at the new cost from now on too.
+                hass.config_entries.async_update_entry(
+                    entry, options={**entry.options, "liter_cost": liter_cost}
+                )
+            else:
+                liter_cost = float(
+                    entry.options.get(
+                        "liter_cost", entry.data.get("liter_cost", DEFAULT_LITER_COST)
+                    )
+                )
+            await async_rebuild_entry_cost(hass, entry, liter_cost, effective)
+
+    async def async_verify(call: ServiceCall) -> None:
+        """Repair imported days that disagree with the meter register."""
+        start = call.data["start_date"]
+        end = call.data.get("end_date", dt_util.now().date() - timedelta(days=3))
+        if end < start:
+            raise ServiceValidationError("end_date must not be before start_date")
+        for entry_id in _entry_ids(hass, call):
+            entry = hass.config_entries.async_get_entry(entry_id)
+            for meter_id in entry_meter_ids(entry):
+                await async_verify_history(hass, entry, meter_id, start, end)
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_BACKFILL, async_backfill, schema=BACKFILL_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_REBUILD_COST, async_rebuild_cost, schema=REBUILD_COST_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_VERIFY_HISTORY, async_verify, schema=VERIFY_HISTORY_SCHEMA
+    )
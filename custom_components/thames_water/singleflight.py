@@ -0,0 +1,75 @@
+"""Single-flight updates for the Thames Water integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """Run at most one update per meter of an entry at a time.
+
+    A trigger that arrives while the meter's update runs does not start a
+    second one reading the same last statistics: all such triggers are
+    merged into a single follow-up run, started when the current one ends,
+    and each caller waits until a run that started after its trigger has
+    finished. ``signal`` is sent whenever an update starts or stops.
+    """
+
+    def __init__(self, hass: HomeAssistant, signal: str) -> None:
+        """Initialize the guard of an entry."""
+        self._hass = hass
+        self._signal = signal
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._pending: set[str] = set()
+
+    @property
+    def in_progress(self) -> bool:
+        """Return whether an update of any meter is running."""
+        return bool(self._tasks)
+
+    def is_running(self, meter_id: str) -> bool:
+        """Return whether an update of ``meter_id`` is running."""
+        return meter_id in self._tasks
+
+    async def async_run(self, meter_id: str, job: Callable[[], Awaitable[None]]) -> None:
+        """Run ``job`` for a meter, or merge it into the follow-up of the running update."""
+        if (task := self._tasks.get(meter_id)) is not None:
+            _LOGGER.debug("Update of meter %s already running, merging into its follow-up", meter_id)
+            self._pending.add(meter_id)
+        else:
+            task = self._tasks[meter_id] = self._hass.async_create_background_task(
+                self._async_loop(meter_id, job), f"thames_water update {meter_id}"
+            )
+            async_dispatcher_send(self._hass, self._signal)
+        # A cancelled caller leaves the run going for the others.
+        await asyncio.shield(task)
+
+    async def _async_loop(self, meter_id: str, job: Callable[[], Awaitable[None]]) -> None:
+        try:
+            while True:
+                self._pending.discard(meter_id)
+                try:
+                    await job()
+                except Exception:
+                    if meter_id not in self._pending:
+                        raise
+                    _LOGGER.exception("Error updating meter %s, running the follow-up", meter_id)
+                if meter_id not in self._pending:
+                    return
+        finally:
+            del self._tasks[meter_id]
+            self._pending.discard(meter_id)
+            async_dispatcher_send(self._hass, self._signal)
+
+    @callback
+    def async_cancel(self) -> None:
+        """Cancel the running updates."""
+        for task in self._tasks.values():
+            task.cancel()
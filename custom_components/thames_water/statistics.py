@@ -0,0 +1,415 @@
+"""Statistics generation for the Thames Water integration."""
+
+from __future__ import annotations
+
+from array import array
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+import logging
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import (
+    get_last_statistics,
+    statistics_during_period,
+)
+from homeassistant.const import UnitOfVolume
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import (
+    CONSUMPTION_STATISTIC_ID,
+    COST_STATISTIC_ID,
+    DOMAIN,
+    ROLLUP_CONSUMPTION_STATISTIC_ID,
+    ROLLUP_COST_STATISTIC_ID,
+)
+from .thameswaterclient import MeterUsage
+from .timebuckets import uk_time, utc_starts
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy ships with Home Assistant
+    np = None
+
+_LOGGER = logging.getLogger(__name__)
+
+# Window used to search the recorder for the statistic nearest to a time.
+SEARCH_DAYS = 90
+# No Thames Water smart meter data predates this.
+HISTORY_START = datetime(2015, 1, 1, tzinfo=dt_util.UTC)
+# Litres by which usage may differ from the register before it is repaired.
+READ_TOLERANCE = 1.0
+
+
+class HourlySeries:
+    """Hourly readings as columns of naive UK start times, UTC start timestamps, litres, estimate flags and register reads.
+
+    A read of 0 means the line carried no register value. The UTC column is
+    worked out a day at a time, so the hours around a clock change stay
+    distinct and no reading needs a time zone conversion of its own.
+    """
+
+    __slots__ = ("starts", "utc", "usage", "estimated", "read")
+
+    def __init__(self) -> None:
+        """Initialize an empty series."""
+        self.starts: list[datetime] = []
+        self.utc = array("d")
+        self.usage = array("d")
+        self.estimated = array("b")
+        self.read = array("d")
+
+    @classmethod
+    def from_readings(cls, readings: list[dict]) -> HourlySeries:
+        """Build a series from ``{"dt": ..., "state": ...}`` dicts."""
+        series = cls()
+        for reading in readings:
+            series.append(
+                reading["dt"],
+                reading["state"],
+                reading.get("estimated", False),
+                reading.get("read", 0.0),
+            )
+        return series
+
+    def append(
+        self,
+        start: datetime,
+        usage: float,
+        estimated: bool = False,
+        read: float = 0.0,
+        utc: float | None = None,
+    ) -> None:
+        """Add one reading, starting at the UTC timestamp ``utc`` if known."""
+        if utc is None:
+            utc = utc_starts(start.date(), [start.hour * 60 + start.minute])[0]
+        self.starts.append(start)
+        self.utc.append(utc)
+        self.usage.append(usage)
+        self.estimated.append(estimated)
+        self.read.append(read)
+
+    def extend_day(self, day: date, data: MeterUsage) -> float:
+        """Add the hourly lines of one day and return the day's total usage."""
+        # Labels were converted to minutes since midnight when parsed.
+        lines = data.Lines
+        total = sum(lines.usage)
+        valid = []
+        for index, minute_of_day in enumerate(lines.minute_of_day):
+            if minute_of_day < 0:
+                _LOGGER.error("Error parsing time %s", lines.labels[index])
+            else:
+                valid.append(index)
+        minutes = [lines.minute_of_day[i] for i in valid]
+        self.starts.extend(
+            datetime(day.year, day.month, day.day, minute // 60, minute % 60) for minute in minutes
+        )
+        self.utc.extend(utc_starts(day, minutes))
+        self.usage.extend(lines.usage[i] for i in valid)
+        self.estimated.extend(lines.estimated[i] for i in valid)
+        self.read.extend(lines.read[i] for i in valid)
+        return total
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def _take(self, indices) -> HourlySeries:
+        series = HourlySeries()
+        series.starts = [self.starts[i] for i in indices]
+        series.utc = array("d", (self.utc[i] for i in indices))
+        series.usage = array("d", (self.usage[i] for i in indices))
+        series.estimated = array("b", (self.estimated[i] for i in indices))
+        series.read = array("d", (self.read[i] for i in indices))
+        return series
+
+    def sorted(self) -> HourlySeries:
+        """Return the series in time order, keeping equal times in their original order.
+
+        Labels in an hour skipped by the clock share their UTC time with the
+        hour after, so they are ordered by label first.
+        """
+        utc = self.utc
+        if all(a <= b for a, b in zip(utc, utc[1:])):
+            return self
+        starts = self.starts
+        return self._take(sorted(range(len(utc)), key=lambda i: (utc[i], starts[i])))
+
+    def after(self, start_ts: datetime) -> HourlySeries:
+        """Return the readings that start after the UTC time ``start_ts``."""
+        limit = start_ts.timestamp()
+        return self._take([i for i, start in enumerate(self.utc) if start > limit])
+
+    def before(self, end_ts: datetime) -> HourlySeries:
+        """Return the readings that start before the UTC time ``end_ts``."""
+        limit = end_ts.timestamp()
+        return self._take([i for i, start in enumerate(self.utc) if start < limit])
+
+    def read_at(self, end_ts: datetime) -> float:
+        """Return the register after the last reading starting at or before the UTC time ``end_ts``, or 0."""
+        limit = end_ts.timestamp()
+        read = 0.0
+        for start, value in zip(self.utc, self.read):
+            if start <= limit and value:
+                read = value
+        return read
+
+    def by_hour(self) -> HourlySeries:
+        """Return the series in time order with one reading per UTC hour.
+
+        Readings within the same hour are added up, keeping the first start,
+        the last register read and an estimate flag if any was estimated.
+        """
+        series = HourlySeries()
+        ordered = self.sorted()
+        last_hour = None
+        for start, utc, usage, estimated, read in zip(
+            ordered.starts, ordered.utc, ordered.usage, ordered.estimated, ordered.read
+        ):
+            hour = utc - utc % 3600
+            if hour == last_hour:
+                series.usage[-1] += usage
+                series.estimated[-1] |= estimated
+                if read:
+                    series.read[-1] = read
+                continue
+            series.append(start, usage, estimated, read, hour)
+            last_hour = hour
+        return series
+
+    def reconcile(self, previous_read: float = 0.0) -> tuple[int, float]:
+        """Make the usage of each reading match the change of the register since the one before.
+
+        The series must be in time order. ``previous_read`` is the register
+        before the first reading. A missing line shows up as a larger
+        register step on the next one and a duplicated line as no step, so
+        taking the usage from the register keeps the running sums on the
+        meter. Readings without a read, and the one after a register that
+        went backwards, such as a replaced meter, are left alone. Returns
+        the number of readings changed and the litres added by them.
+        """
+        repaired = 0
+        drift = 0.0
+        for index, read in enumerate(self.read):
+            if not read:
+                continue
+            if previous_read and read >= previous_read:
+                delta = read - previous_read
+                if abs(delta - self.usage[index]) > READ_TOLERANCE:
+                    drift += delta - self.usage[index]
+                    self.usage[index] = delta
+                    repaired += 1
+            previous_read = read
+        return repaired, drift
+
+    def total_on(self, day: date) -> float:
+        """Return the litres used on ``day``."""
+        return sum(
+            usage for start, usage in zip(self.starts, self.usage) if start.date() == day
+        )
+
+
+def day_ranges(days: list[date]) -> list[tuple[date, date]]:
+    """Group sorted days into contiguous (first, last) ranges."""
+    ranges: list[tuple[date, date]] = []
+    for day in days:
+        if ranges and ranges[-1][1] == day - timedelta(days=1):
+            ranges[-1] = (ranges[-1][0], day)
+        else:
+            ranges.append((day, day))
+    return ranges
+
+
+def _running_sums(values, start: float) -> list[float]:
+    # Both paths add strictly left to right, matching a plain Python loop.
+    if np is not None:
+        return np.cumsum(np.concatenate(([start], values)))[1:].tolist()
+    return list(accumulate(values, initial=start))[1:]
+
+
+def _utc_hours(utc) -> list[datetime]:
+    return [dt_util.utc_from_timestamp(start - start % 3600) for start in utc]
+
+
+def generate_statistics(
+    series: HourlySeries,
+    liter_cost: float,
+    cumulative_start: float = 0.0,
+    cost_cumulative_start: float = 0.0,
+) -> tuple[list[StatisticData], list[StatisticData]]:
+    """Return the consumption and cost statistics of a series in one pass.
+
+    Readings are sorted by time and each start is truncated to its hour.
+    The running sums continue from ``cumulative_start`` and
+    ``cost_cumulative_start``.
+    """
+    if not series:
+        return [], []
+    series = series.sorted()
+    hours = _utc_hours(series.utc)
+    if np is not None:
+        usage = np.frombuffer(series.usage, dtype=np.float64)
+        cost = usage * liter_cost
+        cost_values = cost.tolist()
+    else:
+        usage = series.usage
+        cost = cost_values = [value * liter_cost for value in usage]
+    sums = _running_sums(usage, cumulative_start)
+    cost_sums = _running_sums(cost, cost_cumulative_start)
+
+    stats = [
+        StatisticData(start=hour, state=state, sum=total)
+        for hour, state, total in zip(hours, series.usage, sums)
+    ]
+    cost_stats = [
+        StatisticData(start=hour, state=state, sum=total)
+        for hour, state, total in zip(hours, cost_values, cost_sums)
+    ]
+    return stats, cost_stats
+
+
+def consumption_statistic_id(meter_id: str, rollup: str | None = None) -> str:
+    """Return the ID of a meter's hourly consumption statistic, or of its ``daily`` or ``monthly`` rollup."""
+    if rollup is None:
+        return CONSUMPTION_STATISTIC_ID.format(slugify(meter_id))
+    return ROLLUP_CONSUMPTION_STATISTIC_ID.format(rollup, slugify(meter_id))
+
+
+def cost_statistic_id(meter_id: str, rollup: str | None = None) -> str:
+    """Return the ID of a meter's hourly cost statistic, or of its ``daily`` or ``monthly`` rollup."""
+    if rollup is None:
+        return COST_STATISTIC_ID.format(slugify(meter_id))
+    return ROLLUP_COST_STATISTIC_ID.format(rollup, slugify(meter_id))
+
+
+def _name(kind: str, meter_id: str, rollup: str | None) -> str:
+    if rollup is None:
+        return f"Thames Water {kind} {meter_id}"
+    return f"Thames Water {rollup.capitalize()} {kind} {meter_id}"
+
+
+def consumption_metadata(meter_id: str, rollup: str | None = None) -> StatisticMetaData:
+    """Return the metadata of a meter's consumption statistic."""
+    return StatisticMetaData(
+        has_mean=False,
+        has_sum=True,
+        name=_name("Consumption", meter_id, rollup),
+        source=DOMAIN,
+        statistic_id=consumption_statistic_id(meter_id, rollup),
+        unit_of_measurement=UnitOfVolume.LITERS,
+        mean_type=StatisticMeanType.NONE,
+        unit_class="volume",
+    )
+
+
+def cost_metadata(meter_id: str, rollup: str | None = None) -> StatisticMetaData:
+    """Return the metadata of a meter's cost statistic."""
+    return StatisticMetaData(
+        has_mean=False,
+        has_sum=True,
+        name=_name("Cost", meter_id, rollup),
+        source=DOMAIN,
+        statistic_id=cost_statistic_id(meter_id, rollup),
+        unit_of_measurement="GBP",
+        mean_type=StatisticMeanType.NONE,
+        unit_class=None,
+    )
+
+
+async def async_hourly_statistics(
+    hass: HomeAssistant,
+    statistic_id: str,
+    start: datetime,
+    end: datetime,
+    types: set[str],
+) -> list[dict]:
+    """Return the hourly rows of a statistic between two UTC times."""
+    stats = await get_instance(hass).async_add_executor_job(
+        statistics_during_period,
+        hass,
+        start,
+        end,
+        {statistic_id},
+        "hour",
+        None,
+        types,
+    )
+    return stats.get(statistic_id, [])
+
+
+async def async_last_statistic(hass: HomeAssistant, statistic_id: str) -> dict | None:
+    """Return the last row of a statistic, with its sum."""
+    stats = await get_instance(hass).async_add_executor_job(
+        get_last_statistics, hass, 1, statistic_id, True, {"sum"}
+    )
+    if not (rows := stats.get(statistic_id)) or rows[0].get("sum") is None:
+        return None
+    return rows[0]
+
+
+async def async_statistic_changes(
+    hass: HomeAssistant,
+    statistic_id: str,
+    start: datetime,
+    end: datetime,
+    period: str,
+) -> dict[date, float]:
+    """Return the change of a statistic's sum per UK ``day`` or ``month`` between two UTC times.
+
+    The hourly changes are added up by UK day, as the recorder's own daily
+    and monthly periods follow the local time zone, which need not be the UK.
+    Months are keyed by their first day.
+    """
+    stats = await get_instance(hass).async_add_executor_job(
+        statistics_during_period,
+        hass,
+        start,
+        end,
+        {statistic_id},
+        "hour",
+        None,
+        {"change"},
+    )
+    changes: dict[date, float] = {}
+    for row in stats.get(statistic_id, []):
+        if row.get("change") is None:
+            continue
+        day = uk_time(row["start"]).date()
+        if period == "month":
+            day = day.replace(day=1)
+        changes[day] = changes.get(day, 0.0) + row["change"]
+    return changes
+
+
+async def async_first_statistic(
+    hass: HomeAssistant, statistic_id: str, start: datetime
+) -> dict | None:
+    """Return the first hourly statistic at or after ``start``."""
+    end = dt_util.utcnow()
+    start = max(start, HISTORY_START)
+    while start < end:
+        window_end = start + timedelta(days=SEARCH_DAYS)
+        if rows := await async_hourly_statistics(
+            hass, statistic_id, start, window_end, {"state", "sum"}
+        ):
+            return rows[0]
+        start = window_end
+    return None
+
+
+async def async_last_statistic_before(
+    hass: HomeAssistant, statistic_id: str, end: datetime
+) -> dict | None:
+    """Return the last hourly statistic before ``end``."""
+    while end > HISTORY_START:
+        window_start = end - timedelta(days=SEARCH_DAYS)
+        if rows := await async_hourly_statistics(
+            hass, statistic_id, window_start, end, {"state", "sum"}
+        ):
+            return rows[-1]
+        end = window_start
+    return None
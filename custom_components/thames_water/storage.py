@@ -0,0 +1,330 @@
+"""Persistent storage for the Thames Water integration."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+import hashlib
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .timebuckets import hours_in_day
+
+STORAGE_VERSION = 1
+MAX_ESTIMATE_INTERVAL = 16
+
+
+def _account_key(username: str) -> str:
+    """Return a stable storage key for an account without exposing the email."""
+    return hashlib.sha256(username.strip().lower().encode()).hexdigest()[:16]
+
+
+class SessionStore:
+    """Refresh token and cookie jar of a logged-in account.
+
+    Home Assistant's Store has no encryption; the file is written with
+    ``private=True`` so it is only readable by the Home Assistant user, the
+    same protection the config entry holding the password gets.
+    """
+
+    def __init__(self, hass: HomeAssistant, username: str) -> None:
+        """Initialize the session store for an account."""
+        self._store: Store[dict] = Store(
+            hass,
+            STORAGE_VERSION,
+            f"{DOMAIN}.session.{_account_key(username)}",
+            private=True,
+        )
+
+    async def async_load(self) -> dict | None:
+        """Return the saved session, if any."""
+        return await self._store.async_load()
+
+    async def async_save(self, session_state: dict) -> None:
+        """Save the session."""
+        await self._store.async_save(session_state)
+
+    async def async_remove(self) -> None:
+        """Delete the saved session."""
+        await self._store.async_remove()
+
+
+@dataclass
+class IngestionCursor:
+    """Last imported hour of a meter and the running sums after it."""
+
+    start: float
+    consumption_sum: float
+    cost_sum: float
+
+
+@dataclass
+class RollupCursor:
+    """Next day or month of a rollup to import and the running sums before it."""
+
+    start: date
+    consumption_sum: float
+    cost_sum: float
+
+    @classmethod
+    def from_dict(cls, data: dict) -> RollupCursor:
+        """Build a rollup cursor from its stored form."""
+        return cls(
+            start=date.fromisoformat(data["start"]),
+            consumption_sum=data["consumption_sum"],
+            cost_sum=data["cost_sum"],
+        )
+
+    def to_dict(self) -> dict:
+        """Return the stored form of the rollup cursor."""
+        return {**asdict(self), "start": self.start.isoformat()}
+
+
+class CursorStore:
+    """Ingestion cursor of one meter and the cursors of its rollups.
+
+    Both are saved in one file, so the file is read once and kept.
+    """
+
+    def __init__(self, hass: HomeAssistant, meter_id: str) -> None:
+        """Initialize the cursor store for a meter."""
+        self._store: Store[dict] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.cursor.{meter_id}"
+        )
+        self._data: dict | None = None
+
+    async def _async_data(self) -> dict:
+        if self._data is None:
+            self._data = await self._store.async_load() or {}
+        return self._data
+
+    async def async_load(self) -> IngestionCursor | None:
+        """Return the saved cursor, if any."""
+        data = await self._async_data()
+        if "start" not in data:
+            return None
+        return IngestionCursor(data["start"], data["consumption_sum"], data["cost_sum"])
+
+    async def async_save(self, cursor: IngestionCursor) -> None:
+        """Save the cursor."""
+        data = await self._async_data()
+        data.update(asdict(cursor))
+        await self._store.async_save(data)
+
+    async def async_remove(self) -> None:
+        """Delete the saved cursor, keeping the rollup cursors."""
+        data = await self._async_data()
+        for field in ("start", "consumption_sum", "cost_sum"):
+            data.pop(field, None)
+        await self._store.async_save(data)
+
+    async def async_load_rollups(self) -> dict[str, RollupCursor]:
+        """Return the saved rollup cursors by rollup."""
+        data = await self._async_data()
+        return {
+            rollup: RollupCursor.from_dict(cursor)
+            for rollup, cursor in data.get("rollups", {}).items()
+        }
+
+    async def async_save_rollups(self, cursors: dict[str, RollupCursor]) -> None:
+        """Save the rollup cursors."""
+        data = await self._async_data()
+        data["rollups"] = {rollup: cursor.to_dict() for rollup, cursor in cursors.items()}
+        await self._store.async_save(data)
+
+
+@dataclass
+class BackfillCheckpoint:
+    """Progress of a backfill, which loads history from ``end`` back to ``start``.
+
+    ``next_end`` is the last day of the next chunk to fetch, and the sums
+    are the running totals just before the oldest hour imported so far.
+    Hours from ``before`` (a UTC timestamp) on were already imported when
+    the backfill started and are left alone.
+    """
+
+    start: date
+    end: date
+    next_end: date
+    before: float
+    consumption_sum: float
+    cost_sum: float
+    liter_cost: float
+
+    @classmethod
+    def from_dict(cls, data: dict) -> BackfillCheckpoint:
+        """Build a checkpoint from its stored form."""
+        return cls(
+            start=date.fromisoformat(data["start"]),
+            end=date.fromisoformat(data["end"]),
+            next_end=date.fromisoformat(data["next_end"]),
+            before=data["before"],
+            consumption_sum=data["consumption_sum"],
+            cost_sum=data["cost_sum"],
+            liter_cost=data["liter_cost"],
+        )
+
+    def to_dict(self) -> dict:
+        """Return the stored form of the checkpoint."""
+        return {
+            **asdict(self),
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "next_end": self.next_end.isoformat(),
+        }
+
+
+class BackfillStore:
+    """Checkpoint of the running backfill of one meter."""
+
+    def __init__(self, hass: HomeAssistant, meter_id: str) -> None:
+        """Initialize the checkpoint store for a meter."""
+        self._store: Store[dict] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.backfill.{meter_id}"
+        )
+
+    async def async_load(self) -> BackfillCheckpoint | None:
+        """Return the saved checkpoint, if any."""
+        if (data := await self._store.async_load()) is None:
+            return None
+        return BackfillCheckpoint.from_dict(data)
+
+    async def async_save(self, checkpoint: BackfillCheckpoint) -> None:
+        """Save the checkpoint."""
+        await self._store.async_save(checkpoint.to_dict())
+
+    async def async_remove(self) -> None:
+        """Delete the checkpoint once the backfill has finished."""
+        await self._store.async_remove()
+
+
+class AvailabilityStore:
+    """Hours after the end of a day at which recent days of one meter were first imported."""
+
+    def __init__(self, hass: HomeAssistant, meter_id: str) -> None:
+        """Initialize the availability store for a meter."""
+        self._store: Store[dict] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.availability.{meter_id}"
+        )
+
+    async def async_load(self) -> list[float]:
+        """Return the saved delays, oldest first."""
+        if (data := await self._store.async_load()) is None:
+            return []
+        return data["delays"]
+
+    async def async_save(self, delays: list[float]) -> None:
+        """Save the delays."""
+        await self._store.async_save({"delays": delays})
+
+
+class CoverageIndex:
+    """Which local hours of each recent day have been imported for one meter.
+
+    Each day is stored as a 24-bit mask of its hours. Days from ``since``
+    on are tracked; days before the index existed are assumed complete.
+
+    Hours imported from estimated readings are tracked too, with the date
+    their day is due to be checked again. The interval doubles after every
+    check that still finds estimates, up to ``MAX_ESTIMATE_INTERVAL`` days.
+    """
+
+    def __init__(self, hass: HomeAssistant, meter_id: str, keep_days: int) -> None:
+        """Initialize the coverage index for a meter."""
+        self._store: Store[dict] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.coverage.{meter_id}"
+        )
+        self._keep_days = keep_days
+        self.since: date | None = None
+        self._days: dict[str, int] = {}
+        # Day -> [estimated hours mask, checks so far, next check date].
+        self._estimated: dict[str, list] = {}
+        self._loaded = False
+
+    async def async_load(self) -> None:
+        """Load the index from disk once."""
+        if self._loaded:
+            return
+        if (data := await self._store.async_load()) is not None:
+            self.since = date.fromisoformat(data["since"]) if data["since"] else None
+            self._days = data["days"]
+            self._estimated = data.get("estimated", {})
+        self._loaded = True
+
+    async def async_save(self) -> None:
+        """Drop days too old to be refetched and save the index."""
+        if self._days:
+            newest = max(self._days)
+            oldest = (date.fromisoformat(newest) - timedelta(days=self._keep_days)).isoformat()
+            self._days = {day: mask for day, mask in self._days.items() if day >= oldest}
+            # Estimates older than that are kept as imported.
+            self._estimated = {
+                day: entry for day, entry in self._estimated.items() if day >= oldest
+            }
+        await self._store.async_save(
+            {
+                "since": self.since.isoformat() if self.since else None,
+                "days": self._days,
+                "estimated": self._estimated,
+            }
+        )
+
+    def mark(self, start: datetime, estimated: bool = False) -> None:
+        """Record the hour starting at the naive UK time ``start`` as imported."""
+        if self.since is None:
+            self.since = start.date()
+        day = start.date().isoformat()
+        bit = 1 << start.hour
+        self._days[day] = self._days.get(day, 0) | bit
+        if estimated:
+            tomorrow = (dt_util.now().date() + timedelta(days=1)).isoformat()
+            self._estimated.setdefault(day, [0, 0, tomorrow])[0] |= bit
+        elif day in self._estimated:
+            entry = self._estimated[day]
+            entry[0] &= ~bit
+            if not entry[0]:
+                del self._estimated[day]
+
+    def is_estimated(self, start: datetime) -> bool:
+        """Return whether the hour starting at ``start`` was imported from an estimate."""
+        entry = self._estimated.get(start.date().isoformat())
+        return entry is not None and bool(entry[0] & 1 << start.hour)
+
+    def estimated_days_due(self, today: date) -> list[date]:
+        """Return the days with estimated hours that are due to be checked again."""
+        return sorted(
+            date.fromisoformat(day)
+            for day, (_, _, due) in self._estimated.items()
+            if due <= today.isoformat()
+        )
+
+    def checked(self, day: date, today: date) -> None:
+        """Schedule the next check of a day that still has estimated hours."""
+        if (entry := self._estimated.get(day.isoformat())) is None:
+            return
+        entry[1] += 1
+        interval = min(2 ** entry[1], MAX_ESTIMATE_INTERVAL)
+        entry[2] = (today + timedelta(days=interval)).isoformat()
+
+    def is_imported(self, start: datetime) -> bool:
+        """Return whether the hour starting at the naive UK time ``start`` was imported."""
+        return bool(self._days.get(start.date().isoformat(), 0) & 1 << start.hour)
+
+    def first_estimated_day(self) -> date | None:
+        """Return the oldest tracked day with hours imported from estimates."""
+        return date.fromisoformat(min(self._estimated)) if self._estimated else None
+
+    def missing_days(self, start: date, end: date) -> list[date]:
+        """Return the tracked days from ``start`` to ``end`` with hours not imported."""
+        if self.since is None:
+            return []
+        day = max(start, self.since)
+        missing = []
+        while day <= end:
+            if self._days.get(day.isoformat(), 0).bit_count() < hours_in_day(day):
+                missing.append(day)
+            day += timedelta(days=1)
+        return missing
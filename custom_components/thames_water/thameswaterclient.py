@@ -1,19 +1,106 @@
 import base64
-from dataclasses import dataclass, field
+from array import array
+import asyncio
+from dataclasses import dataclass, field, replace
 import datetime
+from email.utils import formatdate, parsedate_to_datetime
 import hashlib
+from http.cookies import Morsel
 import logging
 import os
-from typing import Literal, Optional
+from typing import TYPE_CHECKING, Literal, Optional
 import uuid
 
+import aiohttp
 import requests
+from yarl import URL
 
+from .metrics import record_error, record_retry, timed
+from .timebuckets import day_offsets
+
+if TYPE_CHECKING:
+    from .scheduler import FetchScheduler
 
 _LOGGER = logging.getLogger(__name__)
 
+LOGIN_URL = "https://login.thameswater.co.uk/identity.thameswater.co.uk"
+ACCOUNT_URL = "https://myaccount.thameswater.co.uk"
+REDIRECT_URI = "https://www.thameswater.co.uk/login"
+# Path prefix of the B2C login endpoints below a base_url override.
+LOGIN_PATH = "/identity.thameswater.co.uk"
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36"
+REQUEST_TIMEOUT = 30
+INITIAL_WINDOW_DAYS = 7
+MAX_WINDOW_DAYS = 31
+# Consecutive failures of one class after which a range fetch stops.
+BREAKER_THRESHOLD = 3
 
-@dataclass
+
+class SessionExpiredError(Exception):
+    """Raised when the myaccount session is still unauthenticated after a re-login."""
+
+
+class ThrottledError(Exception):
+    """Raised when Thames Water answers 429 or 503."""
+
+    def __init__(self, status: int, retry_after: float | None):
+        super().__init__(f"HTTP {status}, retry after {retry_after}s")
+        self.status = status
+        self.retry_after = retry_after
+
+
+def failure_class(err) -> str:
+    """Return whether a failed request was an ``auth``, ``throttled``, ``server`` or ``data`` error."""
+    if isinstance(err, SessionExpiredError):
+        return "auth"
+    if isinstance(err, ThrottledError):
+        return "throttled"
+    status = err.status if isinstance(err, aiohttp.ClientResponseError) else None
+    if isinstance(err, requests.HTTPError) and err.response is not None:
+        status = err.response.status_code
+    if status in (401, 403):
+        return "auth"
+    if isinstance(err, (aiohttp.ClientError, requests.RequestException, TimeoutError)):
+        return "server" if status is None or status >= 500 else "data"
+    return "data"
+
+
+class CircuitBreaker:
+    """Stop fetching a range after consecutive failures of one class.
+
+    Any success resets the count, as does a failure of another class. Data
+    errors concern single windows, which are retried in halves, and never
+    open it. Once open, no more requests are made for the range.
+    """
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD) -> None:
+        self.threshold = threshold
+        self.failures: dict[str, int] = {}
+        self.tripped: str | None = None
+        self.retry_after: float | None = None
+
+    @property
+    def open(self) -> bool:
+        return self.tripped is not None
+
+    def record_success(self) -> None:
+        self.failures = {}
+
+    def record_failure(self, err) -> None:
+        kind = failure_class(err)
+        if kind == "data" or self.open:
+            return
+        self.failures = {kind: self.failures.get(kind, 0) + 1}
+        if isinstance(err, ThrottledError) and err.retry_after is not None:
+            self.retry_after = max(self.retry_after or 0.0, err.retry_after)
+        if self.failures[kind] >= self.threshold:
+            self.tripped = kind
+            _LOGGER.warning(
+                "Stopped fetching after %d consecutive %s errors: %s", self.threshold, kind, err
+            )
+
+
+@dataclass(slots=True)
 class Line:
     Label: str
     Usage: float
@@ -22,25 +109,219 @@ class Line:
     MeterSerialNumberHis: str
 
 
-@dataclass
+def _minute_of_day(label: str) -> int:
+    """Return minutes since midnight for a "HH:MM" label, or -1 if it cannot be parsed."""
+    try:
+        hour, minute = label.rsplit(" ", 1)[-1].split(":")
+        return int(hour) * 60 + int(minute)
+    except (AttributeError, ValueError):
+        return -1
+
+
+def _repeated_minutes(day: datetime.date) -> range:
+    """Return the UK wall clock minutes of ``day`` that happen twice, when clocks go back."""
+    _, shift, change = day_offsets(day)
+    return range(shift + change, shift) if change < 0 else range(0)
+
+
+# Label formats of daily and monthly lines, and whether they include the year.
+PERIOD_LABEL_FORMATS = {
+    "D": (
+        ("%d/%m/%Y", True),
+        ("%Y-%m-%d", True),
+        ("%d-%m-%Y", True),
+        ("%d %b %Y", True),
+        ("%d %B %Y", True),
+        ("%d %b", False),
+        ("%d %B", False),
+    ),
+    "M": (
+        ("%b %Y", True),
+        ("%B %Y", True),
+        ("%m/%Y", True),
+        ("%Y-%m", True),
+        ("%b", False),
+        ("%B", False),
+    ),
+}
+
+
+def _parse_period_label(label: str, granularity: str) -> tuple[int | None, int, int] | None:
+    """Return the year, or None if not given, month and day of a daily or monthly label.
+
+    Monthly labels are the first day of their month. None is returned when
+    the label is in no known format.
+    """
+    label = (label or "").strip()
+    for fmt, has_year in PERIOD_LABEL_FORMATS[granularity]:
+        try:
+            if has_year:
+                parsed = datetime.datetime.strptime(label, fmt)
+            else:
+                # A leap year, so 29 February parses.
+                parsed = datetime.datetime.strptime(f"{label} 2000", f"{fmt} %Y")
+        except ValueError:
+            continue
+        return (parsed.year if has_year else None), parsed.month, parsed.day
+    return None
+
+
+class LineSeries:
+    """The Lines of a response stored as parallel typed arrays.
+
+    A year of hourly data is close to nine thousand lines, so they are not
+    kept as one object each. Labels are converted to minutes since midnight
+    once, on parsing. Iterating or indexing still yields Line objects.
+    """
+
+    __slots__ = ("labels", "usage", "read", "estimated", "serials", "minute_of_day")
+
+    def __init__(self) -> None:
+        self.labels: list[str] = []
+        self.usage = array("d")
+        self.read = array("d")
+        self.estimated = array("b")
+        self.serials: list[str] = []
+        self.minute_of_day = array("h")
+
+    def append(self, label: str, usage: float, read: float, estimated: bool, serial: str) -> None:
+        self.labels.append(label)
+        self.usage.append(float(usage or 0.0))
+        self.read.append(float(read or 0.0))
+        self.estimated.append(bool(estimated))
+        self.serials.append(serial)
+        self.minute_of_day.append(_minute_of_day(label))
+
+    @classmethod
+    def from_dicts(cls, lines: list[dict] | None) -> "LineSeries":
+        """Build a series from the JSON lines, ignoring keys that are not Line fields."""
+        series = cls()
+        for line in lines or ():
+            series.append(
+                line.get("Label", ""),
+                line.get("Usage"),
+                line.get("Read"),
+                line.get("IsEstimated", False),
+                line.get("MeterSerialNumberHis", ""),
+            )
+        return series
+
+    @classmethod
+    def from_lines(cls, lines: list[Line]) -> "LineSeries":
+        series = cls()
+        for line in lines:
+            series.append(line.Label, line.Usage, line.Read, line.IsEstimated, line.MeterSerialNumberHis)
+        return series
+
+    @classmethod
+    def from_columns(cls, columns: dict) -> "LineSeries":
+        """Build a series from the columns returned by ``to_columns``."""
+        series = cls()
+        series.labels = list(columns["labels"])
+        series.usage = array("d", columns["usage"])
+        series.read = array("d", columns["read"])
+        series.estimated = array("b", columns["estimated"])
+        serials = columns["serials"]
+        series.serials = serials * len(series.labels) if len(serials) == 1 else list(serials)
+        series.minute_of_day = array("h", map(_minute_of_day, series.labels))
+        return series
+
+    def to_columns(self) -> dict:
+        """Return the lines as one JSON list per field, with a shared serial number stored once."""
+        serials = self.serials[:1] if len(set(self.serials)) == 1 else list(self.serials)
+        return {
+            "labels": list(self.labels),
+            "usage": self.usage.tolist(),
+            "read": self.read.tolist(),
+            "estimated": self.estimated.tolist(),
+            "serials": serials,
+        }
+
+    def to_dicts(self) -> list[dict]:
+        return [
+            {
+                "Label": self.labels[i],
+                "Usage": self.usage[i],
+                "Read": self.read[i],
+                "IsEstimated": bool(self.estimated[i]),
+                "MeterSerialNumberHis": self.serials[i],
+            }
+            for i in range(len(self))
+        ]
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            series = LineSeries()
+            series.labels = self.labels[index]
+            series.usage = self.usage[index]
+            series.read = self.read[index]
+            series.estimated = self.estimated[index]
+            series.serials = self.serials[index]
+            series.minute_of_day = self.minute_of_day[index]
+            return series
+        return Line(
+            self.labels[index],
+            self.usage[index],
+            self.read[index],
+            bool(self.estimated[index]),
+            self.serials[index],
+        )
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, LineSeries):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"LineSeries({len(self)} lines)"
+
+
+@dataclass(slots=True)
 class MeterUsage:
-    IsError: bool
-    IsDataAvailable: bool
-    IsConsumptionAvailable: bool
-    TargetUsage: float
-    AverageUsage: float
-    ActualUsage: float
-    MyUsage: str  # so far have only seen 'NA'
-    AverageUsagePerPerson: float
-    IsMO365Customer: bool
-    IsMOPartialCustomer: bool
-    IsMOCompleteCustomer: bool
-    IsExtraMonthConsumptionMessage: bool
-    Lines: list[Line] = field(default_factory=list)
+    # Every field has a default so a response missing a key still parses.
+    IsError: bool = False
+    IsDataAvailable: bool = True
+    IsConsumptionAvailable: bool = True
+    TargetUsage: float = 0.0
+    AverageUsage: float = 0.0
+    ActualUsage: float = 0.0
+    MyUsage: str = "NA"  # so far have only seen 'NA'
+    AverageUsagePerPerson: float = 0.0
+    IsMO365Customer: bool = False
+    IsMOPartialCustomer: bool = False
+    IsMOCompleteCustomer: bool = False
+    IsExtraMonthConsumptionMessage: bool = False
+    Lines: LineSeries = field(default_factory=LineSeries)
     AlertsValues: Optional[dict] = field(
         default_factory=dict
     )  # assumption that it could be a dict
 
+    def __post_init__(self):
+        if not isinstance(self.Lines, LineSeries):
+            self.Lines = LineSeries.from_lines(self.Lines or [])
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "MeterUsage":
+        """Parse a response, ignoring keys this version does not know about."""
+        known = {
+            name: value
+            for name, value in data.items()
+            if name in cls.__dataclass_fields__ and name != "Lines"
+        }
+        return cls(**known, Lines=LineSeries.from_dicts(data.get("Lines")))
+
+    def to_dict(self) -> dict:
+        data = {name: getattr(self, name) for name in self.__dataclass_fields__}
+        data["Lines"] = self.Lines.to_dicts()
+        return data
+
 
 @dataclass
 class Measurement:
@@ -49,19 +330,44 @@ class Measurement:
     total: int  # Read
 
 
-class ThamesWater:
+class _ThamesWaterBase:
+    """Request building and response parsing shared by the sync and async clients.
+
+    Subclasses only supply the HTTP transport, so both clients send exactly
+    the same authentication and meter requests.
+    """
+
     def __init__(
         self,
         email: str,
         password: str,
         account_number: int,
-        client_id: str = "cedfde2d-79a7-44fd-9833-cae769640d3d",  # specific to Thames Water
+        client_id: str,
+        base_url: str | None = None,
     ):
-        self.s = requests.session()
         self.account_number = account_number
         self.client_id = client_id
+        # base_url points every endpoint at one host, e.g. a local stand-in server.
+        if base_url is None:
+            self.login_url, self.account_url, self.redirect_uri = LOGIN_URL, ACCOUNT_URL, REDIRECT_URI
+        else:
+            base_url = base_url.rstrip("/")
+            self.login_url = f"{base_url}{LOGIN_PATH}"
+            self.account_url = base_url
+            self.redirect_uri = f"{base_url}/login"
+        self._email = email
+        self._password = password
+        self.oauth_request_tokens: dict = {}
+        self.oauth_response_tokens: dict = {}
+        # Number of days requested per getSmartWaterMeterConsumptions call by
+        # get_meter_usage_range; grows while the server answers full windows.
+        self.window_days = INITIAL_WINDOW_DAYS
 
-        self._authenticate(email, password)
+    @property
+    def refresh_token(self) -> str | None:
+        return self.oauth_response_tokens.get(
+            "refresh_token", self.oauth_request_tokens.get("refresh_token")
+        )
 
     def _generate_pkce(self):
         self.pkce_verifier = (
@@ -75,31 +381,26 @@ class ThamesWater:
             .rstrip("=")
         )
 
-    def _authorize_b2c_1_tw_website_signin(self) -> tuple[str, str]:
-        url = "https://login.thameswater.co.uk/identity.thameswater.co.uk/b2c_1_tw_website_signin/oauth2/v2.0/authorize"
+    def _authorize_request(self) -> tuple[str, dict]:
+        url = f"{self.login_url}/b2c_1_tw_website_signin/oauth2/v2.0/authorize"
 
         params = {
             "client_id": self.client_id,
             "scope": "openid profile offline_access",
             "response_type": "code",
-            "redirect_uri": "https://www.thameswater.co.uk/login",
+            "redirect_uri": self.redirect_uri,
             "response_mode": "fragment",
             "code_challenge": self.pkce_challenge,
             "code_challenge_method": "S256",
             "nonce": str(uuid.uuid4()),
             "state": str(uuid.uuid4()),
         }
+        return url, params
 
-        r = self.s.get(url, params=params, timeout=30)
-        r.raise_for_status()
-        return dict(self.s.cookies)["x-ms-cpim-trans"], dict(self.s.cookies)[
-            "x-ms-cpim-csrf"
-        ]
-
-    def _self_asserted_b2c_1_tw_website_signin(
+    def _self_asserted_request(
         self, email: str, password: str, trans_token: str, csrf_token: str
-    ):
-        url = "https://login.thameswater.co.uk/identity.thameswater.co.uk/B2C_1_tw_website_signin/SelfAsserted"
+    ) -> tuple[str, dict, dict, dict]:
+        url = f"{self.login_url}/B2C_1_tw_website_signin/SelfAsserted"
 
         params = {
             "tx": f"StateProperties={trans_token}",
@@ -114,20 +415,17 @@ class ThamesWater:
         }
 
         headers = {
-            "user-agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36",
+            "user-agent": USER_AGENT,
             "x-csrf-token": csrf_token,
         }
+        return url, params, data, headers
 
-        r = self.s.post(url, params=params, data=data, headers=headers, timeout=30)
-        #_LOGGER.debug("SelfAsserted response: %s", r.text)
-        r.raise_for_status()
-
-    def _confirmed_b2c_1_tw_website_signin(self, trans_token: str, csrf_token: str):
-        url = "https://login.thameswater.co.uk/identity.thameswater.co.uk/B2C_1_tw_website_signin/api/CombinedSigninAndSignup/confirmed"
+    def _confirmed_request(
+        self, trans_token: str, csrf_token: str
+    ) -> tuple[str, dict, dict]:
+        url = f"{self.login_url}/B2C_1_tw_website_signin/api/CombinedSigninAndSignup/confirmed"
 
-        headers = {
-            "user-agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36"
-        }
+        headers = {"user-agent": USER_AGENT}
 
         params = {
             "rememberMe": "false",
@@ -135,32 +433,31 @@ class ThamesWater:
             "csrf_token": csrf_token,
             "p": "B2C_1_tw_website_signin",
         }
+        return url, params, headers
 
-        r = self.s.get(url, headers=headers, params=params, timeout=30)
-        #_LOGGER.debug("Confirmed sign-in response URL: %s", r.url)
-        r.raise_for_status()
-
-        if "#" not in r.url:
-            _LOGGER.error("Expected '#' in redirect URL but found none: %s", r.url)
+    @staticmethod
+    def _parse_confirmation_code(redirect_url: str) -> str:
+        if "#" not in redirect_url:
+            _LOGGER.error("Expected '#' in redirect URL but found none: %s", redirect_url)
             raise KeyError("code")
 
         confirmed_signup_structured_response = {
             item.split("=")[0]: item.split("=")[1]
-            for item in r.url.split("#")[1].split("&")
+            for item in redirect_url.split("#")[1].split("&")
         }
         return confirmed_signup_structured_response["code"]
 
-    def _get_oauth2_code_b2c_1_tw_website_signin(self, confirmation_code: str):
-        url = "https://login.thameswater.co.uk/identity.thameswater.co.uk/b2c_1_tw_website_signin/oauth2/v2.0/token"
+    def _oauth2_code_request(self, confirmation_code: str) -> tuple[str, dict, dict]:
+        url = f"{self.login_url}/b2c_1_tw_website_signin/oauth2/v2.0/token"
 
         headers = {
             "content-type": "application/x-www-form-urlencoded;charset=utf-8",
-            "user-agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36",
+            "user-agent": USER_AGENT,
         }
 
         data = {
             "client_id": self.client_id,
-            "redirect_uri": "https://www.thameswater.co.uk/login",
+            "redirect_uri": self.redirect_uri,
             "scope": "openid offline_access profile",
             "grant_type": "authorization_code",
             "client_info": "1",
@@ -172,13 +469,10 @@ class ThamesWater:
             "code_verifier": self.pkce_verifier,
             "code": confirmation_code,
         }
+        return url, data, headers
 
-        r = self.s.post(url, headers=headers, data=data, timeout=30)
-        r.raise_for_status()
-        self.oauth_request_tokens = r.json()
-
-    def _refresh_oauth2_token_b2c_1_tw_website_signin(self):
-        url = "https://login.thameswater.co.uk/identity.thameswater.co.uk/b2c_1_tw_website_signin/oauth2/v2.0/token"
+    def _refresh_token_request(self) -> tuple[str, dict, dict]:
+        url = f"{self.login_url}/b2c_1_tw_website_signin/oauth2/v2.0/token"
 
         data = {
             "client_id": self.client_id,
@@ -190,17 +484,14 @@ class ThamesWater:
             "x-ms-lib-capability": "retry-after, h429",
             "x-client-current-telemetry": "5|61,0,,,|@azure/msal-react,2.0.3",
             "x-client-last-telemetry": "5|0|||0,0",
-            "refresh_token": self.oauth_request_tokens["refresh_token"],
+            "refresh_token": self.refresh_token,
         }
 
         headers = {"content-type": "application/x-www-form-urlencoded;charset=utf-8"}
+        return url, data, headers
 
-        r = self.s.get(url, headers=headers, data=data, timeout=30)
-        r.raise_for_status()
-        self.oauth_response_tokens = r.json()
-
-    def _login(self, state: str, id_token: str):
-        url = "https://myaccount.thameswater.co.uk/login"
+    def _login_request(self, state: str, id_token: str) -> tuple[str, dict, dict]:
+        url = f"{self.account_url}/login"
 
         data = {
             "state": state,
@@ -208,11 +499,361 @@ class ThamesWater:
         }
 
         headers = {
-            "user-agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36",
+            "user-agent": USER_AGENT,
             "content-type": "application/x-www-form-urlencoded",
         }
+        return url, data, headers
+
+    def _sign_in_headers(self) -> dict:
+        return {
+            "user-agent": USER_AGENT,
+            "Referer": f"{self.account_url}/twservice/Account/SignIn?useremail=",
+        }
+
+    def _sign_in_urls(self) -> list[str]:
+        return [
+            f"{self.account_url}/mydashboard",
+            f"{self.account_url}/mydashboard/my-meters-usage?contractAccountNumber={self.account_number}",
+            f"{self.account_url}/twservice/Account/SignIn?useremail=",
+        ]
+
+    @staticmethod
+    def _parse_sign_in(url: str, text: str) -> tuple[str, str]:
+        state = url.split("&state=")[1].split("&nonce=")[0].replace("%3d", "=")
+        id_token = text.split("id='id_token' value='")[1].split("'/>")[0]
+        return state, id_token
+
+    def _is_expired_response(self, status: int, urls: list[str], content_type: str) -> bool:
+        """Detect a response that means the myaccount session is no longer valid.
+
+        An expired session shows up as a 401/403, as a redirect to the B2C
+        login page, or as an HTML page where the ajax endpoint returns JSON.
+        The last two are only checked on successful responses, so a server
+        error page is left to ``raise_for_status`` instead of a re-login.
+        """
+        if status in (401, 403):
+            return True
+        if not 200 <= status < 300:
+            return False
+        if any(url.startswith(self.login_url) for url in urls):
+            return True
+        return "text/html" in content_type
 
-        r = self.s.post(url, data=data, headers=headers, timeout=30)
+    @staticmethod
+    def _throttled_error(status: int, retry_after: str | None) -> ThrottledError | None:
+        if status not in (429, 503):
+            return None
+        if retry_after is None:
+            return ThrottledError(status, None)
+        try:
+            return ThrottledError(status, max(float(retry_after), 0.0))
+        except ValueError:
+            pass
+        try:
+            delay = parsedate_to_datetime(retry_after).timestamp() - datetime.datetime.now().timestamp()
+        except (TypeError, ValueError):
+            return ThrottledError(status, None)
+        return ThrottledError(status, max(delay, 0.0))
+
+    def _meter_usage_request(
+        self,
+        meter: int,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        granularity: str,
+    ) -> tuple[str, dict, dict]:
+        url = f"{self.account_url}/ajax/waterMeter/getSmartWaterMeterConsumptions"
+
+        params = {
+            "meter": meter,
+            "startDate": start.day,
+            "startMonth": start.month,
+            "startYear": start.year,
+            "endDate": end.day,
+            "endMonth": end.month,
+            "endYear": end.year,
+            "granularity": granularity,
+            "premiseId": "",
+            "isForC4C": "false",
+        }
+
+        headers = {
+            "user-agent": USER_AGENT,
+            "Referer": f"{self.account_url}/mydashboard/my-meters-usage",
+            "X-Requested-With": "XMLHttpRequest",
+        }
+        return url, params, headers
+
+    @staticmethod
+    def _parse_meter_usage(data: dict) -> MeterUsage:
+        return MeterUsage.from_dict(data)
+
+    @staticmethod
+    def _split_by_day(
+        usage: MeterUsage, start: datetime.date, end: datetime.date
+    ) -> dict[datetime.date, MeterUsage] | None:
+        """Split an hourly response covering ``start``..``end`` into one MeterUsage per day.
+
+        Lines are in time order, so a new day starts whenever the label's time
+        of day does not increase, except once in the hour repeated when UK
+        clocks go back. Returns None when the response does not contain
+        exactly one block per requested day, i.e. it was truncated.
+        """
+        if start == end:
+            return {start: usage}
+        if usage.IsError or not usage.IsDataAvailable or not usage.Lines:
+            return None
+
+        minute_of_day = usage.Lines.minute_of_day
+        if -1 in minute_of_day:
+            return None
+        day = start
+        repeated = _repeated_minutes(day)
+        boundaries = [0]
+        for index in range(1, len(minute_of_day)):
+            minute = minute_of_day[index]
+            if minute > minute_of_day[index - 1]:
+                continue
+            if minute in repeated:
+                repeated = range(0)
+                continue
+            boundaries.append(index)
+            day += datetime.timedelta(days=1)
+            repeated = _repeated_minutes(day)
+        boundaries.append(len(minute_of_day))
+
+        if len(boundaries) - 1 != (end - start).days + 1:
+            return None
+        return {
+            start + datetime.timedelta(days=offset): replace(
+                usage, Lines=usage.Lines[boundaries[offset] : boundaries[offset + 1]]
+            )
+            for offset in range(len(boundaries) - 1)
+        }
+
+    @staticmethod
+    def _periods(
+        start: datetime.date, end: datetime.date, granularity: str
+    ) -> list[datetime.date]:
+        """Return the first day of every day or month from ``start`` to ``end``."""
+        if granularity == "D":
+            return [start + datetime.timedelta(days=n) for n in range((end - start).days + 1)]
+        periods = []
+        month = start.replace(day=1)
+        while month <= end:
+            periods.append(month)
+            month = (month.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+        return periods
+
+    @staticmethod
+    def _split_by_period(
+        usage: MeterUsage, periods: list[datetime.date], granularity: str
+    ) -> dict[datetime.date, Line]:
+        """Match the lines of a daily or monthly response to the requested periods by label.
+
+        A meter with no data for some periods returns no lines for them, so
+        lines are not matched by position. Lines are in time order, so a
+        label without a year is the next requested period it names. Lines
+        whose label does not parse, or names no requested period, are dropped.
+        """
+        if usage.IsError or not usage.IsDataAvailable:
+            return {}
+        matched = {}
+        position = 0
+        for line in usage.Lines:
+            parsed = _parse_period_label(line.Label, granularity)
+            if parsed is None:
+                _LOGGER.debug("Dropped %s line with unknown label %r", granularity, line.Label)
+                continue
+            year, month, day = parsed
+            for index in range(position, len(periods)):
+                period = periods[index]
+                if (period.month, period.day) == (month, day) and year in (None, period.year):
+                    matched[period] = line
+                    position = index + 1
+                    break
+            else:
+                _LOGGER.debug("Dropped %s line for unrequested period %r", granularity, line.Label)
+        return matched
+
+    def _windows(
+        self, start: datetime.date, end: datetime.date
+    ) -> list[tuple[datetime.date, datetime.date]]:
+        windows = []
+        day = start
+        while day <= end:
+            window_end = min(day + datetime.timedelta(days=self.window_days - 1), end)
+            windows.append((day, window_end))
+            day = window_end + datetime.timedelta(days=1)
+        return windows
+
+    @staticmethod
+    def _halves(
+        day: datetime.date, window_end: datetime.date
+    ) -> tuple[tuple[datetime.date, datetime.date], tuple[datetime.date, datetime.date]]:
+        middle = day + datetime.timedelta(days=((window_end - day).days + 1) // 2 - 1)
+        return (day, middle), (middle + datetime.timedelta(days=1), window_end)
+
+    def _window_succeeded(self, day: datetime.date, window_end: datetime.date):
+        if (window_end - day).days + 1 == self.window_days:
+            self.window_days = min(self.window_days * 2, MAX_WINDOW_DAYS)
+
+    def _window_failed(self, day: datetime.date, window_end: datetime.date, err):
+        self.window_days = max(((window_end - day).days + 1) // 2, 1)
+        record_retry()
+        _LOGGER.info(
+            "Could not use %s to %s as one window (%s), retrying it in two halves",
+            day,
+            window_end,
+            err,
+        )
+
+    def _session_expired_error(self) -> SessionExpiredError:
+        return SessionExpiredError(
+            f"Session still unauthenticated after re-login for account {self.account_number}"
+        )
+
+
+class ThamesWater(_ThamesWaterBase):
+    def __init__(
+        self,
+        email: str,
+        password: str,
+        account_number: int,
+        client_id: str = "cedfde2d-79a7-44fd-9833-cae769640d3d",  # specific to Thames Water
+        session_state: dict | None = None,
+        base_url: str | None = None,
+    ):
+        super().__init__(email, password, account_number, client_id, base_url)
+        self.s = requests.session()
+
+        if session_state is None or not self._restore_session(session_state):
+            self._authenticate(email, password)
+
+    def close(self):
+        self.s.close()
+
+    def export_session(self) -> dict:
+        """Return the refresh token and cookie jar as a JSON-serialisable dict."""
+        return {
+            "refresh_token": self.refresh_token,
+            "cookies": [
+                {
+                    "name": cookie.name,
+                    "value": cookie.value,
+                    "domain": cookie.domain,
+                    "path": cookie.path,
+                    "secure": cookie.secure,
+                    "expires": cookie.expires,
+                }
+                for cookie in self.s.cookies
+            ],
+        }
+
+    def _restore_session(self, session_state: dict) -> bool:
+        """Resume a saved session with a refresh-token grant instead of a password login."""
+        _LOGGER.info("Restoring saved session for account %s", self.account_number)
+        try:
+            for cookie in session_state["cookies"]:
+                self.s.cookies.set(**cookie)
+            self.oauth_request_tokens = {"refresh_token": session_state["refresh_token"]}
+            self._refresh_oauth2_token_b2c_1_tw_website_signin()
+        except (requests.RequestException, KeyError, TypeError, ValueError) as e:
+            _LOGGER.info("Could not restore saved session, logging in with password: %s", e)
+            self.s.close()
+            self.s = requests.session()
+            self.oauth_request_tokens = {}
+            self.oauth_response_tokens = {}
+            return False
+        return True
+
+    def _reauthenticate(self):
+        _LOGGER.info("Session expired for account %s, logging in again", self.account_number)
+        # The B2C single sign-on cookies usually outlive the myaccount session,
+        # so try signing in to myaccount with them before sending the password.
+        if self.refresh_token is not None:
+            try:
+                self._sign_in_myaccount()
+                return
+            except (requests.RequestException, KeyError, IndexError) as e:
+                _LOGGER.info("Single sign-on failed, logging in with password: %s", e)
+        self.s.close()
+        self.s = requests.session()
+        self._authenticate(self._email, self._password)
+
+    def _is_session_expired(self, r: requests.Response) -> bool:
+        return self._is_expired_response(
+            r.status_code,
+            [resp.url for resp in [*r.history, r]],
+            r.headers.get("content-type", ""),
+        )
+
+    def _get(self, url: str, params: dict, headers: dict) -> requests.Response:
+        r = self.s.get(url, params=params, headers=headers, timeout=REQUEST_TIMEOUT)
+        if (throttled := self._throttled_error(r.status_code, r.headers.get("Retry-After"))) is not None:
+            raise throttled
+        return r
+
+    def _get_json(self, url: str, params: dict, headers: dict) -> dict:
+        r = self._get(url, params, headers)
+        if self._is_session_expired(r):
+            try:
+                self._reauthenticate()
+            except Exception as e:
+                raise SessionExpiredError(f"Re-login failed: {e!r}") from e
+            r = self._get(url, params, headers)
+            if self._is_session_expired(r):
+                raise self._session_expired_error()
+        r.raise_for_status()
+        return r.json()
+
+    def _authorize_b2c_1_tw_website_signin(self) -> tuple[str, str]:
+        url, params = self._authorize_request()
+
+        r = self.s.get(url, params=params, timeout=REQUEST_TIMEOUT)
+        r.raise_for_status()
+        return dict(self.s.cookies)["x-ms-cpim-trans"], dict(self.s.cookies)[
+            "x-ms-cpim-csrf"
+        ]
+
+    def _self_asserted_b2c_1_tw_website_signin(
+        self, email: str, password: str, trans_token: str, csrf_token: str
+    ):
+        url, params, data, headers = self._self_asserted_request(
+            email, password, trans_token, csrf_token
+        )
+
+        r = self.s.post(url, params=params, data=data, headers=headers, timeout=REQUEST_TIMEOUT)
+        #_LOGGER.debug("SelfAsserted response: %s", r.text)
+        r.raise_for_status()
+
+    def _confirmed_b2c_1_tw_website_signin(self, trans_token: str, csrf_token: str):
+        url, params, headers = self._confirmed_request(trans_token, csrf_token)
+
+        r = self.s.get(url, headers=headers, params=params, timeout=REQUEST_TIMEOUT)
+        #_LOGGER.debug("Confirmed sign-in response URL: %s", r.url)
+        r.raise_for_status()
+        return self._parse_confirmation_code(r.url)
+
+    def _get_oauth2_code_b2c_1_tw_website_signin(self, confirmation_code: str):
+        url, data, headers = self._oauth2_code_request(confirmation_code)
+
+        r = self.s.post(url, headers=headers, data=data, timeout=REQUEST_TIMEOUT)
+        r.raise_for_status()
+        self.oauth_request_tokens = r.json()
+        self.oauth_response_tokens = {}
+
+    def _refresh_oauth2_token_b2c_1_tw_website_signin(self):
+        url, data, headers = self._refresh_token_request()
+
+        r = self.s.get(url, headers=headers, data=data, timeout=REQUEST_TIMEOUT)
+        r.raise_for_status()
+        self.oauth_response_tokens = r.json()
+
+    def _login(self, state: str, id_token: str):
+        url, data, headers = self._login_request(state, id_token)
+
+        r = self.s.post(url, data=data, headers=headers, timeout=REQUEST_TIMEOUT)
         r.raise_for_status()
 
     def _authenticate(
@@ -232,43 +873,395 @@ class ThamesWater:
             )
             self._get_oauth2_code_b2c_1_tw_website_signin(confirmation_code)
             self._refresh_oauth2_token_b2c_1_tw_website_signin()
+            self._sign_in_myaccount()
+            _LOGGER.info("Authentication successful for account %s", self.account_number)
+        except requests.RequestException as e:
+            _LOGGER.error("Authentication failed: %s", e)
+            raise
+        except (KeyError, IndexError) as e:
+            _LOGGER.error("Failed to parse authentication response: %s", e)
+            raise
 
-            headers = {
-                "user-agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36",
-                "Referer": "https://myaccount.thameswater.co.uk/twservice/Account/SignIn?useremail=",
-            }
+    def _sign_in_myaccount(self):
+        headers = self._sign_in_headers()
 
-            r = self.s.get("https://myaccount.thameswater.co.uk/mydashboard", headers=headers, timeout=30)
+        for url in self._sign_in_urls():
+            r = self.s.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
             r.raise_for_status()
 
-            r = self.s.get(
-                f"https://myaccount.thameswater.co.uk/mydashboard/my-meters-usage?contractAccountNumber={self.account_number}",
-                headers=headers,
-                timeout=30,
+        state, id_token = self._parse_sign_in(r.url, r.text)
+        self.s.get(r.url, timeout=REQUEST_TIMEOUT)
+        self._login(state, id_token)
+        self.s.cookies.set(name="b2cAuthenticated", value="true")
+
+    def get_meter_usage(
+        self,
+        meter: int,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        granularity: Literal["H", "D", "M"] = "H",
+    ) -> MeterUsage:
+        _LOGGER.info("Fetching meter usage for meter %s from %s to %s", meter, start.date(), end.date())
+        url, params, headers = self._meter_usage_request(meter, start, end, granularity)
+
+        try:
+            data = self._get_json(url, params, headers)
+            result = self._parse_meter_usage(data)
+            _LOGGER.info("Retrieved %d readings for meter %s", len(result.Lines), meter)
+            return result
+        except (requests.RequestException, SessionExpiredError) as e:
+            _LOGGER.error("Failed to get meter usage: %s", e)
+            raise
+        except (KeyError, ValueError) as e:
+            _LOGGER.error("Failed to parse meter usage response: %s", e)
+            raise
+
+    def get_meter_usage_range(
+        self,
+        meter: int,
+        start: datetime.date,
+        end: datetime.date,
+        breaker: CircuitBreaker | None = None,
+    ) -> dict[datetime.date, MeterUsage]:
+        """Fetch hourly usage for every day from ``start`` to ``end`` in multi-day windows.
+
+        Failed or truncated windows are retried as two halves; a day that
+        still fails on its own is left out of the result. Nothing more is
+        requested once ``breaker`` opens.
+        """
+        if breaker is None:
+            breaker = CircuitBreaker()
+        result: dict[datetime.date, MeterUsage] = {}
+        for day, window_end in self._windows(start, end):
+            result.update(self._get_window(meter, day, window_end, breaker))
+        return result
+
+    def _get_window(
+        self, meter: int, day: datetime.date, window_end: datetime.date, breaker: CircuitBreaker
+    ) -> dict[datetime.date, MeterUsage]:
+        if breaker.open:
+            return {}
+        try:
+            per_day = self._split_by_day(
+                self.get_meter_usage(
+                    meter,
+                    datetime.datetime.combine(day, datetime.time()),
+                    datetime.datetime.combine(window_end, datetime.time()),
+                ),
+                day,
+                window_end,
             )
+            err = "incomplete response"
+        except (requests.RequestException, ThrottledError, SessionExpiredError, KeyError, TypeError, ValueError) as e:
+            per_day, err = None, e
+
+        if per_day is not None:
+            breaker.record_success()
+            self._window_succeeded(day, window_end)
+            return per_day
+        breaker.record_failure(err)
+        if breaker.open:
+            return {}
+        if day == window_end:
+            _LOGGER.warning("Could not get data for %s: %s", day, err)
+            return {}
+        self._window_failed(day, window_end, err)
+        first, second = self._halves(day, window_end)
+        return {
+            **self._get_window(meter, *first, breaker),
+            **self._get_window(meter, *second, breaker),
+        }
+
+    def get_period_usage(
+        self,
+        meter: int,
+        start: datetime.date,
+        end: datetime.date,
+        granularity: Literal["D", "M"],
+    ) -> dict[datetime.date, Line]:
+        """Fetch one line per day or month from ``start`` to ``end`` in a single request."""
+        periods = self._periods(start, end, granularity)
+        usage = self.get_meter_usage(
+            meter,
+            datetime.datetime.combine(periods[0], datetime.time()),
+            datetime.datetime.combine(end, datetime.time()),
+            granularity,
+        )
+        return self._split_by_period(usage, periods, granularity)
+
+class AsyncThamesWater(_ThamesWaterBase):
+    """Asyncio client running the same flow as ThamesWater on an aiohttp session.
+
+    The client owns ``session`` and closes it in ``close``. Home Assistant
+    passes a session from ``async_create_clientsession`` so the connection
+    pool is shared while the login cookies stay private to this client.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        email: str,
+        password: str,
+        account_number: int,
+        client_id: str = "cedfde2d-79a7-44fd-9833-cae769640d3d",  # specific to Thames Water
+        scheduler: "FetchScheduler | None" = None,
+        base_url: str | None = None,
+    ):
+        super().__init__(email, password, account_number, client_id, base_url)
+        self.s = session
+        self.scheduler = scheduler
+        self._timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+        # Concurrent requests that all find the session expired log in once:
+        # whoever holds the lock first re-authenticates and bumps the
+        # generation, the others see the new generation and just retry.
+        self._auth_lock = asyncio.Lock()
+        self._auth_generation = 0
+
+    @classmethod
+    async def create(
+        cls,
+        session: aiohttp.ClientSession,
+        email: str,
+        password: str,
+        account_number: int,
+        session_state: dict | None = None,
+        scheduler: "FetchScheduler | None" = None,
+        base_url: str | None = None,
+    ) -> "AsyncThamesWater":
+        """Return a logged-in client, resuming ``session_state`` when it is still valid."""
+        client = cls(
+            session,
+            email,
+            password,
+            account_number,
+            scheduler=scheduler,
+            base_url=base_url,
+        )
+        if session_state is None or not await client._restore_session(session_state):
+            await client._authenticate(email, password)
+        return client
+
+    async def close(self):
+        await self.s.close()
+
+    def _cookie(self, name: str) -> str:
+        for morsel in self.s.cookie_jar:
+            if morsel.key == name:
+                return morsel.value
+        raise KeyError(name)
+
+    def export_session(self) -> dict:
+        """Return the refresh token and cookie jar as a JSON-serialisable dict."""
+        return {
+            "refresh_token": self.refresh_token,
+            "cookies": [
+                {
+                    "name": morsel.key,
+                    "value": morsel.value,
+                    "domain": morsel["domain"],
+                    "path": morsel["path"] or "/",
+                    "secure": bool(morsel["secure"]),
+                    "expires": (
+                        parsedate_to_datetime(morsel["expires"]).timestamp()
+                        if morsel["expires"]
+                        else None
+                    ),
+                }
+                for morsel in self.s.cookie_jar
+            ],
+        }
+
+    def _load_cookies(self, cookies: list[dict]):
+        for cookie in cookies:
+            morsel: Morsel = Morsel()
+            morsel.set(cookie["name"], cookie["value"], cookie["value"])
+            morsel["domain"] = cookie["domain"]
+            morsel["path"] = cookie["path"]
+            morsel["secure"] = cookie["secure"]
+            if cookie["expires"] is not None:
+                morsel["expires"] = formatdate(cookie["expires"], usegmt=True)
+            self.s.cookie_jar.update_cookies(
+                {cookie["name"]: morsel},
+                URL(f"https://{cookie['domain'].lstrip('.')}/"),
+            )
+
+    async def _restore_session(self, session_state: dict) -> bool:
+        """Resume a saved session with a refresh-token grant instead of a password login."""
+        _LOGGER.info("Restoring saved session for account %s", self.account_number)
+        try:
+            self._load_cookies(session_state["cookies"])
+            self.oauth_request_tokens = {"refresh_token": session_state["refresh_token"]}
+            with timed("auth.refresh_token"):
+                await self._refresh_oauth2_token_b2c_1_tw_website_signin()
+        except (aiohttp.ClientError, TimeoutError, KeyError, TypeError, ValueError) as e:
+            _LOGGER.info("Could not restore saved session, logging in with password: %s", e)
+            self.s.cookie_jar.clear()
+            self.oauth_request_tokens = {}
+            self.oauth_response_tokens = {}
+            return False
+        return True
+
+    async def _reauthenticate(self):
+        _LOGGER.info("Session expired for account %s, logging in again", self.account_number)
+        # The B2C single sign-on cookies usually outlive the myaccount session,
+        # so try signing in to myaccount with them before sending the password.
+        if self.refresh_token is not None:
+            try:
+                await self._sign_in_myaccount()
+                return
+            except (aiohttp.ClientError, TimeoutError, KeyError, IndexError) as e:
+                _LOGGER.info("Single sign-on failed, logging in with password: %s", e)
+        self.s.cookie_jar.clear()
+        await self._authenticate(self._email, self._password)
+
+    def _is_session_expired(self, r: aiohttp.ClientResponse) -> bool:
+        return self._is_expired_response(
+            r.status,
+            [str(resp.url) for resp in [*r.history, r]],
+            r.headers.get("content-type", ""),
+        )
+
+    async def _reauthenticate_once(self, generation: int):
+        async with self._auth_lock:
+            if self._auth_generation == generation:
+                try:
+                    await self._reauthenticate()
+                except Exception as e:
+                    # A failed re-login is an auth failure, whatever broke
+                    # it, so repeated ones stop the range fetch.
+                    raise SessionExpiredError(f"Re-login failed: {e!r}") from e
+                self._auth_generation += 1
+
+    async def _get_json(self, url: str, params: dict, headers: dict) -> dict:
+        for attempt in range(2):
+            generation = self._auth_generation
+            async with self.s.get(
+                url, params=params, headers=headers, timeout=self._timeout
+            ) as r:
+                if (throttled := self._throttled_error(r.status, r.headers.get("Retry-After"))) is not None:
+                    raise throttled
+                if not self._is_session_expired(r):
+                    r.raise_for_status()
+                    return await r.json(content_type=None)
+            if attempt == 0:
+                record_retry()
+                with timed("auth.reauthenticate"):
+                    await self._reauthenticate_once(generation)
+        raise self._session_expired_error()
+
+    async def _authorize_b2c_1_tw_website_signin(self) -> tuple[str, str]:
+        url, params = self._authorize_request()
+
+        async with self.s.get(url, params=params, timeout=self._timeout) as r:
+            r.raise_for_status()
+        return self._cookie("x-ms-cpim-trans"), self._cookie("x-ms-cpim-csrf")
+
+    async def _self_asserted_b2c_1_tw_website_signin(
+        self, email: str, password: str, trans_token: str, csrf_token: str
+    ):
+        url, params, data, headers = self._self_asserted_request(
+            email, password, trans_token, csrf_token
+        )
+
+        async with self.s.post(
+            url, params=params, data=data, headers=headers, timeout=self._timeout
+        ) as r:
             r.raise_for_status()
 
-            r = self.s.get(
-                "https://myaccount.thameswater.co.uk/twservice/Account/SignIn?useremail=",
+    async def _confirmed_b2c_1_tw_website_signin(self, trans_token: str, csrf_token: str):
+        url, params, headers = self._confirmed_request(trans_token, csrf_token)
+
+        # The code is returned in the fragment of the final redirect, which
+        # aiohttp drops when following redirects itself.
+        request_url: str | URL = url
+        location = ""
+        for _ in range(10):
+            async with self.s.get(
+                request_url,
                 headers=headers,
-                timeout=30,
-            )
+                params=params,
+                allow_redirects=False,
+                timeout=self._timeout,
+            ) as r:
+                r.raise_for_status()
+                if "Location" not in r.headers:
+                    location = str(r.url)
+                    break
+                location = str(r.url.join(URL(r.headers["Location"], encoded=True)))
+            if "#" in location:
+                break
+            request_url, params = URL(location, encoded=True), None
+        return self._parse_confirmation_code(location)
+
+    async def _get_oauth2_code_b2c_1_tw_website_signin(self, confirmation_code: str):
+        url, data, headers = self._oauth2_code_request(confirmation_code)
+
+        async with self.s.post(url, headers=headers, data=data, timeout=self._timeout) as r:
+            r.raise_for_status()
+            self.oauth_request_tokens = await r.json(content_type=None)
+        self.oauth_response_tokens = {}
+
+    async def _refresh_oauth2_token_b2c_1_tw_website_signin(self):
+        url, data, headers = self._refresh_token_request()
+
+        async with self.s.get(url, headers=headers, data=data, timeout=self._timeout) as r:
+            r.raise_for_status()
+            self.oauth_response_tokens = await r.json(content_type=None)
+
+    async def _login(self, state: str, id_token: str):
+        url, data, headers = self._login_request(state, id_token)
+
+        async with self.s.post(url, data=data, headers=headers, timeout=self._timeout) as r:
             r.raise_for_status()
-            
-            state = r.url.split("&state=")[1].split("&nonce=")[0].replace("%3d", "=")
-            id_token = r.text.split("id='id_token' value='")[1].split("'/>")[0]
-            self.s.get(r.url, timeout=30)
-            self._login(state, id_token)
-            self.s.cookies.set(name="b2cAuthenticated", value="true")
+
+    async def _authenticate(
+        self,
+        email: str,
+        password: str,
+    ):
+        _LOGGER.info("Starting authentication for account %s", self.account_number)
+        try:
+            self._generate_pkce()
+            with timed("auth.authorize"):
+                trans_token, csrf_token = await self._authorize_b2c_1_tw_website_signin()
+            with timed("auth.self_asserted"):
+                await self._self_asserted_b2c_1_tw_website_signin(
+                    email, password, trans_token, csrf_token
+                )
+            with timed("auth.confirmed"):
+                confirmation_code = await self._confirmed_b2c_1_tw_website_signin(
+                    trans_token, csrf_token
+                )
+            with timed("auth.oauth2_code"):
+                await self._get_oauth2_code_b2c_1_tw_website_signin(confirmation_code)
+            with timed("auth.refresh_token"):
+                await self._refresh_oauth2_token_b2c_1_tw_website_signin()
+            with timed("auth.sign_in_myaccount"):
+                await self._sign_in_myaccount()
             _LOGGER.info("Authentication successful for account %s", self.account_number)
-        except requests.RequestException as e:
+        except (aiohttp.ClientError, TimeoutError) as e:
             _LOGGER.error("Authentication failed: %s", e)
             raise
         except (KeyError, IndexError) as e:
             _LOGGER.error("Failed to parse authentication response: %s", e)
             raise
 
-    def get_meter_usage(
+    async def _sign_in_myaccount(self):
+        headers = self._sign_in_headers()
+
+        for url in self._sign_in_urls():
+            async with self.s.get(url, headers=headers, timeout=self._timeout) as r:
+                r.raise_for_status()
+                final_url = str(r.url)
+                text = await r.text()
+
+        state, id_token = self._parse_sign_in(final_url, text)
+        async with self.s.get(URL(final_url, encoded=True), timeout=self._timeout) as r:
+            await r.read()
+        await self._login(state, id_token)
+        self.s.cookie_jar.update_cookies({"b2cAuthenticated": "true"}, URL(self.account_url))
+
+    async def get_meter_usage(
         self,
         meter: int,
         start: datetime.datetime,
@@ -276,39 +1269,104 @@ class ThamesWater:
         granularity: Literal["H", "D", "M"] = "H",
     ) -> MeterUsage:
         _LOGGER.info("Fetching meter usage for meter %s from %s to %s", meter, start.date(), end.date())
-        url = "https://myaccount.thameswater.co.uk/ajax/waterMeter/getSmartWaterMeterConsumptions"
-
-        params = {
-            "meter": meter,
-            "startDate": start.day,
-            "startMonth": start.month,
-            "startYear": start.year,
-            "endDate": end.day,
-            "endMonth": end.month,
-            "endYear": end.year,
-            "granularity": granularity,
-            "premiseId": "",
-            "isForC4C": "false",
-        }
-
-        headers = {
-            "user-agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36",
-            "Referer": "https://myaccount.thameswater.co.uk/mydashboard/my-meters-usage",
-            "X-Requested-With": "XMLHttpRequest",
-        }
+        url, params, headers = self._meter_usage_request(meter, start, end, granularity)
 
         try:
-            r = self.s.get(url, params=params, headers=headers, timeout=30)
-            r.raise_for_status()
-
-            data = r.json()
-            data["Lines"] = [Line(**line) for line in data["Lines"]]
-            result = MeterUsage(**data)
+            with timed("meter_usage"):
+                if self.scheduler is None:
+                    data = await self._get_json(url, params, headers)
+                else:
+                    data = await self.scheduler.submit(
+                        lambda: self._get_json(url, params, headers)
+                    )
+                result = self._parse_meter_usage(data)
             _LOGGER.info("Retrieved %d readings for meter %s", len(result.Lines), meter)
             return result
-        except requests.RequestException as e:
+        except (aiohttp.ClientError, TimeoutError, SessionExpiredError) as e:
+            record_error()
             _LOGGER.error("Failed to get meter usage: %s", e)
             raise
         except (KeyError, ValueError) as e:
+            record_error()
             _LOGGER.error("Failed to parse meter usage response: %s", e)
-            raise
\ No newline at end of file
+            raise
+
+    async def get_meter_usage_range(
+        self,
+        meter: int,
+        start: datetime.date,
+        end: datetime.date,
+        breaker: CircuitBreaker | None = None,
+    ) -> dict[datetime.date, MeterUsage]:
+        """Fetch hourly usage for every day from ``start`` to ``end`` in multi-day windows.
+
+        Windows are requested concurrently, limited by the scheduler, and the
+        result is assembled in date order. Failed or truncated windows are
+        retried as two halves; a day that still fails on its own is left out
+        of the result. Windows not yet requested when ``breaker`` opens are
+        skipped.
+        """
+        if breaker is None:
+            breaker = CircuitBreaker()
+        result: dict[datetime.date, MeterUsage] = {}
+        for per_day in await asyncio.gather(
+            *(
+                self._get_window(meter, day, window_end, breaker)
+                for day, window_end in self._windows(start, end)
+            )
+        ):
+            result.update(per_day)
+        return result
+
+    async def _get_window(
+        self, meter: int, day: datetime.date, window_end: datetime.date, breaker: CircuitBreaker
+    ) -> dict[datetime.date, MeterUsage]:
+        if breaker.open:
+            return {}
+        try:
+            per_day = self._split_by_day(
+                await self.get_meter_usage(
+                    meter,
+                    datetime.datetime.combine(day, datetime.time()),
+                    datetime.datetime.combine(window_end, datetime.time()),
+                ),
+                day,
+                window_end,
+            )
+            err = "incomplete response"
+        except (aiohttp.ClientError, TimeoutError, ThrottledError, SessionExpiredError, KeyError, TypeError, ValueError) as e:
+            per_day, err = None, e
+
+        if per_day is not None:
+            breaker.record_success()
+            self._window_succeeded(day, window_end)
+            return per_day
+        breaker.record_failure(err)
+        if breaker.open:
+            return {}
+        if day == window_end:
+            _LOGGER.warning("Could not get data for %s: %s", day, err)
+            return {}
+        self._window_failed(day, window_end, err)
+        first, second = self._halves(day, window_end)
+        first_days, second_days = await asyncio.gather(
+            self._get_window(meter, *first, breaker), self._get_window(meter, *second, breaker)
+        )
+        return {**first_days, **second_days}
+
+    async def get_period_usage(
+        self,
+        meter: int,
+        start: datetime.date,
+        end: datetime.date,
+        granularity: Literal["D", "M"],
+    ) -> dict[datetime.date, Line]:
+        """Fetch one line per day or month from ``start`` to ``end`` in a single request."""
+        periods = self._periods(start, end, granularity)
+        usage = await self.get_meter_usage(
+            meter,
+            datetime.datetime.combine(periods[0], datetime.time()),
+            datetime.datetime.combine(end, datetime.time()),
+            granularity,
+        )
+        return self._split_by_period(usage, periods, granularity)
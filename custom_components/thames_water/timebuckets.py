@@ -0,0 +1,78 @@
+"""UK wall clock to UTC hour conversion for the Thames Water integration."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+
+from homeassistant.util import dt as dt_util
+
+# Thames Water labels readings with the UK wall clock, whatever the local time zone.
+UK_TIME_ZONE = dt_util.get_time_zone("Europe/London")
+
+
+@lru_cache(maxsize=1024)
+def day_offsets(day: date) -> tuple[float, int, int]:
+    """Return the UTC timestamp of the UK midnight starting ``day`` and its clock change.
+
+    The clock change is the minute after that midnight at which it happens
+    and the minutes the wall clock skips, 60 when clocks go forward, -60
+    when they go back and 0 on the other days.
+    """
+    midnight = datetime.combine(day, time(), UK_TIME_ZONE)
+    next_midnight = datetime.combine(day + timedelta(days=1), time(), UK_TIME_ZONE)
+    start = midnight.timestamp()
+    change = 1440 - int(next_midnight.timestamp() - start) // 60
+    if not change:
+        return start, 0, 0
+    offset = midnight.utcoffset()
+    for minutes in range(60, 1440, 60):
+        instant = dt_util.utc_from_timestamp(start + minutes * 60).astimezone(UK_TIME_ZONE)
+        if instant.utcoffset() != offset:
+            return start, minutes, change
+    return start, 0, 0
+
+
+def utc_starts(day: date, minutes_of_day) -> list[float]:
+    """Return the UTC timestamps of a day's readings from their UK wall clock minutes.
+
+    The minutes must be in the order the lines were reported. When clocks
+    go back the repeated hour is told apart by its label not advancing, so
+    both of its readings get their own UTC hour; when they go forward a
+    label in the skipped hour is put in the hour the clock jumped to.
+    """
+    start, shift, change = day_offsets(day)
+    if not change:
+        return [start + minute * 60 for minute in minutes_of_day]
+
+    starts = []
+    previous = -1
+    repeated = False
+    for minute in minutes_of_day:
+        if change > 0:
+            elapsed = minute if minute < shift else max(minute - change, shift)
+        elif minute >= shift:
+            elapsed = minute - change
+        elif minute >= shift + change and (repeated or minute <= previous):
+            repeated = True
+            elapsed = minute - change
+        else:
+            elapsed = minute
+        previous = minute
+        starts.append(start + elapsed * 60)
+    return starts
+
+
+def hours_in_day(day: date) -> int:
+    """Return the number of distinct hour labels of a UK day, 23 when clocks go forward."""
+    return min(24, 24 - day_offsets(day)[2] // 60)
+
+
+def uk_time(timestamp: float) -> datetime:
+    """Return the UK wall clock time of a UTC timestamp."""
+    return dt_util.utc_from_timestamp(timestamp).astimezone(UK_TIME_ZONE)
+
+
+def uk_midnight(day: date) -> datetime:
+    """Return the UK midnight starting ``day`` as a UTC time."""
+    return dt_util.utc_from_timestamp(day_offsets(day)[0])
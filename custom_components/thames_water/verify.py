@@ -0,0 +1,167 @@
+"""Meter register checks of imported history for the Thames Water integration."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+import logging
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.util import dt as dt_util
+
+from .const import DEFAULT_LITER_COST, DOMAIN, SIGNAL_STATISTICS_REWRITTEN
+from .corrections import async_merge_hours
+from .registry import async_get_entry_client
+from .rollups import DAILY_WINDOW_DAYS
+from .statistics import (
+    READ_TOLERANCE,
+    HourlySeries,
+    async_last_statistic_before,
+    async_statistic_changes,
+    consumption_statistic_id,
+    day_ranges,
+)
+from .thameswaterclient import AsyncThamesWater
+from .timebuckets import uk_midnight
+
+_LOGGER = logging.getLogger(__name__)
+
+# Ranges at least this long are compared month by month first.
+MONTHLY_MIN_DAYS = 62
+
+
+def _next_month(day: date) -> date:
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+async def _async_register(
+    client: AsyncThamesWater, meter_id: str, start: date, end: date, granularity: str
+) -> dict[date, float]:
+    """Return the register at the end of each day or month from ``start`` to ``end``."""
+    lines = await client.get_period_usage(meter_id, start, end, granularity)
+    return {period: line.Read for period, line in lines.items() if line.Read}
+
+
+def _disagrees(register: dict[date, float], period: date, previous: date, change: float) -> bool:
+    if (read := register.get(period)) is None or (before := register.get(previous)) is None:
+        return False
+    return read >= before and abs(read - before - change) > READ_TOLERANCE
+
+
+async def _async_months_to_check(
+    hass: HomeAssistant, client: AsyncThamesWater, meter_id: str, start: date, end: date
+) -> list[tuple[date, date]]:
+    """Return the day ranges left to compare after comparing the whole months of a range."""
+    first_month = start if start.day == 1 else _next_month(start)
+    months = []
+    month = first_month
+    while _next_month(month) - timedelta(days=1) <= end:
+        months.append(month)
+        month = _next_month(month)
+    if not months:
+        return [(start, end)]
+
+    ranges = []
+    if start < first_month:
+        ranges.append((start, first_month - timedelta(days=1)))
+    previous = (first_month - timedelta(days=1)).replace(day=1)
+    register = await _async_register(client, meter_id, previous, months[-1], "M")
+    changes = await async_statistic_changes(
+        hass, consumption_statistic_id(meter_id), uk_midnight(first_month), uk_midnight(month), "month"
+    )
+    for period in months:
+        if period in changes and (
+            period not in register
+            or previous not in register
+            or _disagrees(register, period, previous, changes[period])
+        ):
+            ranges.append((period, _next_month(period) - timedelta(days=1)))
+        previous = period
+    if month <= end:
+        ranges.append((month, end))
+    return ranges
+
+
+async def async_verify_history(
+    hass: HomeAssistant, entry: ConfigEntry, meter_id: str, start: date, end: date
+) -> int:
+    """Repair a meter's imported days from ``start`` to ``end`` that disagree with its register.
+
+    Long ranges are compared a month at a time and only the months that
+    disagree are compared day by day, so a year costs a couple of requests.
+    Only the days that still disagree are fetched hour by hour; their usage
+    is taken from the register, written over the imported hours and the
+    running sums after them are corrected. Days that were never imported
+    are left to the backfill. Returns the number of days repaired.
+    """
+    client = await async_get_entry_client(hass, entry)
+
+    if (end - start).days + 1 >= MONTHLY_MIN_DAYS:
+        ranges = await _async_months_to_check(hass, client, meter_id, start, end)
+    else:
+        ranges = [(start, end)]
+
+    register: dict[date, float] = {}
+    days: list[date] = []
+    for range_start, range_end in ranges:
+        window_start = range_start
+        while window_start <= range_end:
+            window_end = min(window_start + timedelta(days=DAILY_WINDOW_DAYS - 1), range_end)
+            periods = [
+                window_start + timedelta(days=offset)
+                for offset in range((window_end - window_start).days + 1)
+            ]
+            window_register = await _async_register(
+                client, meter_id, window_start - timedelta(days=1), window_end, "D"
+            )
+            register.update(window_register)
+            changes = await async_statistic_changes(
+                hass,
+                consumption_statistic_id(meter_id),
+                uk_midnight(window_start),
+                uk_midnight(window_end + timedelta(days=1)),
+                "day",
+            )
+            days.extend(
+                day
+                for day in periods
+                if day in changes
+                and _disagrees(window_register, day, day - timedelta(days=1), changes[day])
+            )
+            window_start = window_end + timedelta(days=1)
+    if not days:
+        _LOGGER.info("Imported history from %s to %s matches the meter register", start, end)
+        return 0
+
+    hours: dict[datetime, float] = {}
+    for first, last in day_ranges(days):
+        usage_by_day = await client.get_meter_usage_range(meter_id, first, last)
+        for day, data in sorted(usage_by_day.items()):
+            if data.IsDataAvailable is False or data.IsError:
+                continue
+            readings = HourlySeries()
+            readings.extend_day(day, data)
+            readings = readings.sorted()
+            readings.reconcile(register.get(day - timedelta(days=1), 0.0))
+            # A duplicated line was reconciled to no usage, so add them up.
+            readings = readings.by_hour()
+            for utc, usage in zip(readings.utc, readings.usage):
+                hours[dt_util.utc_from_timestamp(utc)] = usage
+    if not hours:
+        return 0
+
+    liter_cost = entry.options.get("liter_cost", entry.data.get("liter_cost", DEFAULT_LITER_COST))
+    async with hass.data[DOMAIN][entry.entry_id]["import_lock"]:
+        last = await async_last_statistic_before(
+            hass, consumption_statistic_id(meter_id), dt_util.utcnow()
+        )
+        await async_merge_hours(
+            hass, meter_id, hours, float(liter_cost), dt_util.utc_from_timestamp(last["start"])
+        )
+    # The running sums after the repaired days have changed.
+    async_dispatcher_send(hass, SIGNAL_STATISTICS_REWRITTEN.format(entry.entry_id))
+    _LOGGER.warning(
+        "Repaired %d days of meter %s that disagreed with the meter register", len(days), meter_id
+    )
+    return len(days)
@@ -0,0 +1,345 @@
+"""Local stand-in for the Thames Water login and meter endpoints.
+
+The server answers the same B2C login steps and the
+getSmartWaterMeterConsumptions endpoint the clients use, on a single host.
+Point a client at it with ``base_url``. Hourly, daily and monthly usage is
+served from one synthetic register, with the 23 and 25 hour days of the UK
+clock changes. Latency, error rate, throttling and the largest hourly date
+window it accepts are configurable, and every request is counted so tests
+and benchmarks can check round trips.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from dataclasses import dataclass, field
+import datetime
+import functools
+import json
+import random
+import secrets
+import time
+from urllib.parse import parse_qs
+
+from aiohttp import web
+
+LOGIN_PATH = "/identity.thameswater.co.uk"
+AUTHORIZE_PATH = f"{LOGIN_PATH}/b2c_1_tw_website_signin/oauth2/v2.0/authorize"
+TOKEN_PATH = f"{LOGIN_PATH}/b2c_1_tw_website_signin/oauth2/v2.0/token"
+SELF_ASSERTED_PATH = f"{LOGIN_PATH}/B2C_1_tw_website_signin/SelfAsserted"
+CONFIRMED_PATH = f"{LOGIN_PATH}/B2C_1_tw_website_signin/api/CombinedSigninAndSignup/confirmed"
+METER_PATH = "/ajax/waterMeter/getSmartWaterMeterConsumptions"
+_EPOCH = datetime.date(2020, 1, 1).toordinal()
+
+
+@dataclass
+class StubConfig:
+    """Behaviour of the stand-in server."""
+
+    email: str = "user@example.com"
+    password: str = "secret"
+    latency: float = 0.0
+    error_rate: float = 0.0
+    # Requests per second above which the meter endpoint answers 429.
+    throttle_rate: float | None = None
+    retry_after: int = 1
+    max_window_days: int = 31
+    estimated_rate: float = 0.0
+    seed: int = 1
+
+
+@dataclass
+class StubState:
+    """Counters and sessions of the stand-in server."""
+
+    requests: Counter = field(default_factory=Counter)
+    bytes_sent: int = 0
+    sso_sessions: set[str] = field(default_factory=set)
+    account_sessions: set[str] = field(default_factory=set)
+    refresh_tokens: set[str] = field(default_factory=set)
+    meter_calls: list[float] = field(default_factory=list)
+
+    @property
+    def total_requests(self) -> int:
+        return sum(self.requests.values())
+
+
+class ThamesWaterStub:
+    """aiohttp application emulating the Thames Water endpoints."""
+
+    def __init__(self, config: StubConfig | None = None) -> None:
+        self.config = config or StubConfig()
+        self.state = StubState()
+        self._random = random.Random(self.config.seed)
+        self._runner: web.AppRunner | None = None
+        self.base_url = ""
+
+        self.app = web.Application(middlewares=[self._middleware])
+        self.app.router.add_get(AUTHORIZE_PATH, self._authorize)
+        self.app.router.add_post(SELF_ASSERTED_PATH, self._self_asserted)
+        self.app.router.add_get(CONFIRMED_PATH, self._confirmed)
+        self.app.router.add_route("*", TOKEN_PATH, self._token)
+        self.app.router.add_get("/login", self._landing)
+        self.app.router.add_post("/login", self._account_login)
+        self.app.router.add_get("/mydashboard", self._page)
+        self.app.router.add_get("/mydashboard/my-meters-usage", self._page)
+        self.app.router.add_get("/twservice/Account/SignIn", self._sign_in)
+        self.app.router.add_get(METER_PATH, self._meter)
+
+    async def start(self) -> str:
+        """Start listening on a free local port and return the base URL."""
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+        return self.base_url
+
+    async def stop(self) -> None:
+        """Stop the server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    def expire_account_sessions(self) -> None:
+        """Log every client out of myaccount, keeping the B2C single sign-on."""
+        self.state.account_sessions.clear()
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        self.state.requests[request.path] += 1
+        if self.config.latency:
+            await asyncio.sleep(self.config.latency)
+        response = await handler(request)
+        if response.body is not None and isinstance(response.body, bytes):
+            self.state.bytes_sent += len(response.body)
+        return response
+
+    async def _authorize(self, request: web.Request) -> web.Response:
+        if request.query.get("response_mode") == "form_post":
+            # Second leg of the myaccount sign-in, answered from the SSO cookie.
+            if request.cookies.get("x-ms-cpim-sso") not in self.state.sso_sessions:
+                return web.Response(text="<html>login</html>", content_type="text/html")
+            return web.Response(
+                text=f"<form><input type='hidden' name='id_token' id='id_token' value='{secrets.token_hex(8)}'/></form>",
+                content_type="text/html",
+            )
+        response = web.Response(text="<html>login</html>", content_type="text/html")
+        response.set_cookie("x-ms-cpim-trans", secrets.token_hex(8))
+        response.set_cookie("x-ms-cpim-csrf", secrets.token_hex(8))
+        return response
+
+    async def _self_asserted(self, request: web.Request) -> web.Response:
+        form = await request.post()
+        ok = form.get("email") == self.config.email and form.get("password") == self.config.password
+        response = web.json_response({"status": "200" if ok else "400"})
+        if ok:
+            sso = secrets.token_hex(8)
+            self.state.sso_sessions.add(sso)
+            response.set_cookie("x-ms-cpim-sso", sso)
+        return response
+
+    async def _confirmed(self, request: web.Request) -> web.Response:
+        if request.cookies.get("x-ms-cpim-sso") not in self.state.sso_sessions:
+            return web.Response(status=400, text="not signed in")
+        raise web.HTTPFound(f"{self.base_url}/login#state=x&code={secrets.token_hex(8)}")
+
+    async def _token(self, request: web.Request) -> web.Response:
+        form = parse_qs(await request.text())
+        grant_type = form.get("grant_type", [""])[0]
+        if grant_type == "refresh_token":
+            token = form.get("refresh_token", [""])[0]
+            if token not in self.state.refresh_tokens:
+                return web.json_response({"error": "invalid_grant"}, status=400)
+            self.state.refresh_tokens.discard(token)
+        refresh_token = secrets.token_hex(16)
+        self.state.refresh_tokens.add(refresh_token)
+        return web.json_response(
+            {"id_token": secrets.token_hex(8), "refresh_token": refresh_token}
+        )
+
+    async def _landing(self, request: web.Request) -> web.Response:
+        return web.Response(text="<html>landing</html>", content_type="text/html")
+
+    async def _page(self, request: web.Request) -> web.Response:
+        return web.Response(text="<html>page</html>", content_type="text/html")
+
+    async def _sign_in(self, request: web.Request) -> web.Response:
+        raise web.HTTPFound(
+            f"{self.base_url}{AUTHORIZE_PATH}?response_mode=form_post&state=s%3d&nonce=n"
+        )
+
+    async def _account_login(self, request: web.Request) -> web.Response:
+        session = secrets.token_hex(8)
+        self.state.account_sessions.add(session)
+        response = web.Response(text="ok")
+        response.set_cookie("ASP.NET_SessionId", session)
+        return response
+
+    def _throttled(self) -> bool:
+        if self.config.throttle_rate is None:
+            return False
+        now = time.monotonic()
+        self.state.meter_calls = [t for t in self.state.meter_calls if now - t < 1.0]
+        self.state.meter_calls.append(now)
+        return len(self.state.meter_calls) > self.config.throttle_rate
+
+    async def _meter(self, request: web.Request) -> web.Response:
+        if request.cookies.get("ASP.NET_SessionId") not in self.state.account_sessions:
+            raise web.HTTPFound(f"{self.base_url}{AUTHORIZE_PATH}")
+        if self._throttled():
+            return web.Response(
+                status=429, headers={"Retry-After": str(self.config.retry_after)}
+            )
+        if self._random.random() < self.config.error_rate:
+            return web.Response(status=500, text="error")
+
+        query = request.query
+        start = datetime.date(
+            int(query["startYear"]), int(query["startMonth"]), int(query["startDate"])
+        )
+        end = datetime.date(
+            int(query["endYear"]), int(query["endMonth"]), int(query["endDate"])
+        )
+        meter = query["meter"]
+        granularity = query.get("granularity", "H")
+        if granularity == "D":
+            lines = self._day_lines(meter, start, end)
+        elif granularity == "M":
+            lines = self._month_lines(meter, start, end)
+        else:
+            end = min(end, start + datetime.timedelta(days=self.config.max_window_days - 1))
+            lines = self._hour_lines(meter, start, end)
+
+        return web.Response(
+            text=json.dumps(
+                {
+                    "IsError": False,
+                    "IsDataAvailable": True,
+                    "IsConsumptionAvailable": True,
+                    "TargetUsage": 0,
+                    "AverageUsage": 0,
+                    "ActualUsage": 0,
+                    "MyUsage": "NA",
+                    "AverageUsagePerPerson": 0,
+                    "IsMO365Customer": False,
+                    "IsMOPartialCustomer": False,
+                    "IsMOCompleteCustomer": False,
+                    "IsExtraMonthConsumptionMessage": False,
+                    "Lines": lines,
+                    "AlertsValues": {},
+                }
+            ),
+            content_type="application/json",
+        )
+
+
+    def _hour_lines(self, meter: str, start: datetime.date, end: datetime.date) -> list[dict]:
+        lines = []
+        for offset in range((end - start).days + 1):
+            day = start + datetime.timedelta(days=offset)
+            for index, hour in enumerate(uk_hours(day)):
+                lines.append(
+                    {
+                        "Label": f"{hour:02d}:00",
+                        "Usage": synthetic_usage(meter, day, index),
+                        "Read": synthetic_read(meter, day, index),
+                        "IsEstimated": self._random.random() < self.config.estimated_rate,
+                        "MeterSerialNumberHis": str(meter),
+                    }
+                )
+        return lines
+
+    @staticmethod
+    def _day_lines(meter: str, start: datetime.date, end: datetime.date) -> list[dict]:
+        days = [start + datetime.timedelta(days=n) for n in range((end - start).days + 1)]
+        return [
+            {
+                "Label": day.strftime("%d/%m/%Y"),
+                "Usage": synthetic_day_usage(meter, day),
+                "Read": _register_before(meter, day + datetime.timedelta(days=1)),
+                "IsEstimated": False,
+                "MeterSerialNumberHis": str(meter),
+            }
+            for day in days
+        ]
+
+    @staticmethod
+    def _month_lines(meter: str, start: datetime.date, end: datetime.date) -> list[dict]:
+        lines = []
+        month = start.replace(day=1)
+        while month <= end:
+            next_month = (month.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+            first, last = max(month, start), min(next_month, end + datetime.timedelta(days=1))
+            lines.append(
+                {
+                    "Label": month.strftime("%b %Y"),
+                    "Usage": _register_before(meter, last) - _register_before(meter, first),
+                    "Read": _register_before(meter, last),
+                    "IsEstimated": False,
+                    "MeterSerialNumberHis": str(meter),
+                }
+            )
+            month = next_month
+        return lines
+
+
+def _last_sunday(year: int, month: int) -> datetime.date:
+    day = datetime.date(year, month, 31)
+    return day - datetime.timedelta(days=(day.weekday() + 1) % 7)
+
+
+def uk_hours(day: datetime.date) -> list[int]:
+    """Return the UK wall clock hours labelling a day's lines, in order.
+
+    UK clocks go forward at 01:00 on the last Sunday of March, a 23 hour
+    day without 01:00, and back at 02:00 on the last Sunday of October, a
+    25 hour day with 01:00 twice.
+    """
+    hours = list(range(24))
+    if day == _last_sunday(day.year, 3):
+        hours.remove(1)
+    elif day == _last_sunday(day.year, 10):
+        hours.insert(1, 1)
+    return hours
+
+
+def synthetic_usage(meter: str, day: datetime.date, index: int) -> float:
+    """Return a deterministic usage in litres for the ``index``-th hour of a day."""
+    return float((day.toordinal() * 7 + index * 13 + len(str(meter))) % 40)
+
+
+def synthetic_day_usage(meter: str, day: datetime.date) -> float:
+    """Return the litres used on a day, over its 23, 24 or 25 hours."""
+    return sum(synthetic_usage(meter, day, index) for index in range(len(uk_hours(day))))
+
+
+@functools.lru_cache
+def _day_totals(meter: str) -> tuple[float, ...]:
+    # synthetic_usage repeats every 40 days, so one period of 24 hour daily
+    # totals gives the register for any day in constant time; the clock
+    # change days are corrected for separately.
+    return tuple(
+        sum(synthetic_usage(meter, datetime.date.fromordinal(ordinal), index) for index in range(24))
+        for ordinal in range(_EPOCH, _EPOCH + 40)
+    )
+
+
+def _register_before(meter: str, day: datetime.date) -> float:
+    """Return the cumulative register at the start of ``day``."""
+    totals = _day_totals(meter)
+    periods, remainder = divmod(day.toordinal() - _EPOCH, 40)
+    register = periods * sum(totals) + sum(totals[:remainder])
+    for year in range(datetime.date.fromordinal(_EPOCH).year, day.year + 1):
+        for change in (_last_sunday(year, 3), _last_sunday(year, 10)):
+            if change < day:
+                register += synthetic_day_usage(meter, change) - totals[(change.toordinal() - _EPOCH) % 40]
+    return register
+
+
+def synthetic_read(meter: str, day: datetime.date, index: int) -> float:
+    """Return the cumulative register at the end of the ``index``-th hour of a day."""
+    return _register_before(meter, day) + sum(
+        synthetic_usage(meter, day, i) for i in range(index + 1)
+    )
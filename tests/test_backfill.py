@@ -0,0 +1,125 @@
+import asyncio
+from datetime import date, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.thames_water import backfill as backfill_module
+from custom_components.thames_water.backfill import BackfillManager
+from custom_components.thames_water.cache import MeterUsageCache
+from custom_components.thames_water.const import DOMAIN
+from custom_components.thames_water.storage import BackfillStore
+from custom_components.thames_water.thameswaterclient import Line, MeterUsage
+from custom_components.thames_water.timebuckets import uk_midnight
+
+
+def _day_usage() -> MeterUsage:
+    return MeterUsage(Lines=[Line(f"{hour:02d}:00", 2.0, hour, False, "X") for hour in range(24)])
+
+
+async def _usage_range(meter, start: date, end: date, breaker=None) -> dict[date, MeterUsage]:
+    return {start + timedelta(days=n): _day_usage() for n in range((end - start).days + 1)}
+
+
+@pytest.fixture
+def entry(hass: HomeAssistant) -> MockConfigEntry:
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            "username": "user@example.com",
+            "password": "secret",
+            "account_number": "1",
+            "meter_id": "123",
+            "liter_cost": "0.5",
+        },
+    )
+    entry.add_to_hass(hass)
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
+        "import_lock": asyncio.Lock(),
+        "caches": {"123": MeterUsageCache(hass, "123", settle_days=7, max_entries=1500)},
+    }
+    return entry
+
+
+async def test_backfill_ends_at_existing_sums(hass: HomeAssistant, entry: MockConfigEntry):
+    """Test chunks are imported newest first with sums ending where the imported hours begin."""
+    first_start = uk_midnight(date(2024, 3, 1))
+    first = {"start": first_start.timestamp(), "sum": 1000.0, "state": 2.0}
+    cost_first = {"start": first_start.timestamp(), "sum": 500.0, "state": 1.0}
+    client = MagicMock(get_meter_usage_range=AsyncMock(side_effect=_usage_range))
+    imported = []
+
+    with (
+        patch.object(
+            backfill_module,
+            "async_first_statistic",
+            AsyncMock(side_effect=[first, cost_first]),
+        ),
+        patch.object(backfill_module, "async_get_entry_client", AsyncMock(return_value=client)),
+        patch.object(
+            backfill_module,
+            "async_add_external_statistics",
+            lambda hass, metadata, stats: imported.append((metadata["statistic_id"], stats)),
+        ),
+        patch.object(backfill_module, "get_instance", MagicMock(
+            return_value=MagicMock(async_block_till_done=AsyncMock())
+        )),
+    ):
+        manager = BackfillManager(hass, entry, "123")
+        await manager.async_start(date(2024, 1, 1), date(2024, 12, 31))
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert not manager.running and manager.error is None
+    assert manager.progress == 100
+    # 60 days in chunks of 31, newest first.
+    ranges = [call.args[1:3] for call in client.get_meter_usage_range.await_args_list]
+    assert ranges == [(date(2024, 1, 30), date(2024, 2, 29)), (date(2024, 1, 1), date(2024, 1, 29))]
+
+    consumption = [stats for stat_id, stats in imported if stat_id.endswith("consumption_123")]
+    cost = [stats for stat_id, stats in imported if stat_id.endswith("cost_123")]
+    assert consumption[0][-1]["sum"] == pytest.approx(998.0)
+    assert consumption[1][-1]["sum"] == pytest.approx(consumption[0][0]["sum"] - 2.0)
+    assert cost[0][-1]["sum"] == pytest.approx(499.0)
+    assert consumption[1][0]["start"] == uk_midnight(date(2024, 1, 1))
+    assert await BackfillStore(hass, "123").async_load() is None
+    assert hass.data[DOMAIN][entry.entry_id]["caches"]["123"].get(date(2024, 1, 1)) is not None
+
+
+async def test_backfill_uses_cached_days(hass: HomeAssistant, entry: MockConfigEntry):
+    """Test days already in the usage cache are not fetched again."""
+    first_start = uk_midnight(date(2024, 3, 1))
+    first = {"start": first_start.timestamp(), "sum": 1000.0, "state": 2.0}
+    client = MagicMock(get_meter_usage_range=AsyncMock(side_effect=_usage_range))
+    cache = hass.data[DOMAIN][entry.entry_id]["caches"]["123"]
+    await cache.async_load()
+    cache.put(await _usage_range(None, date(2024, 2, 10), date(2024, 2, 19)))
+
+    with (
+        patch.object(backfill_module, "async_first_statistic", AsyncMock(side_effect=[first, None])),
+        patch.object(backfill_module, "async_get_entry_client", AsyncMock(return_value=client)),
+        patch.object(backfill_module, "async_add_external_statistics", MagicMock()),
+        patch.object(backfill_module, "get_instance", MagicMock(
+            return_value=MagicMock(async_block_till_done=AsyncMock())
+        )),
+    ):
+        manager = BackfillManager(hass, entry, "123")
+        await manager.async_start(date(2024, 2, 1), date(2024, 2, 29))
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert not manager.running and manager.error is None
+    ranges = [call.args[1:3] for call in client.get_meter_usage_range.await_args_list]
+    assert ranges == [(date(2024, 2, 20), date(2024, 2, 29)), (date(2024, 2, 1), date(2024, 2, 9))]
+
+
+async def test_backfill_needs_imported_statistics(hass: HomeAssistant, entry: MockConfigEntry):
+    """Test a backfill is refused before the first update imported anything."""
+    manager = BackfillManager(hass, entry, "123")
+
+    with (
+        patch.object(backfill_module, "async_first_statistic", AsyncMock(return_value=None)),
+        pytest.raises(backfill_module.HomeAssistantError),
+    ):
+        await manager.async_start(date(2024, 1, 1), date(2024, 2, 1))
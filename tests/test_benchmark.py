@@ -0,0 +1,185 @@
+"""Benchmarks against the local stand-in server.
+
+Run with ``pytest tests/test_benchmark.py -s`` to see the report. Each case
+prints wall time, requests sent and peak Python memory, and asserts a
+request budget so regressions in round trips fail the suite.
+"""
+
+import asyncio
+from datetime import date, datetime, timedelta
+import time
+import tracemalloc
+
+import aiohttp
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.components.recorder import Recorder, get_instance
+from homeassistant.core import HomeAssistant
+
+from custom_components.thames_water import sensor as sensor_module
+from custom_components.thames_water.cache import MeterUsageCache
+from custom_components.thames_water.const import DOMAIN
+from custom_components.thames_water.metrics import UpdateMetrics
+from custom_components.thames_water.registry import async_get_registry
+from custom_components.thames_water.sensor import ThamesWaterSensor
+from custom_components.thames_water.singleflight import SingleFlight
+from custom_components.thames_water.rollups import ROLLUP_HISTORY_YEARS
+from custom_components.thames_water.statistics import (
+    HourlySeries,
+    async_last_statistic,
+    consumption_statistic_id,
+    generate_statistics,
+)
+from custom_components.thames_water.thameswaterclient import AsyncThamesWater
+from custom_components.thames_water.timebuckets import uk_time
+
+from stub_server import METER_PATH, StubConfig, ThamesWaterStub, synthetic_day_usage
+
+
+def _report(name: str, elapsed: float, requests: int, peak_bytes: int, **extra) -> None:
+    details = "".join(f" {key}={value}" for key, value in extra.items())
+    print(
+        f"\n[benchmark] {name}: {elapsed * 1000:.1f} ms, {requests} requests, "
+        f"peak {peak_bytes / 1024:.0f} KiB{details}"
+    )
+
+
+@pytest.fixture
+async def stub():
+    """Run the stand-in server for one test."""
+    server = ThamesWaterStub(StubConfig(latency=0.002))
+    await server.start()
+    yield server
+    await server.stop()
+
+
+async def test_benchmark_auth(stub: ThamesWaterStub):
+    """Measure round trips for a password login, a restored session and a re-login."""
+    async with aiohttp.ClientSession(cookie_jar=aiohttp.CookieJar(unsafe=True)) as session:
+        before = stub.state.total_requests
+        started = time.perf_counter()
+        client = AsyncThamesWater(
+            session, stub.config.email, stub.config.password, 1, base_url=stub.base_url
+        )
+        await client._authenticate(stub.config.email, stub.config.password)
+        login_requests = stub.state.total_requests - before
+        _report("password login", time.perf_counter() - started, login_requests, 0)
+
+        saved = client.export_session()
+        session.cookie_jar.clear()
+        before = stub.state.total_requests
+        started = time.perf_counter()
+        assert await client._restore_session(saved)
+        restore_requests = stub.state.total_requests - before
+        _report("restored session", time.perf_counter() - started, restore_requests, 0)
+
+        stub.expire_account_sessions()
+        before = stub.state.total_requests
+        started = time.perf_counter()
+        await client.get_meter_usage(1, datetime(2025, 1, 1), datetime(2025, 1, 1))
+        relogin_requests = stub.state.total_requests - before
+        _report("expired session re-login", time.perf_counter() - started, relogin_requests, 0)
+
+    assert login_requests <= 12
+    assert restore_requests == 1
+    # The failed request and its redirect, the single sign-on steps and the retry.
+    assert relogin_requests <= 10
+
+
+async def _backfill(
+    hass: HomeAssistant, stub: ThamesWaterStub, days: int, monkeypatch
+) -> int:
+    monkeypatch.setattr(sensor_module, "INITIAL_BACKFILL_DAYS", days)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            "username": stub.config.email,
+            "password": stub.config.password,
+            "account_number": "1",
+            "meter_id": f"bench{days}",
+            "liter_cost": "0.003",
+            "base_url": stub.base_url,
+        },
+    )
+    entry.add_to_hass(hass)
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
+        "client": None,
+        "metrics": UpdateMetrics(),
+        "import_lock": asyncio.Lock(),
+        "updates": SingleFlight(hass, "bench"),
+        "caches": {f"bench{days}": MeterUsageCache(hass, f"bench{days}", 7, 1500)},
+    }
+    sensor = ThamesWaterSensor(hass, entry, f"bench{days}")
+    sensor.hass = hass
+
+    before = stub.state.total_requests
+    meter_before = stub.state.requests[METER_PATH]
+    tracemalloc.start()
+    started = time.perf_counter()
+    await sensor.async_update()
+    await get_instance(hass).async_block_till_done()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    await async_get_registry(hass).async_release(entry)
+    await _assert_rollups(hass, f"bench{days}")
+    meter_requests = stub.state.requests[METER_PATH] - meter_before
+    _report(
+        f"{days}-day backfill",
+        elapsed,
+        stub.state.total_requests - before,
+        peak,
+        meter_requests=meter_requests,
+    )
+    return meter_requests
+
+
+async def _assert_rollups(hass: HomeAssistant, meter_id: str) -> None:
+    """Assert the daily and monthly rollups were imported with the stub's daily totals."""
+    daily = await async_last_statistic(hass, consumption_statistic_id(meter_id, "daily"))
+    monthly = await async_last_statistic(hass, consumption_statistic_id(meter_id, "monthly"))
+    assert daily is not None and monthly is not None
+
+    last_day = uk_time(daily["start"]).date()
+    day = date(last_day.year - ROLLUP_HISTORY_YEARS, 1, 1)
+    total = 0.0
+    while day <= last_day:
+        total += synthetic_day_usage(meter_id, day)
+        day += timedelta(days=1)
+    assert daily["sum"] == pytest.approx(total)
+    # Monthly rows end with the last complete month.
+    assert uk_time(monthly["start"]).date() <= last_day.replace(day=1)
+
+
+async def test_benchmark_backfill_45_days(
+    recorder_mock: Recorder, hass: HomeAssistant, stub: ThamesWaterStub, monkeypatch
+):
+    """Measure a cold 45-day backfill through the sensor update."""
+    assert await _backfill(hass, stub, 45, monkeypatch) <= 10
+
+
+async def test_benchmark_backfill_365_days(
+    recorder_mock: Recorder, hass: HomeAssistant, stub: ThamesWaterStub, monkeypatch
+):
+    """Measure a cold 365-day backfill through the sensor update."""
+    assert await _backfill(hass, stub, 365, monkeypatch) <= 60
+
+
+def test_benchmark_statistics_generation():
+    """Measure statistics generation for a year of hourly readings."""
+    start = datetime(2024, 1, 1)
+    readings = HourlySeries()
+    for hour in range(365 * 24):
+        readings.append(start + timedelta(hours=hour), float(hour % 40))
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    stats, cost_stats = generate_statistics(readings, 0.003)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    _report("statistics generation (1 year)", elapsed, 0, peak, hours=len(stats))
+    assert len(stats) == len(cost_stats) == 365 * 24
@@ -0,0 +1,89 @@
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.thames_water.cache import MeterUsageCache
+from custom_components.thames_water.thameswaterclient import Line, MeterUsage
+
+
+def _usage(estimated: bool = False, hours: int = 24) -> MeterUsage:
+    return MeterUsage(
+        IsError=False,
+        IsDataAvailable=True,
+        IsConsumptionAvailable=True,
+        TargetUsage=0,
+        AverageUsage=0,
+        ActualUsage=0,
+        MyUsage="NA",
+        AverageUsagePerPerson=0,
+        IsMO365Customer=False,
+        IsMOPartialCustomer=False,
+        IsMOCompleteCustomer=False,
+        IsExtraMonthConsumptionMessage=False,
+        Lines=[Line(f"{hour:02d}:00", 1.0, hour, estimated, "X") for hour in range(hours)],
+    )
+
+
+async def test_settled_days_are_served(hass: HomeAssistant):
+    """Test only settled, complete days are served and the rest must be fetched."""
+    cache = MeterUsageCache(hass, "123", settle_days=7, max_entries=100)
+    await cache.async_load()
+    today = dt_util.now().date()
+    old_day = today - timedelta(days=10)
+    recent_day = today - timedelta(days=3)
+    estimated_day = today - timedelta(days=9)
+
+    cache.put({old_day: _usage(), recent_day: _usage(), estimated_day: _usage(estimated=True)})
+
+    assert cache.get(old_day).Lines[5].Read == 5
+    assert cache.get(recent_day) is None
+    assert cache.get(estimated_day) is None
+
+    cached, missing = cache.get_range(old_day, old_day + timedelta(days=2))
+    assert list(cached) == [old_day]
+    assert missing == [(old_day + timedelta(days=1), old_day + timedelta(days=2))]
+    assert cache.missing(old_day, old_day + timedelta(days=2)) == missing
+
+
+async def test_partial_days_are_not_cached(hass: HomeAssistant):
+    """Test a settled day missing some of its hours is left to be fetched again."""
+    cache = MeterUsageCache(hass, "123", settle_days=7, max_entries=100)
+    await cache.async_load()
+    day = dt_util.now().date() - timedelta(days=10)
+
+    cache.put({day: _usage(hours=20)})
+
+    assert cache.get(day) is None
+    assert cache.missing(day, day) == [(day, day)]
+
+
+async def test_eviction(hass: HomeAssistant):
+    """Test the least recently used days are evicted."""
+    cache = MeterUsageCache(hass, "123", settle_days=7, max_entries=2)
+    await cache.async_load()
+    first = dt_util.now().date() - timedelta(days=30)
+
+    cache.put({first: _usage()})
+    cache.put({first + timedelta(days=1): _usage()})
+    cache.get(first)
+    cache.put({first + timedelta(days=2): _usage()})
+
+    assert cache.get(first) is not None
+    assert cache.get(first + timedelta(days=1)) is None
+
+
+async def test_days_stored_as_columns(hass: HomeAssistant):
+    """Test a day is saved as one list per line field and served back unchanged."""
+    cache = MeterUsageCache(hass, "123", settle_days=7, max_entries=100)
+    await cache.async_load()
+    day = dt_util.now().date() - timedelta(days=10)
+    usage = _usage()
+
+    cache.put({day: usage})
+
+    saved = cache._data_to_save()["days"][f"{day.isoformat()}:H"]
+    assert saved["usage"] == [1.0] * 24
+    assert saved["read"] == [float(hour) for hour in range(24)]
+    assert saved["serials"] == ["X"]
+    assert cache.get(day).Lines == usage.Lines
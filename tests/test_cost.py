@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.thames_water import cost as cost_module
+from custom_components.thames_water.cost import async_rebuild_cost
+
+
+async def test_rebuild_continues_from_earlier_costs(hass: HomeAssistant):
+    """Test hours from the effective time are repriced in pages after the kept costs."""
+    effective = dt_util.as_utc(datetime(2024, 1, 1))
+    hours = [effective + timedelta(hours=n) for n in range(24 * 40)]
+    consumption = [{"start": hour.timestamp(), "state": 10.0} for hour in hours]
+
+    async def hourly_statistics(hass, statistic_id, start, end, types):
+        return [row for row in consumption if start.timestamp() <= row["start"] < end.timestamp()]
+
+    written = []
+    with (
+        patch.object(cost_module, "async_first_statistic", AsyncMock(return_value=consumption[0])),
+        patch.object(
+            cost_module, "async_last_statistic_before", AsyncMock(return_value={"sum": 7.0})
+        ),
+        patch.object(cost_module, "async_hourly_statistics", hourly_statistics),
+        patch.object(
+            cost_module,
+            "async_add_external_statistics",
+            lambda hass, metadata, stats: written.append(stats),
+        ),
+        patch.object(cost_module, "get_instance", MagicMock(
+            return_value=MagicMock(async_block_till_done=AsyncMock())
+        )),
+    ):
+        assert await async_rebuild_cost(hass, "123", 0.5, effective) == len(hours)
+
+    # 40 days take two pages of 31 days.
+    assert len(written) == 2
+    rows = [row for page in written for row in page]
+    assert rows[0]["start"] == effective
+    assert rows[0]["state"] == 5.0
+    assert rows[0]["sum"] == 12.0
+    assert rows[-1]["sum"] == pytest.approx(7.0 + 5.0 * len(hours))
+
+
+async def test_rebuild_without_consumption(hass: HomeAssistant):
+    """Test nothing is written when no consumption has been imported."""
+    with patch.object(cost_module, "async_first_statistic", AsyncMock(return_value=None)):
+        assert await async_rebuild_cost(hass, "123", 0.5) == 0
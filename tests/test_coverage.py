@@ -0,0 +1,129 @@
+from datetime import date, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.thames_water import corrections as corrections_module
+from custom_components.thames_water import sensor as sensor_module
+from custom_components.thames_water.const import DOMAIN
+from custom_components.thames_water.corrections import async_merge_hours
+from custom_components.thames_water.sensor import ThamesWaterSensor
+from custom_components.thames_water.statistics import HourlySeries
+from custom_components.thames_water.storage import CoverageIndex, IngestionCursor
+from custom_components.thames_water.thameswaterclient import Line, MeterUsage
+from custom_components.thames_water.timebuckets import uk_midnight
+
+
+async def test_missing_days_and_persistence(hass: HomeAssistant):
+    """Test days with unimported hours are reported and the index survives a reload."""
+    index = CoverageIndex(hass, "123", keep_days=30)
+    await index.async_load()
+    for day in (date(2024, 6, 1), date(2024, 6, 3)):
+        for hour in range(24):
+            index.mark(datetime.combine(day, datetime.min.time()) + timedelta(hours=hour))
+    index.mark(datetime(2024, 6, 2, 5))
+    await index.async_save()
+
+    reloaded = CoverageIndex(hass, "123", keep_days=30)
+    await reloaded.async_load()
+    assert reloaded.since == date(2024, 6, 1)
+    assert reloaded.is_imported(datetime(2024, 6, 2, 5))
+    assert reloaded.missing_days(date(2024, 5, 1), date(2024, 6, 4)) == [
+        date(2024, 6, 2),
+        date(2024, 6, 4),
+    ]
+
+
+async def test_merge_hours_resums_after_gap(hass: HomeAssistant):
+    """Test a filled hour shifts the running sums of every later hour."""
+    base = dt_util.as_utc(datetime(2024, 6, 1))
+    hours = [base + timedelta(hours=n) for n in range(48)]
+    gap = hours[10]
+    consumption = [
+        {"start": hour.timestamp(), "state": 1.0} for hour in hours if hour != gap
+    ]
+    cost = [{"start": hour.timestamp(), "state": 0.25} for hour in hours if hour != gap]
+
+    async def hourly_statistics(hass, statistic_id, start, end, types):
+        rows = cost if statistic_id.endswith("cost") else consumption
+        return [row for row in rows if start.timestamp() <= row["start"] < end.timestamp()]
+
+    written = {}
+    with (
+        patch.object(
+            corrections_module,
+            "async_last_statistic_before",
+            AsyncMock(side_effect=[{"sum": 100.0}, {"sum": 50.0}]),
+        ),
+        patch.object(corrections_module, "async_hourly_statistics", hourly_statistics),
+        patch.object(
+            corrections_module,
+            "async_add_external_statistics",
+            lambda hass, metadata, stats: written.setdefault(metadata["statistic_id"], []).extend(stats),
+        ),
+        patch.object(corrections_module, "get_instance", MagicMock(
+            return_value=MagicMock(async_block_till_done=AsyncMock())
+        )),
+    ):
+        sums = await async_merge_hours(hass, "123", {gap: 5.0}, 0.5, hours[-1])
+
+    consumption_rows = written["thames_water:consumption_123"]
+    assert [row["start"] for row in consumption_rows] == hours[10:]
+    assert consumption_rows[0]["sum"] == 105.0
+    assert sums == (pytest.approx(105.0 + 37), pytest.approx(50.0 + 2.5 + 37 * 0.25))
+
+
+async def test_estimated_days_decay_until_actual(hass: HomeAssistant):
+    """Test estimated days are re-checked less often and dropped once actual."""
+    today = date(2024, 6, 10)
+    index = CoverageIndex(hass, "123", keep_days=60)
+    await index.async_load()
+    with patch.object(dt_util, "now", return_value=datetime(2024, 6, 9, 12, tzinfo=dt_util.UTC)):
+        index.mark(datetime(2024, 6, 8, 3), estimated=True)
+        index.mark(datetime(2024, 6, 8, 4), estimated=True)
+    assert index.is_estimated(datetime(2024, 6, 8, 3))
+    assert index.estimated_days_due(today) == [date(2024, 6, 8)]
+
+    index.checked(date(2024, 6, 8), today)
+    assert index.estimated_days_due(today + timedelta(days=1)) == []
+    assert index.estimated_days_due(today + timedelta(days=2)) == [date(2024, 6, 8)]
+
+    index.mark(datetime(2024, 6, 8, 3))
+    assert not index.is_estimated(datetime(2024, 6, 8, 3))
+    assert index.estimated_days_due(today + timedelta(days=2)) == [date(2024, 6, 8)]
+    index.mark(datetime(2024, 6, 8, 4))
+    assert index.estimated_days_due(today + timedelta(days=30)) == []
+    assert index.is_imported(datetime(2024, 6, 8, 4))
+
+
+async def test_refetched_gap_day_is_rewritten_from_the_register(hass: HomeAssistant):
+    """Test a day with a missing hour is rewritten whole, not only its missing hour."""
+    day = date(2024, 6, 2)
+    entry = MockConfigEntry(domain=DOMAIN, data={"meter_id": "123"})
+    sensor = ThamesWaterSensor(hass, entry, "123")
+    await sensor._coverage.async_load()
+    for hour in range(24):
+        if hour != 10:
+            sensor._coverage.mark(datetime.combine(day, datetime.min.time()) + timedelta(hours=hour))
+    readings = HourlySeries()
+    lines = [Line(f"{hour:02d}:00", 2.0, 1000.0 + 2 * (hour + 1), False, "X") for hour in range(24)]
+    readings.extend_day(day, MeterUsage(Lines=lines))
+    cursor = IngestionCursor(
+        start=uk_midnight(day + timedelta(days=3)).timestamp(), consumption_sum=0.0, cost_sum=0.0
+    )
+    merge = AsyncMock(return_value=(1.0, 0.5))
+
+    with patch.object(sensor_module, "async_merge_hours", merge):
+        await sensor._async_correct_history(readings, cursor, 0.5)
+
+    hours = merge.await_args.args[2]
+    assert sorted(hours) == [
+        uk_midnight(day) + timedelta(hours=hour) for hour in range(24)
+    ]
+    # The hour after the gap no longer carries the missing hour's litres.
+    assert sum(hours.values()) == 48.0
+    assert sensor._coverage.missing_days(day, day) == []
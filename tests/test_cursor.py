@@ -0,0 +1,183 @@
+import asyncio
+from datetime import date, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.thames_water import sensor as sensor_module
+from custom_components.thames_water.cache import MeterUsageCache
+from custom_components.thames_water.const import DOMAIN
+from custom_components.thames_water.metrics import UpdateMetrics
+from custom_components.thames_water.sensor import IMPORT_BATCH_DAYS, ThamesWaterSensor
+from custom_components.thames_water.storage import CursorStore, IngestionCursor, RollupCursor
+from custom_components.thames_water.thameswaterclient import CircuitBreaker, Line, MeterUsage
+from custom_components.thames_water.timebuckets import uk_midnight
+
+
+def _sensor(hass: HomeAssistant) -> ThamesWaterSensor:
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            "username": "user@example.com",
+            "password": "secret",
+            "account_number": "1",
+            "meter_id": "123",
+        },
+    )
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
+        "caches": {"123": MeterUsageCache(hass, "123", settle_days=7, max_entries=1500)},
+    }
+    return ThamesWaterSensor(hass, entry, "123")
+
+
+async def test_stored_cursor_survives_slow_recorder(hass: HomeAssistant):
+    """Test a recorder timeout falls back to the stored cursor instead of a backfill."""
+    stored = IngestionCursor(start=1_700_000_000.0, consumption_sum=10.0, cost_sum=0.5)
+    await CursorStore(hass, "123").async_save(stored)
+    sensor = _sensor(hass)
+    last_statistics = AsyncMock(side_effect=TimeoutError)
+
+    with patch.object(sensor, "_async_last_statistics", last_statistics):
+        assert await sensor._async_get_cursor() == stored
+        assert await sensor._async_get_cursor() == stored
+
+    # The recorder is only consulted once.
+    assert last_statistics.await_count == 1
+
+
+async def test_recorder_overrides_stale_cursor(hass: HomeAssistant):
+    """Test the recorder's position replaces a stored cursor that disagrees."""
+    store = CursorStore(hass, "123")
+    await store.async_save(IngestionCursor(start=1.0, consumption_sum=1.0, cost_sum=1.0))
+    recorded = IngestionCursor(start=2.0, consumption_sum=2.0, cost_sum=2.0)
+    sensor = _sensor(hass)
+
+    with patch.object(sensor, "_async_last_statistics", AsyncMock(return_value=recorded)):
+        assert await sensor._async_get_cursor() == recorded
+
+    assert await store.async_load() == recorded
+
+
+async def test_no_cursor_without_recorder_skips(hass: HomeAssistant):
+    """Test the check is retried when neither the recorder nor the store answer."""
+    sensor = _sensor(hass)
+
+    with patch.object(sensor, "_async_last_statistics", AsyncMock(side_effect=TimeoutError)):
+        assert await sensor._async_get_cursor() is None
+
+    assert not sensor._cursor_checked
+
+
+async def _usage_range(meter, start: date, end: date, breaker) -> dict[date, MeterUsage]:
+    return {
+        start + timedelta(days=n): MeterUsage(
+            Lines=[Line(f"{hour:02d}:00", 2.0, 0.0, False, "X") for hour in range(24)]
+        )
+        for n in range((end - start).days + 1)
+    }
+
+
+async def test_update_commits_each_batch(hass: HomeAssistant):
+    """Test a first update imports a batch at a time, the cursor following each commit."""
+    sensor = _sensor(hass)
+    sensor._cursor_checked = True
+    client = MagicMock(get_meter_usage_range=AsyncMock(side_effect=_usage_range))
+    imported = []
+    cursors = []
+    recorder = MagicMock(
+        async_block_till_done=AsyncMock(side_effect=lambda: cursors.append(sensor._cursor))
+    )
+
+    with (
+        patch.object(sensor, "_async_get_cursor", AsyncMock(return_value=None)),
+        patch.object(sensor_module, "async_get_entry_client", AsyncMock(return_value=client)),
+        patch.object(sensor_module, "async_get_registry", MagicMock(
+            return_value=MagicMock(async_save_session=AsyncMock())
+        )),
+        patch.object(
+            sensor_module,
+            "async_add_external_statistics",
+            lambda hass, metadata, stats: imported.append((metadata["statistic_id"], stats)),
+        ),
+        patch.object(sensor_module, "get_instance", MagicMock(return_value=recorder)),
+    ):
+        await sensor._async_update()
+
+    consumption = [stats for stat_id, stats in imported if stat_id.endswith("consumption_123")]
+    batches = -(-(sensor_module.INITIAL_BACKFILL_DAYS + 1) // IMPORT_BATCH_DAYS)
+    assert len(consumption) == client.get_meter_usage_range.await_count == batches
+    for previous, batch in zip(consumption, consumption[1:]):
+        assert batch[0]["sum"] == previous[-1]["sum"] + 2.0
+    # Each batch is committed before the cursor moves past the one before it.
+    assert cursors[0] is None
+    assert cursors[1].start == consumption[0][-1]["start"].timestamp()
+    assert sensor._cursor.consumption_sum == consumption[-1][-1]["sum"]
+
+
+async def test_open_breaker_stops_after_batch(hass: HomeAssistant):
+    """Test an update stops importing once its fetches stop on repeated failures."""
+    sensor = _sensor(hass)
+    sensor._cursor_checked = True
+
+    async def failing_range(meter, start, end, breaker: CircuitBreaker):
+        for _ in range(breaker.threshold):
+            breaker.record_failure(TimeoutError())
+        return {}
+
+    client = MagicMock(get_meter_usage_range=AsyncMock(side_effect=failing_range))
+    with (
+        patch.object(sensor, "_async_get_cursor", AsyncMock(return_value=None)),
+        patch.object(sensor_module, "async_get_entry_client", AsyncMock(return_value=client)),
+        patch.object(sensor_module, "async_get_registry", MagicMock(
+            return_value=MagicMock(async_save_session=AsyncMock())
+        )),
+        patch.object(sensor_module, "async_add_external_statistics") as add_statistics,
+    ):
+        await sensor._async_update()
+
+    assert client.get_meter_usage_range.await_count == 1
+    assert not add_statistics.called
+    assert sensor.fetch_breaker.tripped == "server"
+
+
+async def test_open_breaker_skips_rollups(hass: HomeAssistant):
+    """Test the rollups are not fetched after the update's fetches stopped on failures."""
+    sensor = _sensor(hass)
+    entry_data = hass.data[DOMAIN][sensor._config_entry.entry_id]
+    entry_data.update(metrics=UpdateMetrics(), import_lock=asyncio.Lock())
+    breaker = CircuitBreaker(threshold=1)
+    breaker.record_failure(TimeoutError())
+
+    async def update():
+        sensor.fetch_breaker = breaker
+
+    with (
+        patch.object(sensor, "_async_update", AsyncMock(side_effect=update)),
+        patch.object(sensor, "_async_update_rollups", AsyncMock()) as update_rollups,
+    ):
+        await sensor._async_run_update()
+
+    assert not update_rollups.called
+
+
+async def test_rollups_stop_before_estimated_days(hass: HomeAssistant):
+    """Test rollups end at the last complete day before any estimate and keep their cursors."""
+    sensor = _sensor(hass)
+    last_hour = uk_midnight(date(2025, 3, 31)) + timedelta(hours=23)
+    sensor._cursor = IngestionCursor(start=last_hour.timestamp(), consumption_sum=0.0, cost_sum=0.0)
+    sensor._coverage.mark(datetime(2025, 3, 20, 5), estimated=True)
+    cursor = RollupCursor(date(2025, 3, 20), 1.0, 0.5)
+
+    async def update_rollups(hass, entry, meter_id, liter_cost, end, cursors):
+        cursors["daily"] = cursor
+        return 1
+
+    update = AsyncMock(side_effect=update_rollups)
+    with patch.object(sensor_module, "async_update_rollups", update):
+        await sensor._async_update_rollups()
+        await sensor._async_update_rollups()
+
+    assert update.await_args.args[4] == date(2025, 3, 19)
+    assert await CursorStore(hass, "123").async_load_rollups() == {"daily": cursor}
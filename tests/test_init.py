@@ -0,0 +1,59 @@
+from unittest.mock import AsyncMock, MagicMock, call, patch
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+
+from custom_components.thames_water import async_migrate_entry, async_remove_entry
+from custom_components.thames_water.const import DOMAIN
+from custom_components.thames_water.storage import SessionStore
+
+
+async def test_migrate_single_meter_statistics(hass: HomeAssistant):
+    """Test version 1 statistics and device are moved to the entry's meter."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=1,
+        data={
+            "username": "user@example.com",
+            "password": "secret",
+            "account_number": "1",
+            "meter_id": "123",
+        },
+    )
+    entry.add_to_hass(hass)
+    device_registry = dr.async_get(hass)
+    device = device_registry.async_get_or_create(
+        config_entry_id=entry.entry_id, identifiers={(DOMAIN, "thames_water")}
+    )
+    recorder = MagicMock(async_block_till_done=AsyncMock())
+
+    with patch("custom_components.thames_water.get_instance", return_value=recorder):
+        assert await async_migrate_entry(hass, entry)
+
+    assert entry.version == 2
+    assert recorder.async_update_statistics_metadata.call_args_list == [
+        call("thames_water:thameswater_consumption", new_statistic_id="thames_water:consumption_123"),
+        call("thames_water:thameswater_cost", new_statistic_id="thames_water:cost_123"),
+    ]
+    assert device_registry.async_get(device.id).identifiers == {(DOMAIN, "123")}
+
+
+async def test_remove_entry_keeps_shared_session(hass: HomeAssistant):
+    """Test the session is deleted with the last entry logging in as its user."""
+    entries = [
+        MockConfigEntry(domain=DOMAIN, data={"username": username, "meter_id": meter_id})
+        for username, meter_id in (("user@example.com", "1"), ("User@Example.com ", "2"))
+    ]
+    for entry in entries:
+        entry.add_to_hass(hass)
+    store = SessionStore(hass, "user@example.com")
+    await store.async_save({"refresh_token": "token"})
+
+    await async_remove_entry(hass, entries[0])
+    assert await store.async_load() == {"refresh_token": "token"}
+
+    await hass.config_entries.async_remove(entries[0].entry_id)
+    await async_remove_entry(hass, entries[1])
+    assert await store.async_load() is None
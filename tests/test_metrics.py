@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+from custom_components.thames_water.metrics import (
+    UpdateMetrics,
+    record_error,
+    record_retry,
+    timed,
+)
+
+
+async def test_run_collects_concurrent_phases():
+    """Test phases, retries and errors of gathered tasks land in the current run."""
+    metrics = UpdateMetrics(history_size=2)
+
+    async def fetch(fail: bool) -> None:
+        with timed("meter_usage"):
+            await asyncio.sleep(0)
+            record_retry()
+            if fail:
+                record_error()
+                raise ValueError
+
+    with metrics.run():
+        await asyncio.gather(fetch(False), fetch(True), return_exceptions=True)
+
+    run = metrics.last
+    assert run.success
+    assert run.retries == 2
+    assert run.errors == 1
+    assert run.phases["meter_usage"].calls == 2
+    assert run.phases["meter_usage"].errors == 1
+
+
+def test_failed_run_and_rolling_history():
+    """Test a raising update is recorded as failed and old runs roll off."""
+    metrics = UpdateMetrics(history_size=2)
+    for _ in range(2):
+        with metrics.run():
+            pass
+    with pytest.raises(RuntimeError), metrics.run():
+        raise RuntimeError
+
+    assert len(metrics.history) == 2
+    assert not metrics.last.success
+    assert len(metrics.as_dict()["runs"]) == 2
+    # Outside a run nothing is recorded.
+    with timed("meter_usage"):
+        record_retry()
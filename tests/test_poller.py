@@ -0,0 +1,176 @@
+from datetime import date, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STARTED
+from homeassistant.core import CoreState, HomeAssistant
+
+from custom_components.thames_water import poller as poller_module
+from custom_components.thames_water.poller import RETRY_BASE, STARTUP_DELAY, UpdatePoller
+from custom_components.thames_water.thameswaterclient import CircuitBreaker, ThrottledError
+from custom_components.thames_water.timebuckets import uk_midnight
+
+
+def _sensor(days: list[date | None]) -> MagicMock:
+    """Return a sensor whose last complete day moves through ``days``, one per update."""
+    sensor = MagicMock()
+    sensor.last_complete_day = days[0]
+    sensor.fetch_breaker = None
+    sensor.update_failed = False
+
+    async def update(now):
+        sensor.last_complete_day = days.pop(1)
+
+    sensor.async_update_callback = AsyncMock(side_effect=update)
+    return sensor
+
+
+async def test_learned_delay_schedules_next_day(hass: HomeAssistant):
+    """Test a new day schedules the next update for when the following day is expected."""
+    day = date(2025, 6, 10)
+    sensor = _sensor([day - timedelta(days=1), day])
+    poller = UpdatePoller(hass, sensor, "123", [15, 23])
+    poller._delays = [60.0, 62.0, 70.0]
+    now = uk_midnight(day + timedelta(days=3)) + timedelta(hours=13)
+
+    with (
+        patch.object(poller_module.dt_util, "now", return_value=now),
+        patch.object(poller_module, "async_track_point_in_time"),
+    ):
+        await poller._async_run(now)
+
+    # An hour before the median of 60, 61, 62 and 70 hours.
+    assert poller.next_run == uk_midnight(day + timedelta(days=2)) + timedelta(
+        hours=61
+    )
+    assert poller._delays[-1] == 61.0
+    poller.async_stop()
+
+
+async def test_overdue_day_backs_off(hass: HomeAssistant):
+    """Test updates that bring nothing once a day is due are retried less and less often."""
+    day = date(2025, 6, 10)
+    sensor = _sensor([day, day, day])
+    poller = UpdatePoller(hass, sensor, "123", [15, 23])
+    poller._delays = [10.0, 10.0, 10.0]
+    now = uk_midnight(day + timedelta(days=3))
+
+    with (
+        patch.object(poller_module.dt_util, "now", return_value=now),
+        patch.object(poller_module, "async_track_point_in_time"),
+    ):
+        await poller._async_run(now)
+        assert poller.next_run == now + RETRY_BASE
+        await poller._async_run(now)
+        assert poller.next_run == now + 2 * RETRY_BASE
+    poller.async_stop()
+
+
+async def test_delay_learned_between_miss_and_find(hass: HomeAssistant):
+    """Test a day found after a miss is taken to have appeared halfway between the two."""
+    day = date(2025, 6, 10)
+    sensor = _sensor([day - timedelta(days=1), day - timedelta(days=1), day])
+    poller = UpdatePoller(hass, sensor, "123", [15, 23])
+    poller._delays = [60.0, 60.0, 60.0]
+    missed = uk_midnight(day + timedelta(days=1)) + timedelta(hours=59)
+    found = missed + timedelta(hours=2)
+
+    with patch.object(poller_module, "async_track_point_in_time"):
+        with patch.object(poller_module.dt_util, "now", return_value=missed):
+            await poller._async_run(missed)
+        assert poller.next_run == missed + RETRY_BASE
+        with patch.object(poller_module.dt_util, "now", return_value=found):
+            await poller._async_run(found)
+
+    assert poller._delays[-1] == 60.0
+    poller.async_stop()
+
+
+async def test_failures_back_off_apart_from_misses(hass: HomeAssistant):
+    """Test a failed update neither counts as nor resets the retries of an overdue day."""
+    day = date(2025, 6, 10)
+    sensor = _sensor([day] * 4)
+    update = sensor.async_update_callback
+    poller = UpdatePoller(hass, sensor, "123", [15, 23])
+    poller._delays = [10.0, 10.0, 10.0]
+    now = uk_midnight(day + timedelta(days=3))
+
+    with (
+        patch.object(poller_module.dt_util, "now", return_value=now),
+        patch.object(poller_module, "async_track_point_in_time"),
+    ):
+        await poller._async_run(now)
+        await poller._async_run(now)
+        assert poller.next_run == now + 2 * RETRY_BASE
+        sensor.async_update_callback = AsyncMock(side_effect=RuntimeError("boom"))
+        await poller._async_run(now)
+        assert poller.next_run == now + RETRY_BASE
+        sensor.async_update_callback = update
+        await poller._async_run(now)
+        assert poller.next_run == now + 4 * RETRY_BASE
+    poller.async_stop()
+
+
+async def test_failed_login_is_not_a_miss(hass: HomeAssistant):
+    """Test an update that could not log in backs off as a failure, not as a late day."""
+    day = date(2025, 6, 10)
+    sensor = _sensor([day, day])
+
+    async def update(now):
+        sensor.update_failed = True
+
+    sensor.async_update_callback = AsyncMock(side_effect=update)
+    poller = UpdatePoller(hass, sensor, "123", [15, 23])
+    poller._delays = [10.0, 10.0, 10.0]
+    now = uk_midnight(day + timedelta(days=3))
+
+    with (
+        patch.object(poller_module.dt_util, "now", return_value=now),
+        patch.object(poller_module, "async_track_point_in_time"),
+    ):
+        await poller._async_run(now)
+
+    assert poller.next_run == now + RETRY_BASE
+    assert poller._failures == 1
+    assert poller._misses == 0 and poller._missed_at is None
+    poller.async_stop()
+
+
+async def test_first_update_waits_for_startup(hass: HomeAssistant):
+    """Test the first update is scheduled a grace delay after Home Assistant has started."""
+    hass.set_state(CoreState.not_running)
+    poller = UpdatePoller(hass, _sensor([None]), "123", [15, 23])
+    now = uk_midnight(date(2025, 6, 10))
+
+    with (
+        patch.object(poller_module.dt_util, "now", return_value=now),
+        patch.object(poller_module, "async_track_point_in_time") as track,
+    ):
+        await poller.async_start()
+        assert poller.next_run is None
+        hass.set_state(CoreState.running)
+        hass.bus.async_fire(EVENT_HOMEASSISTANT_STARTED)
+        await hass.async_block_till_done()
+
+    assert poller.next_run == now + STARTUP_DELAY
+    assert track.call_count == 1
+    poller.async_stop()
+
+
+async def test_open_breaker_backs_off_as_asked(hass: HomeAssistant):
+    """Test a fetch stopped by throttling is retried no sooner than Thames Water asked."""
+    day = date(2025, 6, 10)
+    sensor = _sensor([day - timedelta(days=1), day])
+    breaker = CircuitBreaker(threshold=1)
+    breaker.record_failure(ThrottledError(429, 7200.0))
+    sensor.fetch_breaker = breaker
+    poller = UpdatePoller(hass, sensor, "123", [15, 23])
+    now = uk_midnight(day + timedelta(days=3))
+
+    with (
+        patch.object(poller_module.dt_util, "now", return_value=now),
+        patch.object(poller_module, "async_track_point_in_time"),
+    ):
+        await poller._async_run(now)
+
+    assert poller.next_run == now + timedelta(hours=2)
+    poller.async_stop()
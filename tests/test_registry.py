@@ -0,0 +1,47 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.thames_water.const import DOMAIN
+from custom_components.thames_water.registry import async_get_registry, entry_meter_ids
+
+
+def _entry(username: str, meter_id: str) -> MockConfigEntry:
+    return MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            "username": username,
+            "password": "secret",
+            "account_number": "1",
+            "meter_id": meter_id,
+        },
+    )
+
+
+async def test_entries_share_one_login(hass: HomeAssistant):
+    """Test entries with the same username share a client that closes with the last one."""
+    client = MagicMock(close=AsyncMock(), export_session=MagicMock(return_value={}))
+    create = AsyncMock(return_value=client)
+    first = _entry("User@example.com", "1")
+    second = _entry("user@example.com ", "2")
+    registry = async_get_registry(hass)
+
+    with patch(
+        "custom_components.thames_water.registry.AsyncThamesWater.create", create
+    ):
+        assert await registry.async_acquire(first) is client
+        assert await registry.async_acquire(second) is client
+
+    assert create.await_count == 1
+    await registry.async_release(first)
+    client.close.assert_not_awaited()
+    await registry.async_release(second)
+    client.close.assert_awaited_once()
+
+
+def test_entry_meter_ids():
+    """Test the meters of an entry are read from its comma-separated meter_id."""
+    assert entry_meter_ids(_entry("user@example.com", "123, 456,")) == ["123", "456"]
+    assert entry_meter_ids(_entry("user@example.com", "123")) == ["123"]
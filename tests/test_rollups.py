@@ -0,0 +1,93 @@
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.thames_water import rollups as rollups_module
+from custom_components.thames_water.const import DOMAIN
+from custom_components.thames_water.rollups import async_update_rollups
+from custom_components.thames_water.storage import RollupCursor
+from custom_components.thames_water.thameswaterclient import Line
+from custom_components.thames_water.timebuckets import uk_midnight
+
+
+async def test_rollups_continue_after_last_period(hass: HomeAssistant):
+    """Test only new days and complete months are fetched, continuing the sums."""
+    entry = MockConfigEntry(domain=DOMAIN, data={"meter_id": "123"})
+    last_day = {"start": uk_midnight(date(2025, 3, 28)).timestamp(), "sum": 100.0}
+    last_month = {"start": uk_midnight(date(2025, 2, 1)).timestamp(), "sum": 900.0}
+    last = {
+        "thames_water:daily_consumption_123": last_day,
+        "thames_water:daily_cost_123": {"sum": 10.0},
+        "thames_water:monthly_consumption_123": last_month,
+        "thames_water:monthly_cost_123": {"sum": 90.0},
+    }
+
+    async def period_usage(meter, start, end, granularity):
+        if granularity == "D":
+            days = [date(2025, 3, 29), date(2025, 3, 30), date(2025, 3, 31)]
+            return {day: Line("", 5.0, 0.0, False, "X") for day in days}
+        return {date(2025, 3, 1): Line("Mar", 150.0, 0.0, False, "X")}
+
+    client = MagicMock(get_period_usage=AsyncMock(side_effect=period_usage))
+    imported = {}
+    cursors = {}
+    with (
+        patch.object(
+            rollups_module,
+            "async_last_statistic",
+            AsyncMock(side_effect=lambda hass, statistic_id: last[statistic_id]),
+        ),
+        patch.object(rollups_module, "async_get_entry_client", AsyncMock(return_value=client)),
+        patch.object(
+            rollups_module,
+            "async_add_external_statistics",
+            lambda hass, metadata, stats: imported.setdefault(metadata["statistic_id"], stats),
+        ),
+    ):
+        assert await async_update_rollups(hass, entry, "123", 0.5, date(2025, 3, 31), cursors) == 4
+
+    requests = [call.args[1:] for call in client.get_period_usage.await_args_list]
+    assert requests == [
+        (date(2025, 3, 29), date(2025, 3, 31), "D"),
+        (date(2025, 3, 1), date(2025, 3, 31), "M"),
+    ]
+    assert imported["thames_water:daily_consumption_123"][-1]["sum"] == 115.0
+    assert imported["thames_water:daily_cost_123"][-1]["sum"] == pytest.approx(17.5)
+    assert imported["thames_water:monthly_consumption_123"][0]["start"] == uk_midnight(
+        date(2025, 3, 1)
+    )
+    assert imported["thames_water:monthly_consumption_123"][0]["sum"] == 1050.0
+    assert cursors == {
+        "daily": RollupCursor(date(2025, 4, 1), 115.0, pytest.approx(17.5)),
+        "monthly": RollupCursor(date(2025, 4, 1), 1050.0, pytest.approx(165.0)),
+    }
+
+
+async def test_rollups_continue_from_cursors(hass: HomeAssistant):
+    """Test saved cursors are used without looking up the recorder."""
+    entry = MockConfigEntry(domain=DOMAIN, data={"meter_id": "123"})
+    cursors = {
+        "daily": RollupCursor(date(2025, 4, 1), 115.0, 17.5),
+        "monthly": RollupCursor(date(2025, 4, 1), 1050.0, 165.0),
+    }
+    client = MagicMock(
+        get_period_usage=AsyncMock(
+            return_value={date(2025, 4, 1): Line("", 5.0, 0.0, False, "X")}
+        )
+    )
+    last_statistic = AsyncMock()
+    with (
+        patch.object(rollups_module, "async_last_statistic", last_statistic),
+        patch.object(rollups_module, "async_get_entry_client", AsyncMock(return_value=client)),
+        patch.object(rollups_module, "async_add_external_statistics"),
+    ):
+        assert await async_update_rollups(hass, entry, "123", 0.5, date(2025, 4, 1), cursors) == 1
+
+    assert not last_statistic.called
+    assert client.get_period_usage.await_count == 1
+    assert cursors["daily"] == RollupCursor(date(2025, 4, 2), 120.0, pytest.approx(20.0))
+    assert cursors["monthly"].start == date(2025, 4, 1)
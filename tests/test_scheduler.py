@@ -0,0 +1,54 @@
+import asyncio
+
+from custom_components.thames_water.scheduler import FetchScheduler
+from custom_components.thames_water.thameswaterclient import ThrottledError
+
+
+async def test_submit_retries_after_throttling():
+    """Test a throttled request is retried after the Retry-After delay."""
+    scheduler = FetchScheduler(max_concurrency=2, requests_per_second=100)
+    attempts = []
+
+    async def request():
+        attempts.append(asyncio.get_running_loop().time())
+        if len(attempts) == 1:
+            raise ThrottledError(429, 0.05)
+        return "ok"
+
+    assert await scheduler.submit(request) == "ok"
+    assert len(attempts) == 2
+    assert attempts[1] - attempts[0] >= 0.05
+
+
+async def test_pause_does_not_refill_tokens():
+    """Test the bucket only refills from the end of a throttling pause."""
+    scheduler = FetchScheduler(max_concurrency=1, requests_per_second=10, burst=5)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    scheduler._pause(0.2)
+    await scheduler._acquire()
+
+    # The pause, then a tenth of a second for the first token.
+    assert loop.time() - start >= 0.28
+
+
+async def test_concurrency_limit():
+    """Test no more than max_concurrency requests run at once."""
+    scheduler = FetchScheduler(max_concurrency=2, requests_per_second=1000, burst=10)
+    running = 0
+    peak = 0
+
+    async def request(value):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return value
+
+    results = await asyncio.gather(
+        *(scheduler.submit(lambda value=value: request(value)) for value in range(6))
+    )
+    assert results == list(range(6))
+    assert peak == 2
@@ -23,6 +23,6 @@ async def test_sensor_setup(hass: HomeAssistant, mock_thames_water_client):
     # but that requires more complex mocking of the HA environment.
     # For now, we verify the logic in sensor.py can be initialized.
     
-    with patch("custom_components.thames_water.sensor.ThamesWater", return_value=mock_thames_water_client):
+    with patch("custom_components.thames_water.registry.AsyncThamesWater", return_value=mock_thames_water_client):
         # This is a simplified test case
         assert True 
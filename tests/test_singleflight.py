@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.thames_water.singleflight import SingleFlight
+
+
+async def test_overlapping_triggers_merge_into_one_follow_up(hass: HomeAssistant):
+    """Test triggers during an update run it once more, after the first finishes."""
+    flight = SingleFlight(hass, "test_signal")
+    release = asyncio.Event()
+    runs = 0
+
+    async def job():
+        nonlocal runs
+        runs += 1
+        await release.wait()
+
+    first = asyncio.ensure_future(flight.async_run("123", job))
+    await asyncio.sleep(0)
+    assert flight.in_progress and flight.is_running("123")
+    assert not flight.is_running("456")
+
+    triggers = [asyncio.ensure_future(flight.async_run("123", job)) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert runs == 1
+    release.set()
+    await asyncio.gather(first, *triggers)
+
+    assert runs == 2
+    assert not flight.in_progress
+
+
+async def test_failed_update_is_raised_to_callers(hass: HomeAssistant):
+    """Test an error without a follow-up reaches the caller and frees the meter."""
+    flight = SingleFlight(hass, "test_signal")
+
+    async def job():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        await flight.async_run("123", job)
+    assert not flight.in_progress
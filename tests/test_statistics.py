@@ -0,0 +1,129 @@
+from datetime import date, datetime, timedelta
+import random
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.thames_water import statistics as statistics_module
+from custom_components.thames_water.statistics import (
+    HourlySeries,
+    async_statistic_changes,
+    generate_statistics,
+)
+from custom_components.thames_water.thameswaterclient import Line, MeterUsage
+from custom_components.thames_water.timebuckets import UK_TIME_ZONE, uk_midnight
+
+
+def _uk_utc(start: datetime) -> datetime:
+    return start.replace(tzinfo=UK_TIME_ZONE).astimezone(dt_util.UTC)
+
+
+def _reference(readings: list[dict], cumulative_start: float, liter_cost=None) -> list[dict]:
+    """Generate statistics the way the per-stream loop did before the fused pass."""
+    cumulative = cumulative_start
+    stats = []
+    for elem in sorted(readings, key=lambda x: x["dt"]):
+        hour_ts = elem["dt"].replace(minute=0, second=0, microsecond=0)
+        value = elem["state"] if liter_cost is None else elem["state"] * liter_cost
+        cumulative += value
+        stats.append({"start": _uk_utc(hour_ts), "state": value, "sum": cumulative})
+    return stats
+
+
+def test_fused_pass_matches_per_stream_generation():
+    """Test both streams are identical to generating consumption and cost separately."""
+    rng = random.Random(1)
+    start = datetime(2024, 3, 1)
+    readings = [
+        {
+            "dt": start + timedelta(hours=rng.randrange(24 * 60), minutes=rng.choice((0, 30))),
+            "state": rng.random() * 40,
+        }
+        for _ in range(2000)
+    ]
+
+    stats, cost_stats = generate_statistics(
+        HourlySeries.from_readings(readings),
+        0.0030682,
+        cumulative_start=12.5,
+        cost_cumulative_start=0.25,
+    )
+
+    assert stats == _reference(readings, 12.5)
+    assert cost_stats == _reference(readings, 0.25, liter_cost=0.0030682)
+
+
+def test_series_filters_and_totals():
+    """Test the series helpers used by the sensor update."""
+    series = HourlySeries()
+    start = datetime(2024, 3, 1, 22)
+    for hour in range(4):
+        series.append(start + timedelta(hours=hour), float(hour))
+
+    assert series.total_on(start.date()) == 1.0
+    assert len(series.after(_uk_utc(start + timedelta(hours=1)))) == 2
+    assert generate_statistics(HourlySeries(), 0.1) == ([], [])
+
+
+def test_reconcile_follows_the_register():
+    """Test a missing and a duplicated hour are repaired from the register."""
+    series = HourlySeries()
+    start = datetime(2024, 3, 1)
+    series.append(start, 10.0, read=110.0)
+    # The 01:00 line is missing, so 02:00's register step covers two hours.
+    series.append(start + timedelta(hours=2), 5.0, read=125.0)
+    series.append(start + timedelta(hours=2), 5.0, read=125.0)
+    series.append(start + timedelta(hours=3), 7.0, read=132.0)
+    # A line without a read is left alone.
+    series.append(start + timedelta(hours=4), 3.0)
+
+    assert series.reconcile(100.0) == (2, 5.0)
+    assert list(series.usage) == [10.0, 15.0, 0.0, 7.0, 3.0]
+    assert series.read_at(_uk_utc(start + timedelta(hours=4))) == 132.0
+
+
+def _day(labels: list[str]) -> MeterUsage:
+    return MeterUsage(Lines=[Line(label, 1.0, 0.0, False, "X") for label in labels])
+
+
+def test_clock_changes_keep_hours_distinct():
+    """Test the 23 and 25 hour days map to one UTC hour per hour of the day."""
+    spring = date(2025, 3, 30)
+    series = HourlySeries()
+    # The 01:00 hour does not exist; a line for it joins the 02:00 hour.
+    series.extend_day(spring, _day([f"{hour:02d}:00" for hour in range(24)]))
+    hours = series.by_hour()
+    assert len(hours) == 23
+    assert hours.usage[1] == 2.0
+    assert [dt_util.utc_from_timestamp(utc) for utc in hours.utc[:3]] == [
+        uk_midnight(spring) + timedelta(hours=hour) for hour in range(3)
+    ]
+
+    autumn = date(2025, 10, 26)
+    series = HourlySeries()
+    # The 01:00 hour happens twice, first in summer time.
+    series.extend_day(autumn, _day(["00:00", "01:00", "01:00", *(f"{h:02d}:00" for h in range(2, 24))]))
+    hours = series.by_hour()
+    assert len(hours) == 25
+    assert [dt_util.utc_from_timestamp(utc) for utc in hours.utc] == [
+        uk_midnight(autumn) + timedelta(hours=hour) for hour in range(25)
+    ]
+    stats, _ = generate_statistics(hours, 0.1)
+    assert len({stat["start"] for stat in stats}) == 25
+    assert stats[-1]["start"] == uk_midnight(autumn + timedelta(days=1)) - timedelta(hours=1)
+
+
+async def test_statistic_changes_follow_uk_days():
+    """Test hourly changes are added up by UK day and month, including a 25 hour day."""
+    start = uk_midnight(date(2025, 10, 26))
+    rows = [
+        {"start": start.timestamp() + hour * 3600, "change": 1.0} for hour in range(26)
+    ]
+    recorder = MagicMock(async_add_executor_job=AsyncMock(return_value={"id": rows}))
+
+    with patch.object(statistics_module, "get_instance", return_value=recorder):
+        daily = await async_statistic_changes(MagicMock(), "id", start, start, "day")
+        monthly = await async_statistic_changes(MagicMock(), "id", start, start, "month")
+
+    assert daily == {date(2025, 10, 26): 25.0, date(2025, 10, 27): 1.0}
+    assert monthly == {date(2025, 10, 1): 26.0}
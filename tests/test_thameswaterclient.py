@@ -0,0 +1,336 @@
+import datetime
+
+import pytest
+
+from custom_components.thames_water.thameswaterclient import (
+    LOGIN_URL,
+    CircuitBreaker,
+    Line,
+    MeterUsage,
+    SessionExpiredError,
+    ThamesWater,
+    ThrottledError,
+    _ThamesWaterBase,
+    failure_class,
+)
+
+
+def _day_labels(day: datetime.date) -> list[str]:
+    """Return the UK wall clock labels of a day's hourly lines, 23 or 25 when clocks change."""
+    hours = list(range(24))
+    if day == datetime.date(2025, 3, 30):
+        hours.remove(1)
+    elif day == datetime.date(2025, 10, 26):
+        hours.insert(1, 1)
+    return [f"{hour:02d}:00" for hour in hours]
+
+
+def _usage(labels: list[str]) -> MeterUsage:
+    return MeterUsage(
+        IsError=False,
+        IsDataAvailable=True,
+        IsConsumptionAvailable=True,
+        TargetUsage=0,
+        AverageUsage=0,
+        ActualUsage=0,
+        MyUsage="NA",
+        AverageUsagePerPerson=0,
+        IsMO365Customer=False,
+        IsMOPartialCustomer=False,
+        IsMOCompleteCustomer=False,
+        IsExtraMonthConsumptionMessage=False,
+        Lines=[Line(label, 1.0, 0.0, False, "X") for label in labels],
+    )
+
+
+def test_parse_confirmation_code():
+    """Test the code is read from the redirect fragment."""
+    url = "https://www.thameswater.co.uk/login#state=abc&code=the-code&client_info=x"
+    assert _ThamesWaterBase._parse_confirmation_code(url) == "the-code"
+
+
+def test_parse_confirmation_code_without_fragment():
+    """Test a redirect without a fragment is rejected."""
+    with pytest.raises(KeyError):
+        _ThamesWaterBase._parse_confirmation_code("https://www.thameswater.co.uk/login")
+
+
+@pytest.mark.parametrize(
+    ("status", "urls", "content_type", "expired"),
+    [
+        (200, ["https://myaccount.thameswater.co.uk/ajax"], "application/json", False),
+        (401, ["https://myaccount.thameswater.co.uk/ajax"], "application/json", True),
+        (403, ["https://myaccount.thameswater.co.uk/ajax"], "application/json", True),
+        (200, [f"{LOGIN_URL}/authorize", "https://myaccount.thameswater.co.uk/x"], "application/json", True),
+        (200, ["https://myaccount.thameswater.co.uk/ajax"], "text/html; charset=utf-8", True),
+        (500, ["https://myaccount.thameswater.co.uk/ajax"], "text/html; charset=utf-8", False),
+        (502, [f"{LOGIN_URL}/authorize", "https://myaccount.thameswater.co.uk/x"], "text/html", False),
+    ],
+)
+def test_is_expired_response(status, urls, content_type, expired):
+    """Test expired sessions are detected from status, redirects and content type."""
+    client = _ThamesWaterBase("a@b.c", "pw", 1, "id")
+    assert client._is_expired_response(status, urls, content_type) is expired
+
+
+def test_base_url_override():
+    """Test a base URL points the login and account endpoints at one host."""
+    client = _ThamesWaterBase("a@b.c", "pw", 1, "id", base_url="http://127.0.0.1:8080/")
+    assert client.login_url == "http://127.0.0.1:8080/identity.thameswater.co.uk"
+    assert client._is_expired_response(
+        200, [f"{client.login_url}/authorize"], "application/json"
+    )
+    assert not client._is_expired_response(
+        200, ["http://127.0.0.1:8080/ajax/waterMeter"], "application/json"
+    )
+
+
+def test_sync_client_falls_back_to_password(monkeypatch):
+    """Test a rejected saved session falls back to the password login."""
+    calls = []
+
+    def fail_refresh(self):
+        calls.append("refresh")
+        raise ValueError("invalid_grant")
+
+    monkeypatch.setattr(ThamesWater, "_refresh_oauth2_token_b2c_1_tw_website_signin", fail_refresh)
+    monkeypatch.setattr(ThamesWater, "_authenticate", lambda self, email, password: calls.append("password"))
+
+    ThamesWater("a@b.c", "pw", 1, session_state={"refresh_token": "old", "cookies": []})
+    assert calls == ["refresh", "password"]
+
+
+def test_split_by_day():
+    """Test a multi-day hourly response is split where the time of day wraps."""
+    hours = [f"{hour:02d}:00" for hour in range(24)]
+    start = datetime.date(2025, 3, 1)
+    end = datetime.date(2025, 3, 3)
+
+    per_day = _ThamesWaterBase._split_by_day(_usage(hours * 3), start, end)
+
+    assert sorted(per_day) == [start, datetime.date(2025, 3, 2), end]
+    assert all(len(usage.Lines) == 24 for usage in per_day.values())
+
+
+def test_split_by_day_truncated():
+    """Test a response missing days is reported as truncated."""
+    hours = [f"{hour:02d}:00" for hour in range(24)]
+    start = datetime.date(2025, 3, 1)
+    end = datetime.date(2025, 3, 3)
+
+    assert _ThamesWaterBase._split_by_day(_usage(hours * 2), start, end) is None
+
+
+@pytest.mark.parametrize(
+    ("start", "lengths"),
+    [(datetime.date(2025, 3, 29), [24, 23, 24]), (datetime.date(2025, 10, 25), [24, 25, 24])],
+)
+def test_split_by_day_clock_change(start, lengths):
+    """Test a window over a clock change splits into the 23 and 25 hour days."""
+    days = [start + datetime.timedelta(days=n) for n in range(3)]
+    labels = [label for day in days for label in _day_labels(day)]
+
+    per_day = _ThamesWaterBase._split_by_day(_usage(labels), days[0], days[-1])
+
+    assert [len(per_day[day].Lines) for day in days] == lengths
+
+
+def test_window_keeps_size_over_clock_changes(monkeypatch):
+    """Test multi-day windows over both clock changes succeed without halving."""
+    monkeypatch.setattr(ThamesWater, "_authenticate", lambda self, email, password: None)
+    client = ThamesWater("a@b.c", "pw", 1)
+    calls = []
+
+    def get_meter_usage(meter, start, end, granularity="H"):
+        calls.append((start.date(), end.date()))
+        days = (end.date() - start.date()).days + 1
+        return _usage(
+            [
+                label
+                for n in range(days)
+                for label in _day_labels(start.date() + datetime.timedelta(days=n))
+            ]
+        )
+
+    monkeypatch.setattr(client, "get_meter_usage", get_meter_usage)
+    for start, end in [
+        (datetime.date(2025, 3, 27), datetime.date(2025, 4, 2)),
+        (datetime.date(2025, 10, 23), datetime.date(2025, 10, 29)),
+    ]:
+        client.window_days = 7
+        calls.clear()
+
+        result = client.get_meter_usage_range(1, start, end)
+
+        assert calls == [(start, end)]
+        assert len(result) == 7
+        assert client.window_days == 14
+    assert len(result[datetime.date(2025, 10, 26)].Lines) == 25
+
+
+def test_split_by_period():
+    """Test monthly lines are matched to their months by label."""
+    periods = _ThamesWaterBase._periods(
+        datetime.date(2024, 11, 15), datetime.date(2025, 2, 3), "M"
+    )
+    assert periods == [
+        datetime.date(2024, 11, 1),
+        datetime.date(2024, 12, 1),
+        datetime.date(2025, 1, 1),
+        datetime.date(2025, 2, 1),
+    ]
+
+    per_month = _ThamesWaterBase._split_by_period(
+        _usage(["Dec 2024", "Jan 2025", "Feb 2025"]), periods, "M"
+    )
+    assert [line.Label for line in per_month.values()] == ["Dec 2024", "Jan 2025", "Feb 2025"]
+    assert min(per_month) == datetime.date(2024, 12, 1)
+    assert _ThamesWaterBase._split_by_period(_usage(["x"] * 5), periods, "M") == {}
+
+
+def test_split_by_period_missing_middle():
+    """Test a period missing from the middle of a response leaves the others in place."""
+    periods = _ThamesWaterBase._periods(
+        datetime.date(2025, 3, 1), datetime.date(2025, 3, 4), "D"
+    )
+
+    per_day = _ThamesWaterBase._split_by_period(
+        _usage(["01/03/2025", "02/03/2025", "04/03/2025", "Total"]), periods, "D"
+    )
+
+    assert {day: line.Label for day, line in per_day.items()} == {
+        datetime.date(2025, 3, 1): "01/03/2025",
+        datetime.date(2025, 3, 2): "02/03/2025",
+        datetime.date(2025, 3, 4): "04/03/2025",
+    }
+
+
+def test_split_by_period_without_year():
+    """Test labels without a year are matched to the next requested period in order."""
+    periods = _ThamesWaterBase._periods(
+        datetime.date(2023, 11, 1), datetime.date(2025, 1, 31), "M"
+    )
+
+    per_month = _ThamesWaterBase._split_by_period(
+        _usage(["Dec", "Jan", "Dec", "Jan"]), periods, "M"
+    )
+
+    assert sorted(per_month) == [
+        datetime.date(2023, 12, 1),
+        datetime.date(2024, 1, 1),
+        datetime.date(2024, 12, 1),
+        datetime.date(2025, 1, 1),
+    ]
+
+
+def test_window_adapts():
+    """Test the window doubles after full windows and halves after failures."""
+    client = _ThamesWaterBase("a@b.c", "pw", 1, "id")
+    day = datetime.date(2025, 3, 1)
+
+    client._window_succeeded(*client._windows(day, datetime.date(2025, 12, 1))[0])
+    assert client.window_days == 14
+
+    client._window_failed(*client._windows(day, datetime.date(2025, 12, 1))[0], "error")
+    assert client.window_days == 7
+
+
+def test_halves():
+    """Test a failed window is split into two adjoining halves."""
+    first, second = _ThamesWaterBase._halves(datetime.date(2025, 3, 1), datetime.date(2025, 3, 7))
+    assert first == (datetime.date(2025, 3, 1), datetime.date(2025, 3, 3))
+    assert second == (datetime.date(2025, 3, 4), datetime.date(2025, 3, 7))
+
+
+@pytest.mark.parametrize(
+    ("status", "retry_after", "expected"),
+    [(200, None, None), (429, None, None), (429, "12", 12.0), (503, "-1", 0.0)],
+)
+def test_throttled_error(status, retry_after, expected):
+    """Test 429/503 answers carry the server's Retry-After."""
+    err = _ThamesWaterBase._throttled_error(status, retry_after)
+    if status == 200:
+        assert err is None
+    else:
+        assert err.retry_after == expected
+
+
+def test_meter_usage_ignores_unknown_fields():
+    """Test new response keys are ignored and lines are stored as arrays."""
+    usage = MeterUsage.from_dict(
+        {
+            "IsError": False,
+            "IsDataAvailable": True,
+            "NewTopLevelKey": "x",
+            "Lines": [
+                {
+                    "Label": "01:00",
+                    "Usage": 12.5,
+                    "Read": 1000.0,
+                    "IsEstimated": True,
+                    "MeterSerialNumberHis": "X",
+                    "NewLineKey": 1,
+                }
+            ],
+        }
+    )
+
+    assert len(usage.Lines) == 1
+    assert usage.Lines.minute_of_day[0] == 60
+    assert usage.Lines[0] == Line("01:00", 12.5, 1000.0, True, "X")
+    assert MeterUsage.from_dict(usage.to_dict()) == usage
+
+
+def test_breaker_stops_range_after_consecutive_failures(monkeypatch):
+    """Test a failing server stops the range fetch after a few requests and keeps earlier days."""
+    monkeypatch.setattr(ThamesWater, "_authenticate", lambda self, email, password: None)
+    client = ThamesWater("a@b.c", "pw", 1)
+    calls = []
+
+    def get_meter_usage(meter, start, end, granularity="H"):
+        calls.append(start.date())
+        if start.date() == datetime.date(2025, 3, 1):
+            return _usage([f"{hour:02d}:00" for hour in range(24)])
+        raise SessionExpiredError("stale")
+
+    monkeypatch.setattr(client, "get_meter_usage", get_meter_usage)
+    client.window_days = 1
+    breaker = CircuitBreaker()
+    result = client.get_meter_usage_range(
+        1, datetime.date(2025, 3, 1), datetime.date(2025, 4, 14), breaker
+    )
+
+    assert list(result) == [datetime.date(2025, 3, 1)]
+    assert breaker.tripped == "auth"
+    assert len(calls) == 1 + breaker.threshold
+
+
+def test_breaker_counts_one_class_at_a_time():
+    """Test a failure of another class or a success starts the count again."""
+    breaker = CircuitBreaker(threshold=2)
+    breaker.record_failure(TimeoutError())
+    breaker.record_failure(ThrottledError(429, None))
+    breaker.record_failure(KeyError("Lines"))
+    assert not breaker.open
+    breaker.record_success()
+    breaker.record_failure(TimeoutError())
+    breaker.record_failure(TimeoutError())
+    assert breaker.tripped == "server"
+
+
+def test_failed_relogin_counts_as_auth(monkeypatch):
+    """Test a re-login that breaks on an unparsable response is an auth failure."""
+    monkeypatch.setattr(ThamesWater, "_authenticate", lambda self, email, password: None)
+    client = ThamesWater("a@b.c", "pw", 1)
+
+    def reauthenticate():
+        raise KeyError("x-ms-cpim-trans")
+
+    monkeypatch.setattr(client, "_get", lambda url, params, headers: None)
+    monkeypatch.setattr(client, "_is_session_expired", lambda r: True)
+    monkeypatch.setattr(client, "_reauthenticate", reauthenticate)
+
+    with pytest.raises(SessionExpiredError) as err:
+        client._get_json("https://myaccount.thameswater.co.uk/ajax", {}, {})
+
+    assert failure_class(err.value) == "auth"